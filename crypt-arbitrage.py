@@ -1,16 +1,21 @@
+import json
 import time
+import random
+import threading
 import requests
+from collections import deque
+import numpy as np
 import polars as pl
 import argparse
-import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 # Fallback for dev environment where library might not be installed
 try:
     from rust_backtester import Backtester
 except ImportError:
-    print("Error: rust_backtester not installed. Please run setup.")
-    sys.exit(1)
+    from optimizer.backtester import PyBacktester as Backtester
+    print("Note: rust_backtester not installed, using the built-in Python engine.")
 
 # Exchange Endpoints
 EXCHANGE_APIS = {
@@ -31,58 +36,322 @@ EXCHANGE_APIS = {
 DEFAULT_TRADE_VOLUME = 0.01
 INITIAL_BALANCE_USD = 100000.0
 INITIAL_BALANCE_BTC = 1.0
+DEFAULT_BUFFER = 10_000 # Recent ticks kept by streaming mode
+DEFAULT_DEADLINE = 2.0 # Seconds a snapshot waits for each exchange
+REQUEST_TIMEOUT = 3.0 # Seconds before a request still in flight is abandoned
 
-def _fetch_price(exchange, url):
-    """Helper function for fetching a single exchange price."""
-    try:
-        response = requests.get(url, timeout=3)
-        response.raise_for_status()
-        data = response.json()
-        price = None
-        
-        # Parsers
-        if exchange == "Bitfinex": price = data[6]
-        elif exchange == "Binance": price = float(data["price"])
-        elif exchange == "Coinbase": price = float(data["data"]["amount"])
-        elif exchange == "Kraken": price = float(data["result"]["XXBTZUSD"]["c"][0])
-        elif exchange == "Huobi": price = float(data["tick"]["close"])
-        elif exchange == "OKX": price = float(data["data"][0]["last"])
-        elif exchange == "KuCoin": price = float(data["data"]["price"])
-        elif exchange == "Gate.io": price = float(data[0]["last"])
-        elif exchange == "Bitstamp": price = float(data["last"])
-        elif exchange == "Gemini": price = float(data["last"])
-        elif exchange == "Crypto.com": price = float(data["result"]["data"][0]["a"])
-        
-        return exchange, price
-    except Exception:
-        return exchange, None
-
-def fetch_prices_snapshot():
-    """Retrieve BTC prices from all exchanges in parallel."""
-    prices = {}
-    with ThreadPoolExecutor(max_workers=len(EXCHANGE_APIS)) as executor:
-        futures = [executor.submit(_fetch_price, ex, url) for ex, url in EXCHANGE_APIS.items()]
-        for future in as_completed(futures):
-            ex, price = future.result()
+def parse_price(exchange, data):
+    """Last BTC price from an exchange's ticker payload."""
+    if exchange == "Bitfinex": return float(data[6])
+    elif exchange == "Binance": return float(data["price"])
+    elif exchange == "Coinbase": return float(data["data"]["amount"])
+    elif exchange == "Kraken": return float(data["result"]["XXBTZUSD"]["c"][0])
+    elif exchange == "Huobi": return float(data["tick"]["close"])
+    elif exchange == "OKX": return float(data["data"][0]["last"])
+    elif exchange == "KuCoin": return float(data["data"]["price"])
+    elif exchange == "Gate.io": return float(data[0]["last"])
+    elif exchange == "Bitstamp": return float(data["last"])
+    elif exchange == "Gemini": return float(data["last"])
+    elif exchange == "Crypto.com": return float(data["result"]["data"][0]["a"])
+    return None
+
+class PriceFetcher:
+    """
+    Long-lived price fetcher for every exchange.
+
+    Each exchange keeps its own requests.Session, so its TLS connection stays
+    alive between snapshots, and a persistent thread pool runs the requests.
+    A snapshot waits for each exchange only until that exchange's deadline;
+    a venue that misses it is left out and its request keeps running (up to
+    REQUEST_TIMEOUT), with no new request sent to it until the old one
+    finishes; a late answer is picked up by the next snapshot.
+    Every price carries its own receive timestamp (ns).
+    """
+    def __init__(self, apis=None, deadline=DEFAULT_DEADLINE, deadlines=None):
+        self.apis = dict(apis or EXCHANGE_APIS)
+        self.deadlines = {ex: (deadlines or {}).get(ex, deadline) for ex in self.apis}
+        self.sessions = {ex: requests.Session() for ex in self.apis}
+        self.pool = ThreadPoolExecutor(max_workers=len(self.apis), thread_name_prefix="fetch")
+        self.pending = {} # exchange -> request still in flight
+        self.stats = {ex: {"ok": 0, "late": 0, "errors": 0, "seconds": 0.0} for ex in self.apis}
+
+    def _fetch(self, exchange, url):
+        start = time.perf_counter()
+        try:
+            response = self.sessions[exchange].get(url, timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+            received = time.time_ns()
+            price = parse_price(exchange, response.json())
+        except Exception:
+            self.stats[exchange]["errors"] += 1
+            return None, None
+        self.stats[exchange]["ok"] += 1
+        self.stats[exchange]["seconds"] += time.perf_counter() - start
+        return price, received
+
+    def snapshot(self):
+        """{exchange: (price, receive ts in ns)} of every exchange that answered before its deadline."""
+        start = time.monotonic()
+        for ex, url in self.apis.items():
+            if ex not in self.pending:
+                self.pending[ex] = self.pool.submit(self._fetch, ex, url)
+        prices = {}
+        for ex, future in list(self.pending.items()):
+            try:
+                price, received = future.result(timeout=max(0.0, start + self.deadlines[ex] - time.monotonic()))
+            except FutureTimeout:
+                self.stats[ex]["late"] += 1
+                continue
+            del self.pending[ex]
             if price is not None:
-                prices[ex] = price
-    return prices
+                prices[ex] = (price, received)
+        return prices
+
+    def summary(self):
+        """Per-exchange answered / late / failed counts and mean request latency (ms)."""
+        return {
+            ex: {"ok": st["ok"], "late": st["late"], "errors": st["errors"],
+                 "mean_ms": st["seconds"] * 1000 / st["ok"] if st["ok"] else None}
+            for ex, st in self.stats.items()
+        }
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        for session in self.sessions.values():
+            session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def stub_payload(exchange, price):
+    """Canned ticker payload in `exchange`'s own format (see parse_price)."""
+    p = f"{price:.2f}"
+    return {
+        "Bitfinex": [price, 1.0, price, 1.0, 0.0, 0.0, price, 100.0, price, price],
+        "Binance": {"symbol": "BTCUSDT", "price": p},
+        "Coinbase": {"data": {"base": "BTC", "currency": "USD", "amount": p}},
+        "Kraken": {"error": [], "result": {"XXBTZUSD": {"c": [p, "0.1"]}}},
+        "Huobi": {"status": "ok", "tick": {"close": price}},
+        "OKX": {"code": "0", "data": [{"instId": "BTC-USDT", "last": p}]},
+        "KuCoin": {"code": "200000", "data": {"price": p}},
+        "Gate.io": [{"currency_pair": "BTC_USDT", "last": p}],
+        "Bitstamp": {"last": p},
+        "Gemini": {"last": p},
+        "Crypto.com": {"code": 0, "result": {"data": [{"i": "BTC_USDT", "a": p}]}},
+    }[exchange]
+
+class StubExchangeServer:
+    """
+    Local HTTP/1.1 server answering every exchange's ticker with canned payloads,
+    for testing the fetcher's latency and throughput offline.
+
+    Each exchange quotes a seeded random walk starting within ±`spread`
+    (relative) of `base_price`, so venues disagree enough to arbitrage.
+    Each response is delayed by `latency` seconds (per-exchange `latencies`
+    override it). `connections` counts accepted TCP connections, which shows
+    whether clients reuse them.
+    """
+    def __init__(self, exchanges=None, latency=0.0, latencies=None, base_price=60_000.0, spread=0.01,
+                 seed=0, port=0):
+        self.exchanges = list(exchanges or EXCHANGE_APIS)
+        self.latencies = {ex: (latencies or {}).get(ex, latency) for ex in self.exchanges}
+        rng = random.Random(seed)
+        self.prices = {ex: base_price * (1 + rng.uniform(-spread, spread)) for ex in self.exchanges}
+        self.rng = rng
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self.routes = {"/" + ex.lower().replace(".", ""): ex for ex in self.exchanges}
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name="stub-exchanges", daemon=True)
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1" # Keep-alive
+
+            def setup(self):
+                super().setup()
+                with stub.lock:
+                    stub.connections += 1
+
+            def do_GET(self):
+                exchange = stub.routes.get(self.path.split("?")[0])
+                if exchange is None:
+                    self.send_error(404)
+                    return
+                with stub.lock:
+                    stub.requests += 1
+                time.sleep(stub.latencies[exchange])
+                body = json.dumps(stub_payload(exchange, stub.tick(exchange))).encode()
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    self.close_connection = True # Client gave up (e.g. closed after its deadline)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def tick(self, exchange):
+        """Next price of `exchange` (one random-walk step)."""
+        with self.lock:
+            self.prices[exchange] *= 1 + self.rng.gauss(0.0, 0.0005)
+            return self.prices[exchange]
+
+    def urls(self):
+        """Endpoint of every exchange, in the shape of EXCHANGE_APIS."""
+        host, port = self.server.server_address[:2]
+        return {ex: f"http://{host}:{port}{path}" for path, ex in self.routes.items()}
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+class _IndexedHeap:
+    """Binary min-heap whose items' keys change in place (each item's position is tracked)."""
+    def __init__(self):
+        self.keys = []
+        self.items = []
+        self.pos = {}
+
+    def __len__(self):
+        return len(self.items)
+
+    def top(self):
+        return self.items[0]
+
+    def set(self, item, key):
+        """Insert `item` or move it to its new `key`, in O(log n)."""
+        i = self.pos.get(item)
+        if i is None:
+            self.items.append(item)
+            self.keys.append(key)
+            self._up(len(self.items) - 1)
+            return
+        old = self.keys[i]
+        self.keys[i] = key
+        if key < old:
+            self._up(i)
+        else:
+            self._down(i)
+
+    def remove(self, item):
+        i = self.pos.pop(item)
+        last_item, last_key = self.items.pop(), self.keys.pop()
+        if i < len(self.items):
+            self.items[i], self.keys[i] = last_item, last_key
+            self._up(i)
+            self._down(self.pos[last_item])
+
+    def _up(self, i):
+        keys, items, pos = self.keys, self.items, self.pos
+        key, item = keys[i], items[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if not key < keys[parent]:
+                break
+            keys[i], items[i] = keys[parent], items[parent]
+            pos[items[i]] = i
+            i = parent
+        keys[i], items[i] = key, item
+        pos[item] = i
+
+    def _down(self, i):
+        keys, items, pos = self.keys, self.items, self.pos
+        n = len(items)
+        key, item = keys[i], items[i]
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and keys[child + 1] < keys[child]:
+                child += 1
+            if not keys[child] < key:
+                break
+            keys[i], items[i] = keys[child], items[child]
+            pos[items[i]] = i
+            i = child
+        keys[i], items[i] = key, item
+        pos[item] = i
+
+class VenueBook:
+    """
+    Latest price of every venue with the cheapest and richest venue at hand.
+
+    Venues sit in two indexed heaps (by price and by negated price), so a price
+    change sifts one entry in O(log E) instead of rescanning every venue.
+    Ties go to the venue seen first, as with min()/max() over a dict of prices.
+    """
+    def __init__(self):
+        self.prices = {}
+        self.rank = {} # venue -> first-seen order (tie-break)
+        self.low = _IndexedHeap()
+        self.high = _IndexedHeap()
+
+    def __len__(self):
+        return len(self.low)
+
+    def update(self, venue, price):
+        """Record `venue`'s latest price (None drops the venue)."""
+        if price is None:
+            if venue in self.prices:
+                del self.prices[venue]
+                self.low.remove(venue)
+                self.high.remove(venue)
+            return
+        rank = self.rank.setdefault(venue, len(self.rank))
+        self.prices[venue] = price
+        self.low.set(venue, (price, rank))
+        self.high.set(venue, (-price, rank))
+
+    def cheapest(self):
+        """(venue, price) with the lowest price."""
+        venue = self.low.top()
+        return venue, self.prices[venue]
+
+    def richest(self):
+        """(venue, price) with the highest price."""
+        venue = self.high.top()
+        return venue, self.prices[venue]
 
 class ArbitrageStrategy:
     """
     Arbitrage Strategy that can be configured with different parameters.
     """
-    def __init__(self, name, min_profit, slippage_rate=0.001):
+    def __init__(self, name, min_profit, slippage_rate=0.001, max_trades=None):
         self.name = name
         self.min_profit = min_profit
         self.slippage_rate = slippage_rate
         
         # State
         self.prices = {}
+        self.book = VenueBook()
         self.balances = {ex: {"USD": INITIAL_BALANCE_USD, "BTC": INITIAL_BALANCE_BTC} for ex in EXCHANGE_APIS}
         self.total_profit = 0.0
         self.trade_count = 0
-        self.trades = []
+        self.opportunities = 0 # Spreads above min_profit, traded or not (balances)
+        self.trades = deque(maxlen=max_trades) # Most recent trades (all when max_trades is None)
 
         # Internal tracking
         self.last_ts = 0
@@ -93,22 +362,20 @@ class ArbitrageStrategy:
         if not exchange: return
 
         # Price is scaled i64 (1e8)
-        price = tick.price / 1e8 
+        self.on_price(exchange, tick.price / 1e8)
 
+    def on_price(self, exchange, price):
+        """Apply one venue price update (float) and trade if it opens an arbitrage."""
         self.prices[exchange] = price
+        self.book.update(exchange, price)
         self.check_arbitrage(exchange)
 
     def check_arbitrage(self, current_exchange):
-        if not self.prices: return
-
         # Check against all other exchanges (Simple logic: find global Min/Max)
-        valid_prices = {k: v for k, v in self.prices.items() if v is not None}
-        if len(valid_prices) < 2: return
+        if len(self.book) < 2: return
 
-        max_price = max(valid_prices.values())
-        min_price = min(valid_prices.values())
-        max_exchange = max(valid_prices, key=valid_prices.get)
-        min_exchange = min(valid_prices, key=valid_prices.get)
+        min_exchange, min_price = self.book.cheapest()
+        max_exchange, max_price = self.book.richest()
 
         # Only trade if the current update potentially triggers an arb involving this exchange
         if min_exchange == current_exchange or max_exchange == current_exchange:
@@ -121,52 +388,249 @@ class ArbitrageStrategy:
          cost = trade_volume * min_price * (1 + self.slippage_rate)
          revenue = trade_volume * max_price * (1 - self.slippage_rate)
          
+         net_profit = revenue - cost
+         if net_profit <= self.min_profit: return
+         self.opportunities += 1
+         
          if self.balances[buy_exchange]["USD"] < cost: return
          if self.balances[sell_exchange]["BTC"] < trade_volume: return
-             
-         net_profit = revenue - cost
-         if net_profit > self.min_profit:
-             # Execute
-             self.balances[buy_exchange]["USD"] -= cost
-             self.balances[buy_exchange]["BTC"] += trade_volume
-             self.balances[sell_exchange]["BTC"] -= trade_volume
-             self.balances[sell_exchange]["USD"] += revenue
-             
-             self.total_profit += net_profit
-             self.trade_count += 1
-             
-             self.trades.append({
-                 "strategy": self.name,
-                 "buy_ex": buy_exchange,
-                 "sell_ex": sell_exchange,
-                 "buy_price": min_price,
-                 "sell_price": max_price,
-                 "profit": net_profit
-             })
+         
+         # Execute
+         self.balances[buy_exchange]["USD"] -= cost
+         self.balances[buy_exchange]["BTC"] += trade_volume
+         self.balances[sell_exchange]["BTC"] -= trade_volume
+         self.balances[sell_exchange]["USD"] += revenue
+         
+         self.total_profit += net_profit
+         self.trade_count += 1
+         
+         self.trades.append({
+             "strategy": self.name,
+             "buy_ex": buy_exchange,
+             "sell_ex": sell_exchange,
+             "buy_price": min_price,
+             "sell_price": max_price,
+             "profit": net_profit
+         })
+
+class ArbitrageBank:
+    """
+    Vectorized ArbitrageStrategy scenarios.
+
+    Every scenario sees the same prices, so one VenueBook serves them all.
+    When an update makes its venue the cheapest or richest, the cost, revenue,
+    min_profit and balance checks of all scenarios run as one NumPy comparison
+    over per-scenario and (scenario, venue) arrays. sync() writes the state
+    back to the strategy instances.
+    """
+    def __init__(self, strategies):
+        self.strategies = strategies
+        self.book = VenueBook()
+        venues = list(strategies[0].balances) if strategies else []
+        self.venues = {ex: j for j, ex in enumerate(venues)}
+        self.min_profit = np.array([s.min_profit for s in strategies], dtype=np.float64)
+        self.slippage = np.array([s.slippage_rate for s in strategies], dtype=np.float64)
+        self.usd = np.array([[s.balances[ex]["USD"] for ex in venues] for s in strategies], dtype=np.float64)
+        self.btc = np.array([[s.balances[ex]["BTC"] for ex in venues] for s in strategies], dtype=np.float64)
+        self.total_profit = np.array([s.total_profit for s in strategies], dtype=np.float64)
+        self.trade_count = np.array([s.trade_count for s in strategies], dtype=np.int64)
+        self.opportunities = np.array([s.opportunities for s in strategies], dtype=np.int64)
+
+    def on_tick(self, tick, ctx):
+        exchange = getattr(tick, 'exchange_name', None)
+        if not exchange: return
+        self.on_price(exchange, tick.price / 1e8)
+
+    def on_price(self, exchange, price):
+        """Apply one venue price update to every scenario at once."""
+        self.book.update(exchange, price)
+        if len(self.book) < 2: return
+        buy_exchange, min_price = self.book.cheapest()
+        sell_exchange, max_price = self.book.richest()
+        if exchange != buy_exchange and exchange != sell_exchange: return
+
+        trade_volume = DEFAULT_TRADE_VOLUME
+        cost = trade_volume * min_price * (1 + self.slippage)
+        revenue = trade_volume * max_price * (1 - self.slippage)
+        net_profit = revenue - cost
+        opportunity = net_profit > self.min_profit
+        if not opportunity.any(): return
+        self.opportunities += opportunity
+
+        buy, sell = self.venues[buy_exchange], self.venues[sell_exchange]
+        rows = np.flatnonzero(opportunity & (self.usd[:, buy] >= cost) & (self.btc[:, sell] >= trade_volume))
+        if len(rows) == 0: return
+        self.usd[rows, buy] -= cost[rows]
+        self.btc[rows, buy] += trade_volume
+        self.btc[rows, sell] -= trade_volume
+        self.usd[rows, sell] += revenue[rows]
+        self.total_profit[rows] += net_profit[rows]
+        self.trade_count[rows] += 1
+        for i in rows:
+            self.strategies[i].trades.append({
+                "strategy": self.strategies[i].name,
+                "buy_ex": buy_exchange,
+                "sell_ex": sell_exchange,
+                "buy_price": min_price,
+                "sell_price": max_price,
+                "profit": float(net_profit[i])
+            })
+
+    def sync(self):
+        """Write balances, counters and latest prices back to the strategies."""
+        for i, s in enumerate(self.strategies):
+            s.total_profit = float(self.total_profit[i])
+            s.trade_count = int(self.trade_count[i])
+            s.opportunities = int(self.opportunities[i])
+            s.prices = dict(self.book.prices)
+            for ex, j in self.venues.items():
+                s.balances[ex] = {"USD": float(self.usd[i, j]), "BTC": float(self.btc[i, j])}
+
+# Arbitrage scenarios evaluated side by side
+SCENARIOS = [
+    {"name": "Conservative", "min_profit": 30.0, "slippage": 0.002},
+    {"name": "Balanced",     "min_profit": 10.0, "slippage": 0.001},
+    {"name": "Aggressive",   "min_profit": 5.0,  "slippage": 0.0005},
+]
+
+def build_scenarios(max_trades=None):
+    return [ArbitrageStrategy(s["name"], s["min_profit"], s["slippage"], max_trades) for s in SCENARIOS]
+
+class LiveEvaluator:
+    """
+    Streaming evaluation of arbitrage scenarios on live snapshots.
+
+    Each snapshot's prices go straight to the scenarios (one ArbitrageBank) in
+    receive-time order, instead of being collected for a backtest after the run. Only the last
+    `buffer` ticks are kept (a ring buffer), and rolling stats cover the last
+    `window` snapshots, so memory stays constant however long the run.
+    """
+    def __init__(self, strategies, buffer=DEFAULT_BUFFER, window=60):
+        self.strategies = strategies
+        self.bank = ArbitrageBank(strategies)
+        self.ticks = deque(maxlen=buffer) # (receive ts ns, exchange, price)
+        self.latest = {} # exchange -> last price
+        # Cumulative (profit, opportunities) of every scenario after each snapshot
+        self.history = deque([[(0.0, 0)] * len(strategies)], maxlen=window + 1)
+        self.snapshots = 0
+        self.tick_count = 0
+
+    def on_snapshot(self, prices):
+        """Feed one snapshot ({exchange: (price, receive ts)}) to every scenario."""
+        for ex, (price, received) in sorted(prices.items(), key=lambda item: item[1][1]):
+            self.ticks.append((received, ex, price))
+            self.latest[ex] = price
+            self.bank.on_price(ex, price)
+        self.bank.sync()
+        self.tick_count += len(prices)
+        self.snapshots += 1
+        self.history.append(list(zip(self.bank.total_profit.tolist(), self.bank.opportunities.tolist())))
+
+    def rolling(self):
+        """{scenario: (profit, opportunities)} over the last `window` snapshots."""
+        first, last = self.history[0], self.history[-1]
+        return {s.name: (b[0] - a[0], b[1] - a[1]) for s, a, b in zip(self.strategies, first, last)}
+
+    def spread(self):
+        """Widest current gap between venue prices."""
+        return max(self.latest.values()) - min(self.latest.values()) if len(self.latest) > 1 else 0.0
+
+    def status(self):
+        """One-line live summary: spread, then cumulative and rolling P&L per scenario."""
+        window = len(self.history) - 1
+        parts = [f"#{self.snapshots} spread ${self.spread():.2f}"]
+        rolling = self.rolling()
+        for s in self.strategies:
+            profit, opportunities = rolling[s.name]
+            parts.append(f"{s.name} ${s.total_profit:.2f} ({s.trade_count} tr) "
+                         f"last {window}: ${profit:+.2f}, {opportunities} opp")
+        return " | ".join(parts)
+
+def print_fetch_stats(fetcher):
+    print("\nExchange latency:")
+    for ex, st in fetcher.summary().items():
+        mean = f"{st['mean_ms']:.1f} ms" if st["mean_ms"] is not None else "-"
+        print(f"  {ex:<12} ok {st['ok']:<4} late {st['late']:<4} errors {st['errors']:<4} mean {mean}")
+
+def print_report(strategies):
+    print("\n" + "="*80)
+    print(f"{'STRATEGY':<15} | {'PROFIT ($)':<12} | {'TRADES':<8} | {'SLIPPAGE':<8}")
+    print("-" * 80)
+    
+    results = []
+    for s in strategies:
+        print(f"{s.name:<15} | ${s.total_profit:<11.2f} | {s.trade_count:<8} | {s.slippage_rate*100}%")
+        results.extend(s.trades)
+        
+    print("=" * 80)
+    
+    if results:
+        print("\nTop 5 Most Profitable Trades:")
+        trades_df = pl.DataFrame(results).sort("profit", descending=True).head(5)
+        print(trades_df)
+
+def stream(fetcher, args):
+    """Evaluate every snapshot as it arrives; runs until --duration (0: until interrupted)."""
+    evaluator = LiveEvaluator(build_scenarios(max_trades=args.buffer), buffer=args.buffer, window=args.window)
+    deadline = time.monotonic() + args.duration if args.duration > 0 else None
+    print(f"Streaming live evaluation of {len(SCENARIOS)} scenarios "
+          f"({'until interrupted' if deadline is None else f'for {args.duration}s'}, interval: {args.interval}s)...")
+    try:
+        while deadline is None or time.monotonic() < deadline:
+            evaluator.on_snapshot(fetcher.snapshot())
+            print(f"  [{time.strftime('%H:%M:%S')}] {evaluator.status()}")
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print("\nStopping live evaluation...")
+    print(f"\nEvaluated {evaluator.tick_count} ticks over {evaluator.snapshots} snapshots "
+          f"(last {len(evaluator.ticks)} kept).")
+    print_report(evaluator.strategies)
 
 def main():
     parser = argparse.ArgumentParser(description="Crypto Arbitrage Simulator (Live Data)")
     parser.add_argument("--duration", type=int, default=30, help="Duration to collect data in seconds")
-    parser.add_argument("--interval", type=int, default=5, help="Interval between snapshots in seconds")
+    parser.add_argument("--interval", type=float, default=5, help="Interval between snapshots in seconds")
+    parser.add_argument("--deadline", type=float, default=DEFAULT_DEADLINE,
+                        help="Seconds a snapshot waits for each exchange")
+    parser.add_argument("--stub", action="store_true",
+                        help="Fetch from a local stub server with canned payloads instead of the exchanges")
+    parser.add_argument("--stub-latency", type=float, default=0.05, help="Response delay of the stub server (seconds)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Evaluate each snapshot as it arrives and print rolling P&L (--duration 0: run until Ctrl-C)")
+    parser.add_argument("--buffer", type=int, default=DEFAULT_BUFFER, help="Recent ticks / trades kept in streaming mode")
+    parser.add_argument("--window", type=int, default=60, help="Snapshots covered by the rolling stats in streaming mode")
     args = parser.parse_args()
 
     print(f"=== Crypto Arbitrage Simulator ===")
-    print(f"Collecting live data for {args.duration}s (interval: {args.interval}s)...")
+    stub = StubExchangeServer(latency=args.stub_latency).start() if args.stub else None
+    if stub is not None:
+        print(f"Serving canned exchange payloads from {stub.urls()['Binance'].rsplit('/', 1)[0]}")
+    fetcher = PriceFetcher(stub.urls() if stub else EXCHANGE_APIS, deadline=args.deadline)
     
+    if args.stream:
+        try:
+            stream(fetcher, args)
+        finally:
+            fetcher.close()
+            if stub is not None:
+                stub.close()
+        print_fetch_stats(fetcher)
+        return
+
+    print(f"Collecting live data for {args.duration}s (interval: {args.interval}s)...")
     ticks = []
-    iterations = max(1, args.duration // args.interval)
+    iterations = max(1, int(args.duration // args.interval))
     
     start_time = time.time_ns()
     
     try:
         for i in range(iterations): 
             print(f"  [{i+1}/{iterations}] Fetching snapshot...", end="\r")
-            prices = fetch_prices_snapshot()
-            ts = time.time_ns()
+            prices = fetcher.snapshot()
             count = 0
-            for ex, price in prices.items():
+            for ex, (price, received) in prices.items():
                 ticks.append({
-                    "ts_exchange": ts,
+                    "ts_exchange": received,
                     "price": int(price * 1e8), 
                     "qty": int(1.0 * 1e8),
                     "side": 1,
@@ -177,6 +641,12 @@ def main():
             time.sleep(args.interval)
     except KeyboardInterrupt:
         print("\nStopping data collection...")
+    finally:
+        fetcher.close()
+        if stub is not None:
+            stub.close()
+
+    print_fetch_stats(fetcher)
 
     if not ticks:
         print("No data collected.")
@@ -192,38 +662,20 @@ def main():
     tester = Backtester(data=data_map, python_mode='tick')
     
     # Strategies
-    scenarios = [
-        {"name": "Conservative", "min_profit": 30.0, "slippage": 0.002},
-        {"name": "Balanced",     "min_profit": 10.0, "slippage": 0.001},
-        {"name": "Aggressive",   "min_profit": 5.0,  "slippage": 0.0005},
-    ]
-    
-    strategies = [ArbitrageStrategy(s["name"], s["min_profit"], s["slippage"]) for s in scenarios]
+    strategies = build_scenarios()
     
     print(f"\nRunning Parallel Backtest for {len(strategies)} strategies...")
     start_optim = time.perf_counter()
     
-    tester.run_many(strategies)
+    bank = ArbitrageBank(strategies)
+    tester.run_many([bank])
+    bank.sync()
     
     elapsed = time.perf_counter() - start_optim
     print(f"Backtest finished in {elapsed:.4f}s")
     
     # Report
-    print("\n" + "="*80)
-    print(f"{'STRATEGY':<15} | {'PROFIT ($)':<12} | {'TRADES':<8} | {'SLIPPAGE':<8}")
-    print("-" * 80)
-    
-    results = []
-    for s in strategies:
-        print(f"{s.name:<15} | ${s.total_profit:<11.2f} | {s.trade_count:<8} | {s.slippage_rate*100}%")
-        results.extend(s.trades)
-        
-    print("=" * 80)
-    
-    if results:
-        print("\nTop 5 Most Profitable Trades:")
-        trades_df = pl.DataFrame(results).sort("profit", descending=True).head(5)
-        print(trades_df)
+    print_report(strategies)
 
 if __name__ == "__main__":
     main()
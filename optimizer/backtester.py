@@ -0,0 +1,153 @@
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import polars as pl
+import pyarrow as pa
+
+from optimizer.data.loader import TS_PER_MS
+
+@dataclass
+class EngineContext:
+    """Execution context handed to strategies by the Python engine."""
+    batch_index: int = 0
+    ts_start: int = 0 # First ts_exchange of the current batch / tick
+    ts_end: int = 0   # Last ts_exchange of the current batch / tick
+    rows: int = 0
+
+class PyBacktester:
+    """
+    Pure-Python/NumPy streaming engine.
+
+    Mirrors the `rust_backtester.Backtester` interface (`run_arrow`, `run_many`)
+    so it can be used as a drop-in fallback and as a throughput cross-check.
+
+    Batch mode cuts the stream into `batch_ms` windows of `ts_exchange` and
+    calls `strategy.on_ticks(batch, ctx)` once per window. Tick mode calls
+    `strategy.on_tick(tick, ctx)` for every row.
+    """
+    def __init__(self, data: Optional[Dict[str, Any]] = None, python_mode: str = "batch", batch_ms: int = 1000):
+        if python_mode not in ("batch", "tick"):
+            raise ValueError(f"Unknown python_mode '{python_mode}'")
+        self.data = data or {}
+        self.python_mode = python_mode
+        self.batch_ms = batch_ms
+        self.last_run: Dict[str, Any] = {}
+
+    def iter_windows(self, stream: Iterable[pa.RecordBatch]) -> Iterable[pa.RecordBatch]:
+        """
+        Re-chunk a RecordBatch stream into `batch_ms` windows.
+
+        Window boundaries are found with vectorized bucketing of ts_exchange;
+        rows of a window that spans input batches are carried over and joined.
+        """
+        window = self.batch_ms * TS_PER_MS
+        pending: List[pa.RecordBatch] = []
+        pending_bucket = None
+
+        for rb in stream:
+            n = rb.num_rows
+            if n == 0:
+                continue
+            buckets = rb.column("ts_exchange").to_numpy() // window
+            cuts = np.flatnonzero(buckets[1:] != buckets[:-1]) + 1
+            starts = np.concatenate(([0], cuts))
+            ends = np.concatenate((cuts, [n]))
+
+            # Close the carried window if this batch starts a new one
+            if pending and buckets[0] != pending_bucket:
+                yield _join(pending)
+                pending = []
+
+            for i in range(len(starts) - 1):
+                seg = rb.slice(starts[i], ends[i] - starts[i])
+                if pending:
+                    pending.append(seg)
+                    yield _join(pending)
+                    pending = []
+                else:
+                    yield seg
+
+            # The last segment may continue into the next input batch. It is copied
+            # so producers may reuse the input buffers (e.g. shared-memory slots).
+            pending.append(pa.concat_batches([rb.slice(starts[-1], ends[-1] - starts[-1])]))
+            pending_bucket = buckets[-1]
+
+        if pending:
+            yield _join(pending)
+
+    def run_arrow(self, stream: Iterable[pa.RecordBatch], strategy: Any) -> None:
+        """Stream Arrow RecordBatches through a batch-mode strategy."""
+        self._run_batches(stream, [strategy])
+
+    def run_many(self, strategies: List[Any]) -> None:
+        """Run several strategies over the registered `data` frames in one pass."""
+        df = self._collect_data()
+        if self.python_mode == "tick":
+            self._run_ticks(df, strategies)
+        else:
+            self._run_batches(df.to_arrow().to_batches(), strategies)
+
+    def _collect_data(self) -> pl.DataFrame:
+        frames = []
+        for symbol, frame in self.data.items():
+            if isinstance(frame, pl.LazyFrame):
+                frame = frame.collect()
+            if "symbol" not in frame.columns:
+                frame = frame.with_columns(pl.lit(symbol).alias("symbol"))
+            frames.append(frame)
+        if not frames:
+            return pl.DataFrame({"ts_exchange": []}, schema={"ts_exchange": pl.Int64})
+        return pl.concat(frames, how="diagonal_relaxed").sort("ts_exchange", maintain_order=True)
+
+    def _run_batches(self, stream: Iterable[pa.RecordBatch], strategies: List[Any]) -> None:
+        start = time.perf_counter()
+        ctx = EngineContext()
+        rows = 0
+        batches = 0
+
+        for batch in self.iter_windows(stream):
+            ts = batch.column("ts_exchange")
+            ctx.batch_index = batches
+            ctx.ts_start = ts[0].as_py()
+            ctx.ts_end = ts[-1].as_py()
+            ctx.rows = batch.num_rows
+            for s in strategies:
+                s.on_ticks(batch, ctx)
+            rows += batch.num_rows
+            batches += 1
+
+        self._record_run(start, rows, batches, len(strategies))
+
+    def _run_ticks(self, df: pl.DataFrame, strategies: List[Any]) -> None:
+        start = time.perf_counter()
+        ctx = EngineContext()
+        rows = 0
+
+        for row in df.iter_rows(named=True):
+            tick = SimpleNamespace(**row)
+            ctx.batch_index = rows
+            ctx.ts_start = ctx.ts_end = row.get("ts_exchange", 0)
+            ctx.rows = 1
+            for s in strategies:
+                s.on_tick(tick, ctx)
+            rows += 1
+
+        self._record_run(start, rows, rows, len(strategies))
+
+    def _record_run(self, start: float, rows: int, batches: int, n_strategies: int) -> None:
+        elapsed = time.perf_counter() - start
+        self.last_run = {
+            "rows": rows,
+            "batches": batches,
+            "seconds": elapsed,
+            "rows_per_sec": rows / elapsed if elapsed > 0 else 0.0,
+            "events_per_sec": rows * n_strategies / elapsed if elapsed > 0 else 0.0,
+        }
+
+def _join(parts: List[pa.RecordBatch]) -> pa.RecordBatch:
+    if len(parts) == 1:
+        return parts[0]
+    return pa.concat_batches(parts)
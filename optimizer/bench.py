@@ -0,0 +1,266 @@
+import io
+import os
+import json
+import time
+import platform
+import resource
+import tempfile
+import contextlib
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import polars as pl
+import pyarrow as pa
+
+from optimizer.config import ExperimentConfig, DataConfig, OptimizationConfig, ParameterSpace, EngineConfig
+from optimizer.data.loader import create_arrow_iterator, build_cache, iter_ipc, ENGINE_SCHEMA
+from optimizer.data.synthetic import generate_csv, synthetic_batches
+from optimizer.engine import Optimizer, MultiStrategyWrapper
+from optimizer.strategy.registry import StrategyRegistry, discover_strategies
+
+SUITES = ("loader", "wrapper", "strategies", "e2e")
+DEFAULT_BASELINE = os.path.join("benchmarks", "baseline.json")
+
+# Default sweep; `quick` shrinks it to a smoke test
+DEFAULT_ROWS = 500_000
+DEFAULT_INSTANCES = (1, 10, 100, 1000)
+DEFAULT_BATCH_SIZES = (1_000, 10_000)
+QUICK = {"rows": 20_000, "instances": (1, 10), "batch_sizes": (1_000,), "repeat": 1}
+
+def run_benchmarks(suites: Iterable[str] = SUITES, rows: int = DEFAULT_ROWS,
+                   instances: Iterable[int] = DEFAULT_INSTANCES, batch_sizes: Iterable[int] = DEFAULT_BATCH_SIZES,
+                   repeat: int = 5, strategies: Optional[List[str]] = None, seed: int = 7,
+                   verbose: bool = True) -> Dict[str, Any]:
+    """
+    Run the selected suites and return {"meta": ..., "cases": {name: measurement}}.
+
+    Every case is timed `repeat` times and the fastest run is kept. A measurement
+    has events, batches, seconds, events_per_sec, latency_ms (mean per batch) and
+    peak_rss_mb (high-water mark of the process while the case ran).
+    """
+    discover_strategies()
+    unknown = set(suites) - set(SUITES)
+    if unknown:
+        raise ValueError(f"Unknown benchmark suites {sorted(unknown)} (expected some of {list(SUITES)})")
+    names = strategies or sorted(StrategyRegistry.list_strategies())
+    instances = sorted(instances)
+    cases: Dict[str, Dict[str, Any]] = {}
+
+    def record(name: str, fn: Callable[[], Dict[str, Any]]):
+        cases[name] = measure(fn, repeat)
+        if verbose:
+            m = cases[name]
+            print(f"   {name:<45} {m['events_per_sec']:>14,.0f} ev/s {m['latency_ms']:>9.3f} ms/batch "
+                  f"{m['peak_rss_mb']:>8.1f} MB")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "trades.csv")
+        generate_csv(csv_path, rows, seed)
+
+        if "loader" in suites:
+            if verbose:
+                print("📂 Loader")
+            record("loader/csv", lambda: bench_csv(csv_path))
+            with contextlib.redirect_stdout(io.StringIO()):
+                ipc_path = build_cache(csv_path, "ipc")
+            record("loader/ipc", lambda: bench_ipc(ipc_path))
+
+        if "wrapper" in suites or "strategies" in suites:
+            for size in batch_sizes:
+                batches = engine_batches(rows, size, seed)
+                if "wrapper" in suites:
+                    if verbose:
+                        print(f"🧩 Wrapper (batch={size:,})")
+                    # No instances: Arrow->NumPy conversion and bookkeeping only
+                    record(f"wrapper/batch={size}", lambda: bench_wrapper(batches, []))
+                if "strategies" in suites:
+                    for strategy in names:
+                        if verbose:
+                            print(f"📈 {strategy} (batch={size:,})")
+                        for n in instances:
+                            record(f"strategy/{strategy}/n={n}/batch={size}",
+                                   lambda: bench_wrapper(batches, build_instances(strategy, n, seed)))
+
+        if "e2e" in suites:
+            windows = count_windows(csv_path, EngineConfig().batch_ms)
+            for strategy in names:
+                if verbose:
+                    print(f"🚀 End-to-end {strategy}")
+                for n in instances:
+                    record(f"e2e/{strategy}/n={n}", lambda: bench_e2e(csv_path, rows, windows, strategy, n))
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "host": platform.node(),
+            "cpu": cpu_model(),
+            "rows": rows,
+            "repeat": repeat,
+        },
+        "cases": cases,
+    }
+
+def measure(fn: Callable[[], Dict[str, Any]], repeat: int = 5) -> Dict[str, Any]:
+    """Best of `repeat` runs of `fn`, which returns {"events", "batches", "seconds"}."""
+    reset_peak_rss()
+    best = None
+    for _ in range(max(1, repeat)):
+        run = fn()
+        if best is None or run["seconds"] < best["seconds"]:
+            best = run
+    seconds = best["seconds"]
+    return {
+        "events": best["events"],
+        "batches": best["batches"],
+        "seconds": seconds,
+        "events_per_sec": best["events"] / seconds if seconds > 0 else 0.0,
+        "latency_ms": seconds * 1000 / best["batches"] if best["batches"] else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+def bench_csv(path: str) -> Dict[str, Any]:
+    rows = batches = 0
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for rb in create_arrow_iterator(path):
+            rows += rb.num_rows
+            batches += 1
+    return {"events": rows, "batches": batches, "seconds": time.perf_counter() - start}
+
+def bench_ipc(path: str) -> Dict[str, Any]:
+    rows = batches = 0
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for rb in iter_ipc(path):
+            rows += rb.num_rows
+            batches += 1
+    return {"events": rows, "batches": batches, "seconds": time.perf_counter() - start}
+
+def bench_wrapper(batches: List[pa.RecordBatch], strategies: List[Any]) -> Dict[str, Any]:
+    """Feed pre-built engine batches straight to a MultiStrategyWrapper (no decode, no windowing)."""
+    wrapper = MultiStrategyWrapper(strategies)
+    start = time.perf_counter()
+    wrapper.start(None)
+    for rb in batches:
+        wrapper.on_ticks(rb, None)
+    wrapper.finish(None)
+    seconds = time.perf_counter() - start
+    return {"events": wrapper.rows_seen * max(1, len(strategies)), "batches": len(batches), "seconds": seconds}
+
+def bench_e2e(csv_path: str, rows: int, windows: int, strategy: str, n: int) -> Dict[str, Any]:
+    """Optimizer.run over the generated CSV with `n` distinct windows in a single process."""
+    config = ExperimentConfig(
+        experiment_name="bench",
+        data=DataConfig(path=csv_path),
+        strategy=strategy,
+        optimization=OptimizationConfig(method="grid", parallel_workers=1),
+        parameters={"window": ParameterSpace(type="int", values=list(range(2, 2 + n)))},
+        engine=EngineConfig(backend="python"),
+    )
+    opt = Optimizer(config)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        opt.run(verbose=False)
+    seconds = time.perf_counter() - start
+    return {"events": rows * n, "batches": windows, "seconds": seconds}
+
+def build_instances(strategy: str, n: int, seed: int = 7) -> List[Any]:
+    """`n` instances of a registered strategy with spread-out windows."""
+    cls = StrategyRegistry.get(strategy)
+    if cls is None:
+        raise ValueError(f"Strategy '{strategy}' not found in registry.")
+    rng = np.random.default_rng(seed)
+    instances = []
+    for i, window in enumerate(rng.integers(2, 500, n)):
+        s = cls(name=f"Bench_{i}")
+        if "window" in s.params:
+            s.set_params({"window": int(window)})
+        instances.append(s)
+    return instances
+
+def engine_batches(rows: int, batch_size: int, seed: int = 7) -> List[pa.RecordBatch]:
+    """Synthetic engine-schema batches of `batch_size` rows, generated up front."""
+    table = pa.Table.from_batches(list(synthetic_batches(rows, seed)), schema=ENGINE_SCHEMA)
+    return table.combine_chunks().to_batches(max_chunksize=batch_size)
+
+def count_windows(csv_path: str, batch_ms: int) -> int:
+    """Number of `batch_ms` windows (engine batches) the CSV's trades fall into."""
+    return pl.scan_csv(csv_path).select((pl.col("time") // batch_ms).n_unique()).collect().item()
+
+def reset_peak_rss() -> None:
+    """Reset the kernel's peak-RSS counter (Linux); elsewhere the lifetime peak is reported."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+def peak_rss_mb() -> float:
+    """Peak resident set size in MB since the last reset_peak_rss()."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, KB elsewhere
+    return peak / (1024 * 1024) if platform.system() == "Darwin" else peak / 1024
+
+def cpu_model() -> str:
+    """CPU model name (from /proc/cpuinfo on Linux), or the platform's processor string."""
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor()
+
+def same_machine(meta: Dict[str, Any], other: Dict[str, Any]) -> bool:
+    """Whether two runs' meta share a machine key (host name or CPU model)."""
+    return any(meta.get(key) and meta.get(key) == other.get(key) for key in ("host", "cpu"))
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[Dict[str, Any]]:
+    """
+    Cases whose events/s fell more than `tolerance` percent below the baseline.
+    Cases missing from either side are ignored.
+    """
+    regressions = []
+    for name, base in baseline.get("cases", {}).items():
+        current = results["cases"].get(name)
+        if current is None or not base.get("events_per_sec"):
+            continue
+        change = current["events_per_sec"] / base["events_per_sec"] - 1.0
+        if change < -tolerance / 100.0:
+            regressions.append({
+                "case": name,
+                "baseline": base["events_per_sec"],
+                "current": current["events_per_sec"],
+                "change_pct": change * 100.0,
+            })
+    return regressions
+
+def load_baseline(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_baseline(results: Dict[str, Any], path: str) -> None:
+    """Store events/s and latency per case (the fields compare() reads)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    cases = {
+        name: {"events_per_sec": round(m["events_per_sec"], 1), "latency_ms": round(m["latency_ms"], 4)}
+        for name, m in results["cases"].items()
+    }
+    with open(path, "w") as f:
+        json.dump({"meta": results["meta"], "cases": cases}, f, indent=2, sort_keys=True)
+        f.write("\n")
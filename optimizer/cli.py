@@ -1,9 +1,16 @@
 import argparse
+import json
 import sys
 import os
+import time
 from optimizer.config import ExperimentConfig
 from optimizer.engine import Optimizer
 from optimizer.reporting import Reporter
+from optimizer.data.synthetic import SyntheticConfig, generate_csv, CHUNK_ROWS
+from optimizer.bench import (
+    run_benchmarks, compare, load_baseline, save_baseline, same_machine,
+    SUITES, QUICK, DEFAULT_BASELINE, DEFAULT_ROWS, DEFAULT_INSTANCES, DEFAULT_BATCH_SIZES
+)
 from optimizer.strategy.registry import discover_strategies
 
 def main():
@@ -16,6 +23,42 @@ def main():
     # Run Command
     run_parser = subparsers.add_parser("run", help="Run an experiment")
     run_parser.add_argument("config", help="Path to TOML configuration file")
+    run_parser.add_argument("--resume", action="store_true",
+                            help="Continue from the last checkpoint of an interrupted run")
+    run_parser.add_argument("--profile", action="store_true",
+                            help="Time each pipeline stage and write reports/<experiment>/profile.json")
+    
+    # Bench Command
+    bench_parser = subparsers.add_parser("bench", help="Run throughput benchmarks")
+    bench_parser.add_argument("--suite", nargs="+", choices=SUITES, default=list(SUITES),
+                              help="Suites to run (default: all)")
+    bench_parser.add_argument("--strategy", nargs="+", help="Strategies to benchmark (default: all registered)")
+    bench_parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="Rows of generated trade data")
+    bench_parser.add_argument("--instances", type=int, nargs="+", default=list(DEFAULT_INSTANCES),
+                              help="Instance counts to sweep")
+    bench_parser.add_argument("--batch-size", type=int, nargs="+", default=list(DEFAULT_BATCH_SIZES),
+                              help="Rows per batch to sweep")
+    bench_parser.add_argument("--repeat", type=int, default=5, help="Runs per case (the fastest is kept)")
+    bench_parser.add_argument("--quick", action="store_true", help="Small smoke-test sweep")
+    bench_parser.add_argument("--baseline",
+                              help=f"Baseline file to compare against (default: {DEFAULT_BASELINE}, "
+                                   "only if recorded on this host or CPU model)")
+    bench_parser.add_argument("--no-compare", action="store_true", help="Skip the baseline comparison")
+    bench_parser.add_argument("--tolerance", type=float, default=25.0,
+                              help="Allowed slowdown vs the baseline in percent before failing")
+    bench_parser.add_argument("--save-baseline", action="store_true", help="Overwrite the baseline with this run")
+    bench_parser.add_argument("--output", default=os.path.join("reports", "bench", "bench.json"),
+                              help="Where to write the full results")
+    
+    # Generate Command
+    gen_parser = subparsers.add_parser("generate", help="Write synthetic trade data as CSV")
+    gen_parser.add_argument("output", help="CSV file to write (time, price, quantity, isbuyermaker)")
+    gen_parser.add_argument("--rows", type=int, default=1_000_000, help="Number of trades")
+    gen_parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    gen_parser.add_argument("--start-price", type=float, default=SyntheticConfig.start_price, help="Initial price")
+    gen_parser.add_argument("--start-ms", type=int, default=SyntheticConfig.start_ms,
+                            help="Epoch milliseconds of the first trade")
+    gen_parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="Rows generated per chunk (memory bound)")
     
     # Check args
     args = parser.parse_args()
@@ -39,7 +82,7 @@ def main():
         
         # Run
         try:
-            results = opt.run(verbose=True)
+            results = opt.run(verbose=True, resume=args.resume, profile=args.profile)
         except Exception as e:
             print(f"Execution failed: {e}")
             import traceback
@@ -49,10 +92,68 @@ def main():
         # Report
         reporter = Reporter(config.experiment_name)
         reporter.print_console(results)
-        reporter.save_json(results)
+        reporter.print_summary(opt.summary)
+        reporter.save_json(results, opt.summary)
+        if args.profile:
+            reporter.print_profile(opt.profile_report)
+            reporter.save_profile(opt.profile_report)
+        
+    elif args.command == "generate":
+        config = SyntheticConfig(start_price=args.start_price, start_ms=args.start_ms)
+        print(f"🎲 Generating {args.rows:,} synthetic trades (seed {args.seed})...")
+        start = time.perf_counter()
+        generate_csv(args.output, args.rows, seed=args.seed, config=config, chunk_rows=args.chunk_rows)
+        print(f"✅ Wrote {args.output} in {time.perf_counter() - start:.2f}s")
+        
+    elif args.command == "bench":
+        sys.exit(bench(args))
         
     else:
         parser.print_help()
 
+def bench(args) -> int:
+    """Run the benchmark suites; returns the exit code (1 on a regression vs the baseline)."""
+    sweep = dict(rows=args.rows, instances=args.instances, batch_sizes=args.batch_size, repeat=args.repeat)
+    if args.quick:
+        sweep.update(QUICK)
+    print(f"⏱️  Benchmarking {', '.join(args.suite)} on {sweep['rows']:,} rows")
+    results = run_benchmarks(args.suite, strategies=args.strategy, **sweep)
+    
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"📄 Saved benchmark results to {args.output}")
+    
+    path = args.baseline or DEFAULT_BASELINE
+    if args.save_baseline:
+        save_baseline(results, path)
+        print(f"📌 Baseline written to {path}")
+        return 0
+    if args.no_compare:
+        print("ℹ️  --no-compare given; skipping the baseline comparison")
+        return 0
+        
+    baseline = load_baseline(path)
+    if baseline is None:
+        print(f"ℹ️  No baseline at {path}; nothing to compare")
+        return 0
+    meta = baseline.get("meta", {})
+    if args.baseline is None and not same_machine(meta, results["meta"]):
+        # Throughput is machine-specific: the default baseline only gates the machine it came from
+        print(f"ℹ️  {path} was recorded on another machine (host {meta.get('host') or '?'}, "
+              f"CPU {meta.get('cpu') or '?'}); not comparing. Record one here with --save-baseline")
+        return 0
+    if meta.get("rows") != results["meta"]["rows"]:
+        print(f"ℹ️  Baseline was recorded on {baseline.get('meta', {}).get('rows')} rows; not comparable")
+        return 0
+    regressions = compare(results, baseline, args.tolerance)
+    if not regressions:
+        print(f"✅ No case is more than {args.tolerance:.0f}% slower than {path}")
+        return 0
+    print(f"❌ {len(regressions)} case(s) regressed by more than {args.tolerance:.0f}%:")
+    for r in regressions:
+        print(f"   {r['case']:<45} {r['baseline']:>14,.0f} -> {r['current']:>14,.0f} ev/s ({r['change_pct']:+.1f}%)")
+    return 1
+
 if __name__ == "__main__":
     main()
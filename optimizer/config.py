@@ -1,12 +1,19 @@
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 import tomllib
 
 @dataclass
 class DataConfig:
-    path: str
-    format: str = "csv"
+    # File or glob (one symbol, shards read in name order) or a list of them (one symbol each)
+    path: Union[str, List[str]]
+    format: str = "csv" # csv, parquet, ipc
     schema_type: str = "l1_quote"
+    cache: Optional[str] = None # ipc or parquet: columnar cache of a csv source
+    # Time range [start, end): epoch ms or ISO-8601 (UTC unless an offset is given)
+    start: Optional[Union[int, str]] = None
+    end: Optional[Union[int, str]] = None
+    prefetch: int = 0 # Batches decoded ahead on a background thread (0: decode inline)
+    symbols: Optional[List[str]] = None # Names of the `path` entries (default: file name prefix)
 
 @dataclass
 class ParameterSpace:
@@ -15,13 +22,40 @@ class ParameterSpace:
     min: Optional[float] = None
     max: Optional[float] = None
     values: Optional[List[Any]] = None
+    step: Optional[float] = None # Grid spacing for min/max ranges (default: `samples` points, rounded for ints)
 
 @dataclass
 class OptimizationConfig:
-    method: str = "grid"
+    method: str = "grid" # grid, monte_carlo, successive_halving, walk_forward
     samples: int = 10
     seed: Optional[int] = None
-    parallel_workers: int = 1
+    parallel_workers: int = 1 # <= 0 uses every core
+    shared_memory: bool = True # Decode once and broadcast batches to workers
+    inflight_batches: int = 4 # Shared-memory slots (bounds broadcast memory)
+    max_grid: int = 100_000 # Largest grid (points) a run accepts (0: no limit)
+    result_cache: Optional[str] = None # Directory of cached per-trial results (grid / monte_carlo)
+    checkpoint_interval: float = 0.0 # Seconds between state checkpoints (0 = off); resume with `run --resume`
+    checkpoint_dir: Optional[str] = None # Default: reports/<experiment_name>/checkpoints
+    incremental: bool = False # Snapshot end-of-data state; later runs only stream rows appended since
+    # successive_halving: first rung after min_rows rows, keep the best 1/eta by metric
+    eta: int = 3
+    min_rows: int = 100_000
+    metric: str = "roi"
+    # walk_forward: rolling folds of train_ms in-sample + test_ms out-of-sample,
+    # candidates drawn by `search`, best top_k (by metric) validated out-of-sample
+    search: str = "grid" # grid, monte_carlo
+    train_ms: int = 0
+    test_ms: int = 0
+    top_k: int = 1
+
+@dataclass
+class EngineConfig:
+    backend: str = "auto" # auto (Rust if installed), rust, python
+    vectorize: bool = True # Run strategies with a bank implementation as one vectorized unit
+    equity_samples: int = 0 # Downsampled equity points kept per instance for charts (0 = none)
+    batch_ms: int = 1000 # ts_exchange window handed to strategies per call
+    execution: str = "batch" # batch: act on each window's last tick; tick: act on every tick (vectorized)
+    float_dtype: str = "float64" # Price / qty arrays handed to strategies: float64 or float32
 
 @dataclass
 class ExperimentConfig:
@@ -31,6 +65,7 @@ class ExperimentConfig:
     optimization: OptimizationConfig
     parameters: Dict[str, ParameterSpace]
     constraints: Dict[str, float] = field(default_factory=dict)
+    engine: EngineConfig = field(default_factory=EngineConfig)
 
     @classmethod
     def from_toml(cls, path: str) -> 'ExperimentConfig':
@@ -45,6 +80,8 @@ class ExperimentConfig:
         opt_data = data.get("optimization", {})
         opt_conf = OptimizationConfig(**opt_data)
         
+        eng_conf = EngineConfig(**data.get("engine", {}))
+        
         params_map = {}
         for k, v in data.get("parameters", {}).items():
             params_map[k] = ParameterSpace(**v)
@@ -55,5 +92,6 @@ class ExperimentConfig:
             strategy=data.get("strategy"),
             optimization=opt_conf,
             parameters=params_map,
-            constraints=data.get("constraints", {})
+            constraints=data.get("constraints", {}),
+            engine=eng_conf
         )
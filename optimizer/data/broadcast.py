@@ -0,0 +1,156 @@
+import queue
+from multiprocessing import shared_memory
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pyarrow as pa
+
+from optimizer.data.loader import ENGINE_SCHEMA
+
+# Seconds between liveness checks while the producer waits for a free slot
+ACK_POLL_SECONDS = 0.5
+
+class BatchBroadcaster:
+    """
+    Decode once, fan out to many worker processes.
+
+    The producer copies each decoded RecordBatch into one slot of a shared-memory
+    ring and announces (slot, rows) to every consumer. A slot is reused only after
+    every consumer acknowledged it, so memory is bounded by `slots` batches of
+    `capacity` rows regardless of dataset size.
+
+    Consumers attach by name and read zero-copy NumPy views of the slot columns.
+    """
+    def __init__(self, consumers: int, manager: Any, slots: int = 4,
+                 capacity: int = 100_000, schema: pa.Schema = ENGINE_SCHEMA):
+        if consumers < 1 or slots < 1:
+            raise ValueError("BatchBroadcaster needs at least one consumer and one slot")
+        self.consumers = consumers
+        self.slots = slots
+        self.capacity = capacity
+        self.schema = schema
+        self.layout = slot_layout(schema, capacity)
+        self.slot_bytes = self.layout[-1][2]
+
+        self.shm = shared_memory.SharedMemory(create=True, size=self.slots * self.slot_bytes)
+        self.queues = [manager.Queue() for _ in range(consumers)]
+        self.acks = manager.Queue()
+
+    def consumer(self, index: int) -> "BatchConsumer":
+        """Picklable handle for consumer `index`."""
+        return BatchConsumer(self.shm.name, self.queues[index], self.acks, index,
+                             self.schema, self.capacity, self.slot_bytes)
+
+    def publish(self, stream: Iterable[pa.RecordBatch], abort: Optional[Callable[[], bool]] = None) -> int:
+        """
+        Copy every batch of `stream` into the ring and announce it to all consumers.
+        `abort` is polled while waiting for slots so a dead consumer cannot hang the producer.
+        Returns the number of rows published.
+        """
+        free = list(range(self.slots))
+        pending = [0] * self.slots
+        rows = 0
+
+        def wait_for_slot():
+            while not free:
+                try:
+                    slot = self.acks.get(timeout=ACK_POLL_SECONDS)
+                except queue.Empty:
+                    if abort is not None and abort():
+                        raise RuntimeError("Broadcast aborted: a consumer stopped early")
+                    continue
+                pending[slot] -= 1
+                if pending[slot] == 0:
+                    free.append(slot)
+            return free.pop()
+
+        try:
+            for rb in stream:
+                for start in range(0, rb.num_rows, self.capacity):
+                    part = rb.slice(start, self.capacity)
+                    slot = wait_for_slot()
+                    self._write(slot, part)
+                    pending[slot] = self.consumers
+                    for q in self.queues:
+                        q.put((slot, part.num_rows))
+                    rows += part.num_rows
+        finally:
+            for q in self.queues:
+                q.put(None)
+        return rows
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+    def _write(self, slot: int, batch: pa.RecordBatch):
+        n = batch.num_rows
+        base = slot * self.slot_bytes
+        for (name, dtype, _), (lo, _hi) in zip(self.layout, _offsets(self.layout)):
+            view = np.ndarray((n,), dtype=dtype, buffer=self.shm.buf, offset=base + lo)
+            col = batch.column(name).to_numpy(zero_copy_only=False)
+            np.copyto(view, col, casting="same_kind")
+
+class BatchConsumer:
+    """Worker side of a BatchBroadcaster: iterates RecordBatches backed by shared memory."""
+    def __init__(self, shm_name: str, announce: Any, acks: Any, index: int,
+                 schema: pa.Schema, capacity: int, slot_bytes: int):
+        self.shm_name = shm_name
+        self.announce = announce
+        self.acks = acks
+        self.index = index
+        self.schema = schema
+        self.capacity = capacity
+        self.slot_bytes = slot_bytes
+
+    def __iter__(self) -> Iterator[pa.RecordBatch]:
+        return self.iter_batches()
+
+    def iter_batches(self, copy: bool = False) -> Iterator[pa.RecordBatch]:
+        """
+        Yield one RecordBatch per published slot.
+
+        Batches are zero-copy views that stay valid until the next batch is
+        requested; pass copy=True for engines that keep references longer.
+        """
+        shm = shared_memory.SharedMemory(name=self.shm_name)
+        layout = slot_layout(self.schema, self.capacity)
+        held = None
+        try:
+            while True:
+                msg = self.announce.get()
+                if held is not None:
+                    self.acks.put(held)
+                    held = None
+                if msg is None:
+                    break
+                slot, n = msg
+                base = slot * self.slot_bytes
+                arrays = []
+                for (name, dtype, _), (lo, _hi) in zip(layout, _offsets(layout)):
+                    view = np.ndarray((n,), dtype=dtype, buffer=shm.buf, offset=base + lo)
+                    arrays.append(pa.array(view.copy() if copy else view))
+                held = slot
+                yield pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+        finally:
+            if held is not None:
+                self.acks.put(held)
+            try:
+                shm.close()
+            except BufferError:
+                # A caller still holds a view of the last batch; the mapping is released with it
+                pass
+
+def slot_layout(schema: pa.Schema, capacity: int) -> List[tuple]:
+    """(name, numpy dtype, end offset) of every column in one slot, 8-byte aligned."""
+    layout = []
+    end = 0
+    for field in schema:
+        dtype = np.dtype(field.type.to_pandas_dtype())
+        end += -(-capacity * dtype.itemsize // 8) * 8
+        layout.append((field.name, dtype, end))
+    return layout
+
+def _offsets(layout: List[tuple]) -> List[tuple]:
+    starts = [0] + [end for _, _, end in layout[:-1]]
+    return [(lo, end) for lo, (_, _, end) in zip(starts, layout)]
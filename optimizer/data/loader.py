@@ -1,63 +1,115 @@
+import io
 import os
+import re
+import glob
+import json
+import functools
+import hashlib
+from datetime import date, datetime, timedelta, timezone
+import numpy as np
 import polars as pl
 import pyarrow as pa
-from typing import Iterator
+import pyarrow.compute as pc
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from optimizer.data.merge import merge_streams, tag_symbol, chain_files
 
 # Constant for scaled integers (price * 1e8)
 FIXED_POINT = 100_000_000
 
-def create_arrow_iterator(csv_path: str, batch_size: int = 100_000) -> Iterator[pa.RecordBatch]:
+# Arrow schema consumed by the engines
+ENGINE_SCHEMA = pa.schema([
+    ("ts_exchange", pa.int64()), ("price", pa.int64()),
+    ("qty", pa.int64()), ("side", pa.int8()), ("symbol_id", pa.int64()),
+])
+
+# Engine schema with float prices / quantities, for engines that do not need fixed point
+FLOAT_SCHEMA = pa.schema([
+    ("ts_exchange", pa.int64()), ("price", pa.float64()),
+    ("qty", pa.float64()), ("side", pa.int8()), ("symbol_id", pa.int64()),
+])
+
+# Schema metadata key holding the fingerprint of the cached source file
+CACHE_META_KEY = b"crypt_arbitrage.source"
+
+# Bytes hashed at the head and tail of a source file for its fingerprint
+FINGERPRINT_BYTES = 1 << 20
+
+# Bytes of CSV text parsed per batch when reading an appended tail
+TAIL_BLOCK_BYTES = 64 << 20
+
+CACHE_EXTENSIONS = {"ipc": ".arrow", "parquet": ".parquet"}
+
+# Sidecar holding the per-chunk timestamp index of a columnar file
+INDEX_SUFFIX = ".idx.json"
+
+# ts_exchange ticks per millisecond of the raw `time` column (see _transform_exprs)
+TS_PER_MS = 1_000_000
+
+# Characters that make a data path a glob pattern
+GLOB_CHARS = "*?["
+
+def _transform_exprs(float_prices: bool = False):
+    """Polars expressions mapping raw trade columns to the engine schema (FLOAT_SCHEMA with `float_prices`)."""
+    # Assumes standard header with time, price, quantity, isbuyermaker
+    # Adjust logic if schema differs
+    if float_prices:
+        price = pl.col("price").cast(pl.Float64)
+        qty = pl.col("quantity").cast(pl.Float64)
+    else:
+        price = (pl.col("price") * FIXED_POINT).cast(pl.Int64)
+        qty = (pl.col("quantity") * FIXED_POINT).cast(pl.Int64)
+    return [
+        (pl.col("time") * 1_000_000).cast(pl.Int64).alias("ts_exchange"), # ms timestamp -> ns? Check engine expectation.
+        # Previous scripts used * 1_000_000 on 'time'. If 'time' is ms, this makes it ns.
+
+        price.alias("price"),
+        qty.alias("qty"),
+
+        # isbuyermaker=1 -> Maker is Buyer -> Taker is Seller (Side -1)
+        pl.when(pl.col("isbuyermaker") == 1)
+          .then(pl.lit(-1, dtype=pl.Int8))
+          .otherwise(pl.lit(1, dtype=pl.Int8))
+          .alias("side"),
+
+        pl.lit(0, dtype=pl.Int64).alias("symbol_id")
+    ]
+
+def create_arrow_iterator(csv_path: str, batch_size: int = 100_000, float_prices: bool = False) -> Iterator[pa.RecordBatch]:
     """
     Stream a CSV file as Arrow RecordBatches with the specific schema required by the Rust engine.
-    
+    With `float_prices`, price and qty stay float64 (FLOAT_SCHEMA) for the Python engine.
+
     Schema:
         - ts_exchange (int64): Timestamp in nanoseconds (or ms depending on engine config)
         - price (int64): Scaled price (val * 1e8)
         - qty (int64): Scaled quantity (val * 1e8)
         - side (int8): 1 (Buy/TakerBuy) or -1 (Sell/TakerSell)
-        - symbol_id (int64): 0 for single asset
+        - symbol_id (int64): 0 (multi-symbol datasets retag it per source, see open_stream)
     """
     if not os.path.exists(csv_path):
         raise FileNotFoundError(f"File not found: {csv_path}")
-        
+
     print(f"📂 Streaming data from {csv_path}...")
     reader = pl.read_csv_batched(csv_path, batch_size=batch_size)
-    
+
     batch_count = 0
     total_processed = 0
-    
+
     while True:
         batches = reader.next_batches(1)
         if not batches:
             break
-        
+
         chunk_df = batches[0]
         rows = len(chunk_df)
         total_processed += rows
         batch_count += 1
-        
-        # Transformation Logic
-        # Assumes standard header with time, price, quantity, isbuyermaker
-        # Adjust logic if schema differs
-        
-        exprs = [
-            (pl.col("time") * 1_000_000).cast(pl.Int64).alias("ts_exchange"), # ms timestamp -> ns? Check engine expectation. 
-            # Previous scripts used * 1_000_000 on 'time'. If 'time' is ms, this makes it ns.
-            
-            (pl.col("price") * FIXED_POINT).cast(pl.Int64).alias("price"),
-            (pl.col("quantity") * FIXED_POINT).cast(pl.Int64).alias("qty"),
-            
-            # isbuyermaker=1 -> Maker is Buyer -> Taker is Seller (Side -1)
-            pl.when(pl.col("isbuyermaker") == 1)
-              .then(pl.lit(-1, dtype=pl.Int8))
-              .otherwise(pl.lit(1, dtype=pl.Int8))
-              .alias("side"),
-              
-            pl.lit(0, dtype=pl.Int64).alias("symbol_id")
-        ]
-        
+
         try:
-            transformed_df = chunk_df.select(exprs)
+            transformed_df = chunk_df.select(_transform_exprs(float_prices))
             table = transformed_df.to_arrow()
             for batch in table.to_batches():
                 yield batch
@@ -66,3 +118,433 @@ def create_arrow_iterator(csv_path: str, batch_size: int = 100_000) -> Iterator[
             raise e
 
     print(f"✅ Finished streaming {total_processed:,} rows.")
+
+def source_fingerprint(path: str, size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Cheap identity of a source file: size, mtime and a hash of its head and tail.
+    Used to invalidate derived artifacts (caches, indexes) when the source changes.
+
+    With `size`, the file is fingerprinted as if it ended there, so a fingerprint
+    taken before an append still matches the unchanged prefix.
+    """
+    st = os.stat(path)
+    size = st.st_size if size is None else size
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        h.update(f.read(min(FINGERPRINT_BYTES, size)))
+        if size > FINGERPRINT_BYTES:
+            f.seek(max(FINGERPRINT_BYTES, size - FINGERPRINT_BYTES))
+            h.update(f.read(size - f.tell()))
+    return {"size": size, "mtime_ns": st.st_mtime_ns, "hash": h.hexdigest()}
+
+def is_appended(path: str, fingerprint: Dict[str, Any]) -> bool:
+    """True if `path` still starts with the contents fingerprinted earlier (possibly grown since)."""
+    if not os.path.exists(path) or os.path.getsize(path) < fingerprint["size"]:
+        return False
+    return source_fingerprint(path, fingerprint["size"])["hash"] == fingerprint["hash"]
+
+def csv_tail_offset(path: str, fingerprint: Dict[str, Any]) -> Optional[int]:
+    """Byte offset where rows appended after `fingerprint` start, or None if not on a line boundary."""
+    size = fingerprint["size"]
+    with open(path, "rb") as f:
+        f.seek(max(size - 1, 0))
+        return size if f.read(1) == b"\n" else None
+
+def iter_csv_tail(csv_path: str, offset: int, block_bytes: int = TAIL_BLOCK_BYTES,
+                  float_prices: bool = False) -> Iterator[pa.RecordBatch]:
+    """
+    Stream the rows of a CSV starting at byte `offset` (a line start) in the engine schema
+    (FLOAT_SCHEMA with `float_prices`).
+    Only the tail is read: blocks of whole lines are parsed with the file's header.
+    """
+    with open(csv_path, "rb") as f:
+        header = f.readline()
+        f.seek(max(offset, len(header)))
+        rest = b""
+        while True:
+            block = f.read(block_bytes)
+            data = rest + block
+            if not block:
+                cut = len(data)
+            else:
+                cut = data.rfind(b"\n") + 1
+            rest = data[cut:]
+            if data[:cut].strip():
+                chunk = pl.read_csv(io.BytesIO(header + data[:cut]))
+                yield from chunk.select(_transform_exprs(float_prices)).to_arrow().to_batches()
+            if not block:
+                return
+
+def cache_path_for(path: str, fmt: str = "ipc") -> str:
+    """Location of the columnar cache written next to the source file."""
+    if fmt not in CACHE_EXTENSIONS:
+        raise ValueError(f"Unknown cache format '{fmt}' (expected one of {list(CACHE_EXTENSIONS)})")
+    return path + CACHE_EXTENSIONS[fmt]
+
+def read_cache_fingerprint(cache_path: str) -> Optional[Dict[str, Any]]:
+    """Return the source fingerprint stored in a cache file, or None if unreadable."""
+    try:
+        if cache_path.endswith(CACHE_EXTENSIONS["parquet"]):
+            schema = pq.read_schema(cache_path)
+        else:
+            with pa.memory_map(cache_path, "r") as source:
+                schema = ipc.open_file(source).schema
+    except (OSError, pa.ArrowInvalid):
+        return None
+    meta = schema.metadata or {}
+    if CACHE_META_KEY not in meta:
+        return None
+    return json.loads(meta[CACHE_META_KEY])
+
+def is_cache_valid(source_path: str, cache_path: str) -> bool:
+    """A cache is valid if it exists and was built from the current source contents."""
+    if not os.path.exists(cache_path):
+        return False
+    return read_cache_fingerprint(cache_path) == source_fingerprint(source_path)
+
+def build_cache(csv_path: str, fmt: str = "ipc", batch_size: int = 100_000) -> str:
+    """
+    Decode a CSV once and persist it in the engine schema as Arrow IPC or Parquet.
+    The file is written to a temporary path and renamed, so readers never see partial caches.
+    """
+    cache_path = cache_path_for(csv_path, fmt)
+    fingerprint = source_fingerprint(csv_path)
+    schema = ENGINE_SCHEMA.with_metadata({CACHE_META_KEY: json.dumps(fingerprint)})
+    tmp_path = cache_path + ".tmp"
+
+    print(f"🗄️  Building {fmt} cache {cache_path}...")
+    try:
+        if fmt == "parquet":
+            with pq.ParquetWriter(tmp_path, schema) as writer:
+                for batch in create_arrow_iterator(csv_path, batch_size):
+                    writer.write_batch(batch, row_group_size=batch_size)
+        else:
+            with pa.OSFile(tmp_path, "wb") as sink, ipc.new_file(sink, schema) as writer:
+                for batch in create_arrow_iterator(csv_path, batch_size):
+                    writer.write_batch(batch)
+        os.replace(tmp_path, cache_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return cache_path
+
+def _to_engine_batch(batch: pa.RecordBatch) -> Iterator[pa.RecordBatch]:
+    """Yield a batch in the engine schema, transforming raw trade columns if needed."""
+    if batch.schema.names == ENGINE_SCHEMA.names:
+        yield batch.replace_schema_metadata(None)
+        return
+    transformed = pl.from_arrow(batch).select(_transform_exprs()).to_arrow()
+    for b in transformed.to_batches():
+        yield b
+
+def iter_ipc(path: str, chunks: Optional[List[int]] = None) -> Iterator[pa.RecordBatch]:
+    """Stream an Arrow IPC file through a memory map (zero-copy batches)."""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"File not found: {path}")
+    print(f"📂 Memory-mapping {path}...")
+    for _, batch in iter_chunks(path, "ipc", chunks):
+        yield batch
+
+def iter_parquet(path: str, batch_size: int = 100_000, chunks: Optional[List[int]] = None) -> Iterator[pa.RecordBatch]:
+    """Stream a Parquet file batch by batch from a memory map."""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"File not found: {path}")
+    print(f"📂 Memory-mapping {path}...")
+    for _, batch in iter_chunks(path, "parquet", chunks, batch_size):
+        yield batch
+
+def iter_chunks(path: str, fmt: str, chunks: Optional[List[int]] = None,
+                batch_size: int = 100_000) -> Iterator[Tuple[int, pa.RecordBatch]]:
+    """
+    Yield (chunk, engine batch) for the selected chunks of a columnar file (all by default).
+    A chunk is a record batch of an IPC file or a row group of a Parquet file.
+    """
+    if fmt == "parquet":
+        pf = pq.ParquetFile(path, memory_map=True)
+        for i in range(pf.num_row_groups) if chunks is None else chunks:
+            for batch in pf.iter_batches(batch_size=batch_size, row_groups=[i]):
+                for b in _to_engine_batch(batch):
+                    yield i, b
+        return
+    with pa.memory_map(path, "r") as source:
+        reader = ipc.open_file(source)
+        for i in range(reader.num_record_batches) if chunks is None else chunks:
+            for b in _to_engine_batch(reader.get_batch(i)):
+                yield i, b
+
+def index_path_for(path: str) -> str:
+    """Location of the timestamp index sidecar of a columnar file."""
+    return path + INDEX_SUFFIX
+
+def build_index(path: str, fmt: str) -> Dict[str, Any]:
+    """
+    Scan a columnar file once and persist its sparse timestamp index.
+
+    Every chunk gets its ts_exchange and price range, row count and the row
+    offset of its first row, so date ranges can be served by reading only
+    the chunks that overlap them.
+    """
+    chunks: List[Dict[str, Any]] = []
+    for i, batch in iter_chunks(path, fmt):
+        if batch.num_rows == 0:
+            continue
+        ts = pc.min_max(batch.column("ts_exchange"))
+        price = pc.min_max(batch.column("price"))
+        if chunks and chunks[-1]["chunk"] == i:
+            entry = chunks[-1]
+            entry["ts_max"] = max(entry["ts_max"], ts["max"].as_py())
+            entry["ts_min"] = min(entry["ts_min"], ts["min"].as_py())
+            entry["price_max"] = max(entry["price_max"], price["max"].as_py())
+            entry["price_min"] = min(entry["price_min"], price["min"].as_py())
+            entry["rows"] += batch.num_rows
+            continue
+        offset = chunks[-1]["offset"] + chunks[-1]["rows"] if chunks else 0
+        chunks.append({
+            "chunk": i, "offset": offset, "rows": batch.num_rows,
+            "ts_min": ts["min"].as_py(), "ts_max": ts["max"].as_py(),
+            "price_min": price["min"].as_py(), "price_max": price["max"].as_py(),
+        })
+
+    index = {"source": source_fingerprint(path), "format": fmt, "chunks": chunks}
+    index_path = index_path_for(path)
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(index, f)
+    os.replace(tmp_path, index_path)
+    return _index_arrays(index)
+
+def _index_arrays(index: Dict[str, Any]) -> Dict[str, Any]:
+    """Add the chunk ids and ts_exchange bounds as arrays (parsed once, searched by seek_chunks)."""
+    chunks = index["chunks"]
+    index["chunk_ids"] = np.array([c["chunk"] for c in chunks], dtype=np.int64)
+    index["ts_min"] = np.array([c["ts_min"] for c in chunks], dtype=np.int64)
+    index["ts_max"] = np.array([c["ts_max"] for c in chunks], dtype=np.int64)
+    return index
+
+def load_index(path: str, fmt: str) -> Dict[str, Any]:
+    """Read the index sidecar of a columnar file, rebuilding it if missing or stale."""
+    try:
+        with open(index_path_for(path)) as f:
+            index = json.load(f)
+        if index.get("source") == source_fingerprint(path) and index.get("format") == fmt:
+            return _index_arrays(index)
+    except (OSError, ValueError):
+        pass
+    print(f"🗂️  Indexing {path}...")
+    return build_index(path, fmt)
+
+def seek_chunks(index: Dict[str, Any], start: Optional[int] = None, end: Optional[int] = None) -> List[int]:
+    """
+    Chunks overlapping ts_exchange range [start, end) of an index from `load_index`,
+    found by binary search. Assumes the file is time-ordered, so chunk ranges are
+    monotonic. Only columnar files are indexed: a plain CSV (no `cache`) cannot
+    seek and is filtered while streaming.
+    """
+    ids = index["chunk_ids"]
+    lo = 0 if start is None else int(np.searchsorted(index["ts_max"], start, side="left"))
+    hi = len(ids) if end is None else int(np.searchsorted(index["ts_min"], end, side="left"))
+    return ids[lo:hi].tolist()
+
+def to_ts_exchange(value: Union[None, int, float, str, date, datetime]) -> Optional[int]:
+    """
+    Convert a DataConfig bound to ts_exchange units.
+    Numbers are epoch milliseconds (like the raw `time` column); strings are ISO-8601
+    dates/datetimes and, like TOML datetimes without an offset, are taken as UTC.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+        return (value - epoch) // timedelta(microseconds=1) * 1_000
+    return int(value * TS_PER_MS)
+
+def stream_schema(data_config, float_prices: bool = False) -> pa.Schema:
+    """Schema of the batches open_stream(data_config, float_prices=...) yields."""
+    plain_csv = data_config.format == "csv" and not data_config.cache
+    return FLOAT_SCHEMA if float_prices and plain_csv else ENGINE_SCHEMA
+
+def clip_stream(stream: Iterator[pa.RecordBatch], start: Optional[int] = None,
+                end: Optional[int] = None) -> Iterator[pa.RecordBatch]:
+    """Trim a time-ordered stream to ts_exchange range [start, end), stopping at `end`."""
+    for batch in stream:
+        ts = batch.column("ts_exchange").to_numpy()
+        if len(ts) == 0:
+            continue
+        lo = 0 if start is None else int(np.searchsorted(ts, start, side="left"))
+        hi = len(ts) if end is None else int(np.searchsorted(ts, end, side="left"))
+        if hi > lo:
+            yield batch if (lo == 0 and hi == len(ts)) else batch.slice(lo, hi - lo)
+        if hi < len(ts):
+            return
+
+# Stream position: (last ts_exchange consumed, rows consumed at that ts_exchange)
+Position = Tuple[int, int]
+
+def advance_position(ts: np.ndarray, position: Optional[Position] = None) -> Position:
+    """Position after consuming the time-ordered `ts` values from `position`."""
+    last = int(ts[-1])
+    at_last = len(ts) - int(np.searchsorted(ts, last, side="left"))
+    if position is not None and position[0] == last and at_last == len(ts):
+        at_last += position[1]
+    return last, at_last
+
+def skip_stream(stream: Iterator[pa.RecordBatch], position: Position) -> Iterator[pa.RecordBatch]:
+    """
+    Resume a time-ordered stream after `position`: drop every row before its
+    timestamp and the first `count` rows at it. Counting (rather than dropping
+    the whole timestamp) keeps later rows that share it, e.g. appended trades.
+    """
+    ts, remaining = position
+    stream = iter(stream)
+    for batch in stream:
+        values = batch.column("ts_exchange").to_numpy()
+        n = len(values)
+        if n == 0:
+            continue
+        lo = int(np.searchsorted(values, ts, side="left"))
+        hi = int(np.searchsorted(values, ts, side="right"))
+        skipped = min(remaining, hi - lo)
+        remaining -= skipped
+        cut = lo + skipped
+        if cut < n:
+            yield batch if cut == 0 else batch.slice(cut)
+        if hi < n or (remaining == 0 and lo < n):
+            # Past the position: the rest passes through untouched
+            yield from stream
+            return
+
+def relative_position(position: Position, start: Optional[Position]) -> Position:
+    """`position` for a stream that already starts after `start` (e.g. a shared broadcast)."""
+    if start is not None and start[0] == position[0]:
+        return position[0], max(position[1] - start[1], 0)
+    return position
+
+def dataset_sources(data_config) -> List[Tuple[str, List[str]]]:
+    """
+    (symbol, files) of every source of a DataConfig, in symbol_id order.
+
+    `path` is one file or glob (a single symbol) or a list of them (one symbol
+    per entry). The matches of a glob are that symbol's shards (e.g. daily files),
+    read in file-name order, so shards of one symbol must not overlap in time.
+    Symbols are named by `symbols`, else by their first file's name up to its
+    first "-", "_" or "." (BTCUSDT-trades-2024-01-01.csv -> BTCUSDT).
+    """
+    paths = [data_config.path] if isinstance(data_config.path, str) else list(data_config.path)
+    if not paths:
+        raise ValueError("data.path lists no files")
+    names = getattr(data_config, "symbols", None)
+    if names is not None and len(names) != len(paths):
+        raise ValueError(f"data.symbols has {len(names)} names for {len(paths)} paths")
+    sources = []
+    for k, pattern in enumerate(paths):
+        if any(c in pattern for c in GLOB_CHARS):
+            files = sorted(glob.glob(pattern))
+            if not files:
+                raise FileNotFoundError(f"No files match: {pattern}")
+        else:
+            files = [pattern]
+        name = names[k] if names else re.split(r"[-_.]", os.path.basename(files[0]))[0]
+        sources.append((name, files))
+    return sources
+
+def dataset_symbols(data_config) -> List[str]:
+    """Symbol names of a DataConfig; the index of a name is its symbol_id."""
+    return [name for name, _ in dataset_sources(data_config)]
+
+def single_file(data_config) -> Optional[str]:
+    """The file of a single-file dataset, or None when it has several sources or shards."""
+    sources = dataset_sources(data_config)
+    if len(sources) == 1 and len(sources[0][1]) == 1:
+        return sources[0][1][0]
+    return None
+
+def dataset_fingerprint(data_config) -> Dict[str, Any]:
+    """
+    source_fingerprint of a single-file dataset. A multi-file dataset gets the
+    fingerprint of each file under "files", plus a total size and a hash over
+    the symbols and their files' hashes.
+    """
+    path = single_file(data_config)
+    if path is not None:
+        return source_fingerprint(path)
+    sources = dataset_sources(data_config)
+    files = {f: source_fingerprint(f) for _, paths in sources for f in paths}
+    h = hashlib.blake2b(digest_size=16)
+    h.update(json.dumps([[name, [files[f]["hash"] for f in paths]] for name, paths in sources]).encode())
+    return {"size": sum(fp["size"] for fp in files.values()), "hash": h.hexdigest(), "files": files}
+
+def dataset_appended(data_config, fingerprint: Dict[str, Any]) -> bool:
+    """
+    True if the dataset only grew since `fingerprint` (see dataset_fingerprint):
+    every file still starts with its old contents; new shards may have been added.
+    """
+    if "files" in fingerprint:
+        return all(is_appended(f, fp) for f, fp in fingerprint["files"].items())
+    path = single_file(data_config)
+    return path is not None and is_appended(path, fingerprint)
+
+def open_stream(data_config, batch_size: int = 100_000, float_prices: bool = False) -> Iterator[pa.RecordBatch]:
+    """
+    Open the tick stream described by a DataConfig.
+
+    - format "csv": decode the CSV, or read its columnar cache when `cache` is set
+      (the cache is rebuilt whenever the source size/mtime/hash changes).
+    - format "ipc"/"arrow" or "parquet": stream the file directly.
+
+    `start`/`end` restrict the stream to [start, end). Columnar files (direct or
+    cached) seek straight to the overlapping chunks through their index sidecar;
+    a plain CSV has no chunk offsets and is filtered while streaming.
+
+    `float_prices` applies to plain CSVs only (see stream_schema); columnar files
+    are stored and read in the fixed-point ENGINE_SCHEMA.
+
+    Multi-file datasets (see dataset_sources) read each symbol's shards one after
+    another, tag their rows with the symbol's index as `symbol_id`, and merge the
+    symbols into one time-ordered stream (merge_streams).
+    """
+    sources = dataset_sources(data_config)
+    if len(sources) == 1 and len(sources[0][1]) == 1:
+        return _open_file(data_config, sources[0][1][0], batch_size, float_prices)
+    open_file = functools.partial(_open_file, data_config, batch_size=batch_size, float_prices=float_prices)
+    streams = [tag_symbol(chain_files(files, open_file), k) for k, (_, files) in enumerate(sources)]
+    return streams[0] if len(streams) == 1 else merge_streams(streams)
+
+def _open_file(data_config, path: str, batch_size: int, float_prices: bool) -> Iterator[pa.RecordBatch]:
+    """open_stream for one file of the dataset."""
+    fmt = data_config.format
+    start = to_ts_exchange(getattr(data_config, "start", None))
+    end = to_ts_exchange(getattr(data_config, "end", None))
+
+    if fmt in ("ipc", "arrow"):
+        fmt = "ipc"
+    elif fmt == "csv":
+        cache_fmt = data_config.cache
+        if not cache_fmt:
+            return clip_stream(create_arrow_iterator(path, batch_size, float_prices), start, end)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"File not found: {path}")
+        cache_path = cache_path_for(path, cache_fmt)
+        if not is_cache_valid(path, cache_path):
+            build_cache(path, cache_fmt, batch_size)
+        path, fmt = cache_path, cache_fmt
+    elif fmt != "parquet":
+        raise ValueError(f"Unknown data format '{fmt}'")
+
+    chunks = None
+    if start is not None or end is not None:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"File not found: {path}")
+        index = load_index(path, fmt)
+        chunks = seek_chunks(index, start, end)
+        print(f"⏩ Seeking: {len(chunks)} of {len(index['chunks'])} chunks overlap the requested range")
+    if fmt == "parquet":
+        stream = iter_parquet(path, batch_size, chunks)
+    else:
+        stream = iter_ipc(path, chunks)
+    return clip_stream(stream, start, end) if chunks is not None else stream
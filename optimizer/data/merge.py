@@ -0,0 +1,74 @@
+import itertools
+from typing import Callable, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pyarrow as pa
+
+def merge_streams(streams: List[Iterable[pa.RecordBatch]], key: str = "ts_exchange") -> Iterator[pa.RecordBatch]:
+    """
+    K-way merge of time-ordered batch streams into one time-ordered stream.
+
+    Each source holds at most one pending batch, so memory is bounded by one
+    batch per source whatever the dataset size. Every round emits, from all
+    pending batches at once, the rows up to the watermark: the smallest last
+    `key` among the pending batches. No source can still produce an earlier row,
+    and the source that set the watermark is drained and refilled next round.
+    The emitted slices are interleaved with one stable argsort and a single
+    gather; rows of one source keep their order, and a slice that does not
+    overlap the others is passed through without copying.
+    """
+    iters = [iter(s) for s in streams]
+    pending: List[Optional[pa.RecordBatch]] = [None] * len(iters)
+    keys: List[Optional[np.ndarray]] = [None] * len(iters)
+    live = list(range(len(iters)))
+
+    while True:
+        for i in list(live):
+            while pending[i] is None:
+                batch = next(iters[i], None)
+                if batch is None:
+                    live.remove(i)
+                    break
+                if batch.num_rows:
+                    pending[i] = batch
+                    keys[i] = batch.column(key).to_numpy()
+        if not live:
+            return
+        if len(live) == 1:
+            # The other sources are exhausted: the rest needs no merging
+            i = live[0]
+            yield pending[i]
+            yield from (b for b in iters[i] if b.num_rows)
+            return
+
+        watermark = min(keys[i][-1] for i in live)
+        parts, part_keys = [], []
+        for i in live:
+            cut = int(np.searchsorted(keys[i], watermark, side="right"))
+            if cut == 0:
+                continue
+            parts.append(pending[i].slice(0, cut))
+            part_keys.append(keys[i][:cut])
+            if cut == len(keys[i]):
+                pending[i] = keys[i] = None
+            else:
+                pending[i] = pending[i].slice(cut)
+                keys[i] = keys[i][cut:]
+
+        if len(parts) == 1:
+            yield parts[0]
+            continue
+        order = np.argsort(np.concatenate(part_keys), kind="stable")
+        yield pa.concat_batches(parts).take(pa.array(order))
+
+def tag_symbol(stream: Iterable[pa.RecordBatch], symbol_id: int) -> Iterator[pa.RecordBatch]:
+    """Overwrite the `symbol_id` column of every batch with `symbol_id`."""
+    for batch in stream:
+        if symbol_id:
+            column = pa.array(np.full(batch.num_rows, symbol_id, dtype=np.int64))
+            batch = batch.set_column(batch.schema.get_field_index("symbol_id"), "symbol_id", column)
+        yield batch
+
+def chain_files(paths: List[str], open_file: Callable[[str], Iterable[pa.RecordBatch]]) -> Iterator[pa.RecordBatch]:
+    """Batches of consecutive shards, each opened only when the previous one is exhausted."""
+    return itertools.chain.from_iterable(open_file(path) for path in paths)
@@ -0,0 +1,113 @@
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+# Seconds between stop checks while the producer waits for a free slot
+PUT_POLL_SECONDS = 0.1
+
+_DONE = object()
+
+class Prefetcher:
+    """
+    Decode ahead on a background thread.
+
+    A producer thread drains `source` into a bounded queue of `depth` ready
+    batches while the consumer runs strategies on earlier ones. CSV parsing,
+    Polars transforms and Arrow conversion release the GIL, so decode overlaps
+    with compute; memory is bounded by `depth` batches.
+
+    Stats (see `stats()`) size the queue: `starved` counts batches the consumer
+    had to wait for (decode is the bottleneck, more depth will not help), and
+    `blocked` counts batches the producer held because the queue was full
+    (backpressure: compute is the bottleneck).
+    """
+    def __init__(self, source: Iterable[Any], depth: int = 4):
+        if depth < 1:
+            raise ValueError("prefetch depth must be >= 1")
+        self.depth = depth
+        self.queue: "queue.Queue[Any]" = queue.Queue(maxsize=depth)
+        self.stop = threading.Event()
+        self.error: Optional[BaseException] = None
+        self.batches = 0
+        self.starved = 0
+        self.starved_seconds = 0.0
+        self.blocked = 0
+        self.blocked_seconds = 0.0
+        self.filled = 0 # Sum of ready batches seen at each get (mean occupancy)
+        self.thread = threading.Thread(target=self._produce, args=(source,), name="prefetch", daemon=True)
+        self.thread.start()
+
+    def _produce(self, source: Iterable[Any]) -> None:
+        try:
+            for item in source:
+                if not self._put(item):
+                    return
+        except BaseException as e: # Re-raised on the consumer side
+            self.error = e
+        self._put(_DONE)
+
+    def _put(self, item: Any) -> bool:
+        try:
+            self.queue.put_nowait(item)
+            return True
+        except queue.Full:
+            pass
+        self.blocked += 1
+        start = time.perf_counter()
+        try:
+            while not self.stop.is_set():
+                try:
+                    self.queue.put(item, timeout=PUT_POLL_SECONDS)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        finally:
+            self.blocked_seconds += time.perf_counter() - start
+
+    def __iter__(self) -> Iterator[Any]:
+        try:
+            while True:
+                self.filled += self.queue.qsize()
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    start = time.perf_counter()
+                    item = self.queue.get()
+                    self.starved_seconds += time.perf_counter() - start
+                    if item is not _DONE:
+                        self.starved += 1
+                if item is _DONE:
+                    if self.error is not None:
+                        raise self.error
+                    return
+                self.batches += 1
+                yield item
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Stop the producer (e.g. when the consumer stops early) and wait for it."""
+        self.stop.set()
+        while self.thread.is_alive():
+            try:
+                self.queue.get_nowait() # Unblock a pending put
+            except queue.Empty:
+                pass
+            self.thread.join(timeout=PUT_POLL_SECONDS)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "depth": self.depth,
+            "batches": self.batches,
+            "starved": self.starved,
+            "starved_seconds": self.starved_seconds,
+            "blocked": self.blocked,
+            "blocked_seconds": self.blocked_seconds,
+            "mean_ready": self.filled / max(self.batches, 1),
+        }
+
+def prefetch(source: Iterable[Any], depth: int) -> Iterable[Any]:
+    """`source` decoded ahead by a Prefetcher, or unchanged when `depth` is 0."""
+    return Prefetcher(source, depth) if depth > 0 else source
@@ -0,0 +1,191 @@
+import os
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional
+
+import numpy as np
+import polars as pl
+import pyarrow as pa
+
+from optimizer.data.loader import _transform_exprs
+
+# Rows generated per chunk; memory use is bounded by one chunk regardless of total rows
+CHUNK_ROWS = 1_000_000
+
+@dataclass
+class SyntheticConfig:
+    """
+    Shape of the generated trade stream.
+
+    Volatility follows a Markov chain over `regimes`; each regime has its own
+    per-trade log-return std (`sigma`), arrival rate multiplier (`activity`) and
+    mean dwell time in trades (`dwell`). Trades arrive in clusters (one aggressive
+    order sweeping several fills): cluster sizes are geometric with mean
+    `cluster_mean`, fills inside a cluster are `intra_gap_ms` apart on average,
+    and every fill of a cluster has the same side. The k-th fill of a sweep trades
+    `impact * (k + 1)` (relative) through the mid in the aggressor's direction;
+    the mid itself is a driftless random walk, so sweeps do not accumulate.
+    """
+    start_ms: int = 1_700_000_000_000
+    start_price: float = 30_000.0
+    tick_size: float = 0.01
+    mean_gap_ms: float = 20.0 # Mean time between clusters at activity 1
+    intra_gap_ms: float = 0.2
+    cluster_mean: float = 3.0
+    impact: float = 1e-5 # Relative price step per level a sweep walks the book
+    sigma: List[float] = field(default_factory=lambda: [2e-5, 5e-5, 1.5e-4])
+    activity: List[float] = field(default_factory=lambda: [0.5, 1.0, 4.0])
+    dwell: List[float] = field(default_factory=lambda: [200_000.0, 100_000.0, 20_000.0])
+    qty_mu: float = -4.0 # Log-normal trade size
+    qty_sigma: float = 1.5
+    max_imbalance: float = 0.1 # Per-regime-spell bias of P(buy) away from 0.5
+
+class SyntheticTrades:
+    """
+    Seeded, chunked generator of realistic-looking trade ticks.
+
+    Produces the raw trade layout read by `create_arrow_iterator`
+    (`time` in ms, `price`, `quantity`, `isbuyermaker`) one chunk at a time,
+    carrying the clock, price, regime and open cluster across chunks, so any
+    number of rows can be generated in memory bounded by `chunk_rows`.
+    The same seed, config and chunk size always give the same stream.
+    """
+    def __init__(self, rows: int, seed: int = 0, config: Optional[SyntheticConfig] = None,
+                 chunk_rows: int = CHUNK_ROWS):
+        self.rows = rows
+        self.seed = seed
+        self.config = config or SyntheticConfig()
+        self.chunk_rows = max(1, chunk_rows)
+        n = len(self.config.sigma)
+        if not (len(self.config.activity) == len(self.config.dwell) == n and n > 0):
+            raise ValueError("sigma, activity and dwell need one entry per regime")
+
+    def frames(self) -> Iterator[pl.DataFrame]:
+        """Chunks of raw trades as Polars DataFrames."""
+        cfg = self.config
+        rng = np.random.default_rng(self.seed)
+        sigma = np.asarray(cfg.sigma)
+        activity = np.asarray(cfg.activity)
+        dwell = np.asarray(cfg.dwell)
+        n_regimes = len(sigma)
+
+        clock = float(cfg.start_ms)
+        log_price = np.log(cfg.start_price)
+        regime = int(rng.integers(n_regimes))
+        regime_left = int(rng.geometric(1.0 / dwell[regime])) # Trades left in the current regime spell
+        bias = rng.uniform(-cfg.max_imbalance, cfg.max_imbalance)
+        cluster_side = 1.0
+        cluster_left = 0 # Fills left in a cluster cut by the previous chunk
+        cluster_done = 0 # Fills of that cluster already emitted
+
+        remaining = self.rows
+        while remaining > 0:
+            n = min(self.chunk_rows, remaining)
+            remaining -= n
+
+            # Regime of every trade: spells of geometric length, next regime drawn uniformly
+            regimes = np.empty(n, dtype=np.int64)
+            biases = np.empty(n)
+            pos = 0
+            while pos < n:
+                if regime_left == 0:
+                    if n_regimes > 1:
+                        regime = (regime + rng.integers(1, n_regimes)) % n_regimes
+                    regime_left = int(rng.geometric(1.0 / dwell[regime]))
+                    bias = rng.uniform(-cfg.max_imbalance, cfg.max_imbalance)
+                take = min(regime_left, n - pos)
+                regimes[pos:pos + take] = regime
+                biases[pos:pos + take] = bias
+                regime_left -= take
+                pos += take
+
+            # Cluster layout: the carried cluster first, then fresh geometric clusters
+            parts = [np.array([cluster_left], dtype=np.int64)] if cluster_left else []
+            covered = cluster_left
+            while covered < n:
+                draw = rng.geometric(1.0 / cfg.cluster_mean, size=int((n - covered) / cfg.cluster_mean) + 16)
+                parts.append(draw.astype(np.int64))
+                covered += int(draw.sum())
+            sizes = np.concatenate(parts)
+            ends = np.cumsum(sizes)
+            last = int(np.searchsorted(ends, n))
+            next_left = int(ends[last] - n)
+            sizes = sizes[:last + 1]
+            sizes[-1] -= next_left
+            starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+            carried = bool(cluster_left)
+
+            # Gaps: clusters arrive faster in active regimes, fills inside a cluster are near-simultaneous
+            gaps = rng.exponential(cfg.intra_gap_ms, size=n)
+            heads = starts[1:] if carried else starts
+            gaps[heads] = rng.exponential(cfg.mean_gap_ms, size=len(heads)) / activity[regimes[heads]]
+            times = clock + np.cumsum(gaps)
+            clock = float(times[-1])
+
+            # Every fill of a cluster shares its side; P(buy) is tilted by the spell's imbalance
+            p_buy = 0.5 + biases[starts]
+            sides = np.where(rng.random(len(starts)) < p_buy, 1.0, -1.0)
+            if carried:
+                sides[0] = cluster_side
+            side = np.repeat(sides, sizes)
+            level = np.arange(n) - np.repeat(starts, sizes)
+            if carried:
+                level[:sizes[0]] += cluster_done
+            cluster_side = float(sides[-1])
+            cluster_done = int(level[-1]) + 1 if next_left else 0
+            cluster_left = next_left
+
+            # Mid: driftless log random walk with regime volatility; fills sweep through it
+            path = log_price + np.cumsum(rng.standard_normal(n) * sigma[regimes])
+            log_price = float(path[-1])
+            fills = np.exp(path) * (1.0 + cfg.impact * (level + 1) * side)
+            prices = np.maximum(np.round(fills / cfg.tick_size) * cfg.tick_size, cfg.tick_size)
+
+            # Bigger fills in busier regimes
+            qtys = np.round(rng.lognormal(cfg.qty_mu, cfg.qty_sigma, size=n) * np.sqrt(activity[regimes]), 8)
+            qtys = np.maximum(qtys, 1e-8)
+
+            yield pl.DataFrame({
+                "time": np.floor(times).astype(np.int64),
+                "price": np.round(prices, 8),
+                "quantity": qtys,
+                "isbuyermaker": side < 0, # Seller was the taker
+            })
+
+    def batches(self) -> Iterator[pa.RecordBatch]:
+        """Chunks converted straight to engine-schema RecordBatches (no CSV round trip)."""
+        for frame in self.frames():
+            yield from frame.select(_transform_exprs()).to_arrow().to_batches()
+
+    def write_csv(self, path: str) -> str:
+        """Stream every chunk into one CSV file (header written once)."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            for i, frame in enumerate(self.frames()):
+                frame.write_csv(f, include_header=(i == 0))
+        os.replace(tmp_path, path)
+        return path
+
+def generate_csv(path: str, rows: int, seed: int = 0, config: Optional[SyntheticConfig] = None,
+                 chunk_rows: int = CHUNK_ROWS) -> str:
+    """Write `rows` synthetic trades to `path` in the raw CSV layout."""
+    return SyntheticTrades(rows, seed, config, chunk_rows).write_csv(path)
+
+def synthetic_batches(rows: int, seed: int = 0, config: Optional[SyntheticConfig] = None,
+                      chunk_rows: int = CHUNK_ROWS) -> Iterator[pa.RecordBatch]:
+    """Engine-schema RecordBatches of `rows` synthetic trades."""
+    return SyntheticTrades(rows, seed, config, chunk_rows).batches()
+
+def random_walk_trades(rows: int, seed: int = 0, step_ms: int = 50, start_ms: int = 0,
+                       start_price: float = 100.0) -> pl.DataFrame:
+    """
+    Minimal raw-layout trades (one every `step_ms`, Gaussian random-walk price,
+    uniform size, random side) for small deterministic tests.
+    """
+    rng = np.random.default_rng(seed)
+    return pl.DataFrame({
+        "time": start_ms + np.arange(rows, dtype=np.int64) * step_ms,
+        "price": start_price + np.cumsum(rng.normal(0, 0.1, rows)),
+        "quantity": rng.uniform(0.1, 2.0, rows),
+        "isbuyermaker": rng.integers(0, 2, rows),
+    })
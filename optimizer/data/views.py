@@ -0,0 +1,78 @@
+from typing import Dict, Tuple
+
+import numpy as np
+import pyarrow as pa
+
+from optimizer.data.loader import FIXED_POINT
+
+# Price / quantity dtypes strategies can be handed
+FLOAT_DTYPES = ("float64", "float32")
+
+class BatchDecoder:
+    """
+    Decoded NumPy views of engine batches: (prices, qtys, sides) once per batch.
+
+    Float columns (FLOAT_SCHEMA) of the requested dtype are returned as zero-copy
+    views of the Arrow buffers. Fixed-point int64 columns are divided by
+    FIXED_POINT straight into preallocated output buffers that only grow, so the
+    steady state allocates nothing per batch.
+
+    The returned arrays are read-only (or overwritten by the next batch):
+    strategies must copy anything they keep beyond the current on_ticks call.
+    """
+    def __init__(self, dtype: str = "float64"):
+        if dtype not in FLOAT_DTYPES:
+            raise ValueError(f"Unknown float dtype '{dtype}' (expected one of {list(FLOAT_DTYPES)})")
+        self.dtype = np.dtype(dtype)
+        self.prices = np.empty(0, dtype=self.dtype)
+        self.qtys = np.empty(0, dtype=self.dtype)
+        # Symbol-grouped copies of the decoded columns (see split)
+        self.grouped = (np.empty(0, dtype=self.dtype), np.empty(0, dtype=self.dtype), np.empty(0, dtype=np.int8))
+
+    def decode(self, batch: pa.RecordBatch) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        n = batch.num_rows
+        if n > len(self.prices):
+            capacity = max(n, 2 * len(self.prices))
+            self.prices = np.empty(capacity, dtype=self.dtype)
+            self.qtys = np.empty(capacity, dtype=self.dtype)
+        prices = self._column(batch.column("price"), self.prices[:n])
+        qtys = self._column(batch.column("qty"), self.qtys[:n])
+        sides = batch.column("side").to_numpy()
+        if sides.dtype != np.int8:
+            sides = sides.astype(np.int8)
+        return prices, qtys, sides
+
+    def _column(self, column: pa.Array, out: np.ndarray) -> np.ndarray:
+        values = column.to_numpy()
+        if values.dtype == self.dtype:
+            return values
+        if values.dtype.kind == "f":
+            np.copyto(out, values, casting="same_kind")
+        else:
+            np.divide(values, FIXED_POINT, out=out, casting="same_kind")
+        return out
+
+    def split(self, batch: pa.RecordBatch, prices: np.ndarray, qtys: np.ndarray,
+              sides: np.ndarray) -> Dict[int, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Per-symbol (prices, qtys, sides) of a decoded batch, keyed by symbol_id.
+
+        A batch of one symbol is returned as is. Otherwise rows are grouped by
+        symbol with one stable argsort and gathered once into reused buffers, so
+        each symbol gets contiguous views of its rows in their original order.
+        """
+        symbols = batch.column("symbol_id").to_numpy()
+        n = len(symbols)
+        if n == 0:
+            return {}
+        if symbols[0] == symbols[-1] and (symbols == symbols[0]).all():
+            return {int(symbols[0]): (prices, qtys, sides)}
+        if n > len(self.grouped[0]):
+            capacity = max(n, 2 * len(self.grouped[0]))
+            self.grouped = tuple(np.empty(capacity, dtype=g.dtype) for g in self.grouped)
+        order = np.argsort(symbols, kind="stable")
+        columns = [np.take(col, order, out=g[:n]) for col, g in zip((prices, qtys, sides), self.grouped)]
+        grouped = symbols[order]
+        starts = np.concatenate(([0], np.flatnonzero(grouped[1:] != grouped[:-1]) + 1))
+        ends = np.append(starts[1:], n)
+        return {int(grouped[lo]): tuple(col[lo:hi] for col in columns) for lo, hi in zip(starts, ends)}
@@ -1,9 +1,15 @@
+import os
 import time
+import multiprocessing
+import math
 import random
+import itertools
+from dataclasses import replace
 import numpy as np
 import pyarrow as pa
 import polars as pl
-from typing import List, Dict, Any, Type, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Type, Optional, Iterable, Iterator, Tuple
 
 # Backtester import (with graceful fallback for development)
 try:
@@ -13,47 +19,329 @@ except ImportError:
     BacktestResult = None
 
 from optimizer.config import ExperimentConfig, ParameterSpace, DataConfig
-from optimizer.strategy.registry import StrategyRegistry
-from optimizer.data.loader import create_arrow_iterator, FIXED_POINT
+from optimizer.strategy.registry import StrategyRegistry, discover_strategies
+from optimizer.strategy.base import StrategyBank, EXECUTION_MODES
+from optimizer.indicators import RollingStatsKernel
+from optimizer.metrics import OnlineMetrics
+from optimizer.pruning import SuccessiveHalving, check_metric
+from optimizer.walk_forward import WalkForwardRunner
+from optimizer.trial_cache import TrialCache
+from optimizer.checkpoint import Checkpointer, load_checkpoint, read_checkpoint_header, run_key
+from optimizer.data.loader import (
+    open_stream, clip_stream, skip_stream, advance_position, relative_position, iter_csv_tail, csv_tail_offset,
+    dataset_appended, dataset_fingerprint, to_ts_exchange, stream_schema, dataset_symbols, single_file, TS_PER_MS
+)
+from optimizer.data.broadcast import BatchBroadcaster, BatchConsumer
+from optimizer.data.prefetch import Prefetcher, prefetch
+from optimizer.data.views import BatchDecoder
+from optimizer.backtester import EngineContext, PyBacktester
+from optimizer.profiling import Profiler, merge_reports
 
 class MultiStrategyWrapper:
-    """Wraps multiple strategy instances to run in a single pass."""
-    def __init__(self, strategies: List[Any]):
+    """
+    Wraps multiple strategy instances to run in a single pass.
+    
+    Instances with a `symbol_id` only see the rows of that symbol: each batch is
+    split once into per-symbol column views (BatchDecoder.split), so strategies
+    on every symbol of a multi-symbol dataset run in the same pass.
+    """
+    def __init__(self, strategies: List[Any], vectorize: bool = True, dtype: str = "float64"):
         self.strategies = strategies
+        self.vectorize = vectorize
+        # Price / qty arrays handed to strategies, decoded once per batch into reused buffers
+        self.decoder = BatchDecoder(dtype)
+        self.banks: List[StrategyBank] = []
+        self.loose: List[Any] = list(strategies)
+        # Rolling-statistics kernel per symbol_id (None: every row)
+        self.kernels: Dict[Optional[int], RollingStatsKernel] = {}
+        # Objects with after_batch(wrapper, ctx), run after every batch (e.g. pruning)
+        self.hooks: List[Any] = []
+        self.rows_seen = 0
+        self.batches_seen = 0
+        # Stream position: (last ts_exchange consumed, rows consumed at it)
+        self.position: Optional[Tuple[int, int]] = None
+        # Optional Profiler; when set, on_ticks takes the timed path
+        self.profiler: Optional[Profiler] = None
+        # False when the wrapper sees slices of a pass the profiler counts elsewhere (walk-forward folds)
+        self.counts_pass = True
+        # Batches are split by symbol only when some instance trades a single symbol
+        self.by_symbol = False
+        
+    @property
+    def last_ts(self) -> Optional[int]:
+        return self.position[0] if self.position is not None else None
+        
+    def advance(self, batch):
+        """Move the stream position past `batch`."""
+        if batch.num_rows and "ts_exchange" in batch.schema.names:
+            self.position = advance_position(batch.column("ts_exchange").to_numpy(), self.position)
+            
+    def start(self, ctx=None):
+        """Run on_start hooks, then group instances into vectorized banks."""
+        for s in self.strategies:
+            s.on_start(ctx)
+        self.build_banks()
+        
+    def build_banks(self):
+        """Group instances by class and symbol and let each class build its bank."""
+        self.banks = []
+        self.loose = []
+        self.by_symbol = any(getattr(s, "symbol_id", None) is not None for s in self.strategies)
+        if not self.vectorize:
+            self.loose = list(self.strategies)
+            return
+            
+        groups: Dict[Tuple[type, Optional[int]], List[Any]] = {}
+        for s in self.strategies:
+            groups.setdefault((type(s), getattr(s, "symbol_id", None)), []).append(s)
+            
+        for (cls, _), members in groups.items():
+            create_bank = getattr(cls, "create_bank", None)
+            bank = create_bank(members) if create_bank else None
+            if bank is None:
+                self.loose.extend(members)
+            else:
+                self.banks.append(bank)
+                
+        # One rolling-statistics kernel per symbol serves every bank of it that needs windows
+        max_windows: Dict[Optional[int], int] = {}
+        for bank in self.banks:
+            symbol = getattr(bank, "symbol_id", None)
+            max_windows[symbol] = max(max_windows.get(symbol, 0), getattr(bank, "max_window", 0))
+        for symbol, max_window in max_windows.items():
+            if max_window <= 0:
+                continue
+            kernel = self.kernels.get(symbol)
+            if kernel is None or kernel.max_window < max_window:
+                self.kernels[symbol] = RollingStatsKernel(max_window)
+        for bank in self.banks:
+            if hasattr(bank, "kernel"):
+                bank.kernel = self.kernels.get(getattr(bank, "symbol_id", None))
+                
+    def sync(self):
+        """Write bank state back to the strategy instances."""
+        for bank in self.banks:
+            bank.sync()
+            
+    def remove(self, strategies: List[Any]):
+        """Drop instances mid-stream; the remaining ones are re-banked from their current state."""
+        self.sync()
+        dropped = set(map(id, strategies))
+        self.strategies = [s for s in self.strategies if id(s) not in dropped]
+        self.build_banks()
+            
+    def finish(self, ctx=None):
+        """Flush bank state and run on_finish hooks."""
+        self.sync()
+        for s in self.strategies:
+            s.on_finish(ctx)
+            
+    def views(self, batch) -> Dict[Optional[int], Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """(prices, qtys, sides) of a batch for every row (key None) and, if needed, per symbol_id."""
+        prices, qtys, sides = self.decoder.decode(batch)
+        views = {None: (prices, qtys, sides)}
+        if self.by_symbol:
+            views.update(self.decoder.split(batch, prices, qtys, sides))
+        return views
         
     def on_ticks(self, batch, ctx):
+        if self.profiler is not None:
+            return self._on_ticks_profiled(batch, ctx)
+            
         # Extract numpy arrays ONCE per batch for performance
-        prices = batch["price"].to_numpy().astype(np.float64) / FIXED_POINT
-        qtys = batch["qty"].to_numpy().astype(np.float64) / FIXED_POINT
-        sides = batch["side"].to_numpy().astype(np.int8)
+        views = self.views(batch)
         
-        # Pass to all strategies
+        # Shared prefix sums, computed once per batch and symbol for all windows
+        for symbol, kernel in self.kernels.items():
+            if symbol in views:
+                kernel.update(views[symbol][0])
+            
+        # Banks update all of their instances in one vectorized step
+        for bank in self.banks:
+            view = views.get(getattr(bank, "symbol_id", None))
+            if view is not None:
+                bank.on_ticks(*view, ctx)
+            
+        # Pass to remaining strategies
         # Optimizing this loop is critical for performance
-        for s in self.strategies:
-            s.on_ticks(prices, qtys, sides, ctx)
+        for s in self.loose:
+            view = views.get(getattr(s, "symbol_id", None))
+            if view is not None:
+                s.on_ticks(*view, ctx)
+            
+        self.rows_seen += batch.num_rows
+        self.batches_seen += 1
+        self.advance(batch)
+        
+        for hook in self.hooks:
+            hook.after_batch(self, ctx)
+            
+    def _on_ticks_profiled(self, batch, ctx):
+        """on_ticks with every stage timed (same work, same order)."""
+        prof = self.profiler
+        clock = time.perf_counter
+        t0 = clock()
+        views = self.views(batch)
+        t1 = clock()
+        prof.add("convert", t1 - t0)
+        
+        if self.kernels:
+            for symbol, kernel in self.kernels.items():
+                if symbol in views:
+                    kernel.update(views[symbol][0])
+            t2 = clock()
+            prof.add("kernel", t2 - t1)
+            t1 = t2
+            
+        t_strategies = t1
+        for unit in self.banks + self.loose:
+            view = views.get(getattr(unit, "symbol_id", None))
+            if view is None:
+                continue
+            unit.on_ticks(*view, ctx)
+            t2 = clock()
+            prof.add_unit(unit, t2 - t1)
+            t1 = t2
+        prof.add("strategies", t1 - t_strategies)
+        
+        self.rows_seen += batch.num_rows
+        self.batches_seen += 1
+        self.advance(batch)
+        
+        if self.hooks:
+            t1 = clock()
+            for hook in self.hooks:
+                hook.after_batch(self, ctx)
+            prof.add("hooks", clock() - t1)
+        if self.counts_pass:
+            prof.count(batch)
+
+class HoldLastWindow:
+    """
+    Forwards windows to `target` one behind, so the last window of a pass can be
+    snapshotted unconsumed. Held windows are copied: engines may reuse their buffers.
+    """
+    def __init__(self, target: MultiStrategyWrapper):
+        self.target = target
+        self.held: Optional[Tuple[pa.RecordBatch, Any]] = None
+        
+    def on_ticks(self, batch, ctx):
+        if self.held is not None:
+            self.target.on_ticks(*self.held)
+        if isinstance(ctx, EngineContext):
+            ctx = replace(ctx)
+        self.held = (pa.concat_batches([batch]), ctx)
+        
+    def held_batch(self) -> Optional[pa.RecordBatch]:
+        return self.held[0] if self.held is not None else None
+        
+    def flush(self):
+        """Forward the held window."""
+        held, self.held = self.held, None
+        if held is not None:
+            self.target.on_ticks(*held)
 
 class Optimizer:
     def __init__(self, config: ExperimentConfig):
         self.config = config
         self.strategies: List[Any] = []
+        # Restart each pass from its last checkpoint instead of the beginning
+        self.resume = False
+        # Run-level results that are not per-config rows (e.g. walk-forward folds)
+        self.summary: Dict[str, Any] = {}
+        # Time every stage of each pass; the merged report lands in `profile_report`
+        self.profile = False
+        self.profiler: Optional[Profiler] = None
+        self.profile_report: Dict[str, Any] = {}
+        # Background decoder of the last opened source (None when decoding inline)
+        self.prefetcher: Optional[Prefetcher] = None
         
     def generate_params(self) -> List[Dict[str, Any]]:
         """Generate a list of parameter dictionaries based on config."""
-        method = self.config.optimization.method
+        return list(self.iter_params())
+        
+    def iter_params(self, seed: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield parameter dictionaries.
+        
+        - grid: Cartesian product of each parameter's grid values (see grid_values).
+          Raises ValueError up front when it exceeds `optimization.max_grid` points.
+        - monte_carlo: `samples` random draws (duplicates are kept; run() dedupes them),
+          seeded by `seed` when given, else by `optimization.seed`.
+        
+        walk_forward draws its candidates with `optimization.search`.
+        """
+        if self.search_method() == "grid":
+            names = list(self.config.parameters)
+            axes = [self.grid_values(self.config.parameters[n]) for n in names]
+            self._check_grid_size(names, axes)
+            # Grid points are unique by construction once each axis is de-duplicated
+            for combo in itertools.product(*axes):
+                yield dict(zip(names, combo))
+            return
+            
+        yield from self._sample_params(seed)
+        
+    def search_method(self) -> str:
+        """How candidates are drawn: `grid` or `monte_carlo` (walk_forward uses `optimization.search`)."""
+        opt = self.config.optimization
+        return opt.search if opt.method == "walk_forward" else opt.method
+        
+    def param_count(self) -> int:
+        """Number of parameter sets iter_params() yields, without drawing them."""
+        if self.search_method() == "grid":
+            return math.prod(len(self.grid_values(space)) for space in self.config.parameters.values())
+        return self.config.optimization.samples
+        
+    def _check_grid_size(self, names: List[str], axes: List[List[Any]]) -> None:
+        limit = self.config.optimization.max_grid
+        size = math.prod(len(axis) for axis in axes)
+        if limit and size > limit:
+            shape = " x ".join(f"{name}={len(axis)}" for name, axis in zip(names, axes))
+            raise ValueError(f"Grid of {size:,} points ({shape}) exceeds optimization.max_grid = {limit:,}; "
+                             "coarsen `step`, lower `samples` or raise max_grid")
+        
+    def implicit_grid_axes(self) -> List[str]:
+        """Ranges a grid discretizes into `optimization.samples` points because they have no `step`."""
+        if self.search_method() != "grid":
+            return []
+        return [name for name, space in self.config.parameters.items()
+                if not space.values and not space.step
+                and space.distribution != "fixed" and space.min != space.max]
+
+    def grid_values(self, space: ParameterSpace) -> List[Any]:
+        """
+        Discrete values of one parameter for grid search.
+        
+        `values` lists are used as-is; ranges are discretized by `step` when given,
+        otherwise into `samples` evenly spaced points (geometrically spaced for
+        log_uniform), rounded for ints.
+        """
+        if space.values:
+            vals = list(space.values)
+        elif space.distribution == "fixed" or space.min == space.max:
+            vals = [space.min]
+        elif space.step:
+            count = int(math.floor((space.max - space.min) / space.step + 1e-9)) + 1
+            vals = [space.min + i * space.step for i in range(count)]
+        elif space.distribution == "log_uniform":
+            vals = np.geomspace(space.min, space.max, self.config.optimization.samples).tolist()
+        else:
+            vals = np.linspace(space.min, space.max, self.config.optimization.samples).tolist()
+            
+        if space.type == "int" and not space.values:
+            vals = [int(round(v)) for v in vals]
+        # Drop duplicates (e.g. int rounding) while keeping order
+        return list(dict.fromkeys(vals))
+
+    def _sample_params(self, seed: Optional[int] = None) -> Iterator[Dict[str, Any]]:
         samples = self.config.optimization.samples
         
         # Seed RNG
-        seed = self.config.optimization.seed
+        if seed is None:
+            seed = self.config.optimization.seed
         rng = random.Random(seed) if seed is not None else random.Random()
         
-        param_sets = []
-        
-        # Grid Search logic (Simplified: just random sampling if not implemented full grid yet)
-        # Note: True grid search requires Cartesian product logic. 
-        # For now, let's assume 'grid' behaves like 'monte_carlo' if values aren't specified, 
-        # or we follow the spec.
-        
-        # If method is 'monte_carlo' or 'grid' (treated as random for continuous ranges in this MVP)
         for _ in range(samples):
             params = {}
             for name, space in self.config.parameters.items():
@@ -66,7 +354,6 @@ class Optimizer:
                         params[name] = int(params[name])
                 elif space.distribution == "log_uniform":
                     # log-uniform sampling: 10^uniform(log10(min), log10(max))
-                    import math
                     log_min = math.log10(space.min)
                     log_max = math.log10(space.max)
                     val = 10 ** rng.uniform(log_min, log_max)
@@ -74,74 +361,535 @@ class Optimizer:
                 elif space.distribution == "fixed":
                    params[name] = space.values[0] if space.values else space.min
 
-            param_sets.append(params)
-            
-        return param_sets
+            yield params
 
-    def run(self, verbose: bool = True):
-        """Execute the optimization."""
-        if Backtester is None:
-            raise ImportError("rust_backtester library is required to run optimization.")
-            
-        # 1. Generate Parameters
-        param_sets = self.generate_params()
-        if verbose:
-            print(f"🎲 Generated {len(param_sets)} parameter sets using {self.config.optimization.method}")
-            
-        # 2. Instantiate Strategies
+    def create_backtester(self, data: Dict[str, Any], batch_ms: int = 1000):
+        """Instantiate the configured engine (Rust if available, else the Python engine)."""
+        backend = self.config.engine.backend
+        if backend == "rust" or (backend == "auto" and Backtester is not None):
+            if Backtester is None:
+                raise ImportError("rust_backtester library is required for engine backend 'rust'.")
+            return Backtester(data=data, python_mode="batch", batch_ms=batch_ms)
+        if backend not in ("auto", "python"):
+            raise ValueError(f"Unknown engine backend '{backend}'")
+        return PyBacktester(data=data, python_mode="batch", batch_ms=batch_ms)
+
+    def build_strategies(self, param_sets: List[Dict[str, Any]], offset: int = 0,
+                         names: Optional[List[str]] = None) -> List[Any]:
+        """
+        Instantiate one strategy per parameter set, named by its global index unless `names` is given.
+        On a multi-symbol dataset every parameter set gets one instance per symbol ("Config_3/ETHUSDT"),
+        consecutive and in symbol_id order.
+        """
         StrategyCls = StrategyRegistry.get(self.config.strategy)
         if not StrategyCls:
              # Try loading dynamically if module provided? 
              # For now assume registry is pre-filled or handled by CLI
              raise ValueError(f"Strategy '{self.config.strategy}' not found in registry.")
              
-        self.strategies = []
+        execution = self.config.engine.execution
+        if execution not in EXECUTION_MODES:
+            raise ValueError(f"Unknown execution mode '{execution}' (expected one of {list(EXECUTION_MODES)})")
+            
+        symbols = self.symbols()
+        targets = list(enumerate(symbols)) if len(symbols) > 1 else [(None, None)]
+        strategies = []
         for i, params in enumerate(param_sets):
-            strat = StrategyCls(name=f"Config_{i}")
-            strat.set_params(params)
-            self.strategies.append(strat)
+            name = names[i] if names else f"Config_{offset + i}"
+            for symbol_id, symbol in targets:
+                strat = StrategyCls(name=name if symbol is None else f"{name}/{symbol}")
+                strat.set_params(params)
+                strat.metrics = OnlineMetrics(self.config.engine.equity_samples)
+                strat.execution = execution
+                strat.symbol_id = symbol_id
+                strategies.append(strat)
+        return strategies
+        
+    def symbols(self) -> List[str]:
+        """Symbol names of the dataset (index = symbol_id); with several, each parameter set trades all of them."""
+        return dataset_symbols(self.config.data)
+
+    def run(self, verbose: bool = True, resume: bool = False, profile: bool = False):
+        """
+        Execute the optimization. With `resume`, passes continue from their last checkpoint;
+        with `profile`, per-stage timings are collected into `profile_report`.
+        """
+        self.resume = resume
+        self.profile = profile
+        self.profile_report = {}
+        # 1. Generate Parameters: duplicates are dropped as they are drawn. Unseeded Monte Carlo
+        # gets a fixed seed so the draws can be replayed to build the result rows
+        seed = self.config.optimization.seed
+        if seed is None:
+            seed = random.randrange(2**32)
+        requested = self.param_count()
+        unique_sets = list(unique_params(self.iter_params(seed)))
+        if verbose:
+            print(f"🎲 Generated {requested} parameter sets using {self.config.optimization.method}")
+            if len(unique_sets) < requested:
+                print(f"   {requested - len(unique_sets)} duplicates share results ({len(unique_sets)} unique)")
+            for name in self.implicit_grid_axes():
+                print(f"   ℹ️  {name}: range without step, "
+                      f"{self.config.optimization.samples} evenly spaced points (optimization.samples)")
+            
+        # Fail fast on unknown strategies before spawning workers
+        if not StrategyRegistry.get(self.config.strategy):
+             raise ValueError(f"Strategy '{self.config.strategy}' not found in registry.")
+        method = self.config.optimization.method
+        symbols = self.symbols()
+        if len(symbols) > 1 and method not in ("grid", "monte_carlo"):
+            # Pruning and fold selection rank single instances, not a parameter set across symbols
+            raise ValueError(f"Multi-symbol datasets support grid and monte_carlo search, not '{method}'")
+        if verbose and len(symbols) > 1:
+            print(f"🪙 {len(symbols)} symbols merged into one stream: {', '.join(symbols)}")
+             
+        workers = self.config.optimization.parallel_workers
+        if workers <= 0:
+            workers = os.cpu_count() or 1
+        workers = max(1, min(workers, len(unique_sets)))
+        if method == "walk_forward":
+            # Rows are per fold winner, not per requested config
+            return self.run_walk_forward(unique_sets, verbose)
+        if workers > 1 and method == "successive_halving":
+            # Pruning ranks all candidates together, so it cannot be sharded
+            if verbose:
+                print("ℹ️  successive_halving runs in a single process (global ranking)")
+            workers = 1
+            
+        # Trials already in the result cache are not re-run
+        cache = self.trial_cache()
+        cached = cache.lookup(unique_sets) if cache else [None] * len(unique_sets)
+        pending = [u for u, stats in enumerate(cached) if stats is None]
+        if cache and verbose:
+            print(f"🗃️  Result cache: {cache.hits} hits, {len(pending)} to run")
+        todo = [unique_sets[u] for u in pending]
+        workers = max(1, min(workers, len(todo)))
+        
+        if not todo:
+            fresh = []
+        elif workers > 1:
+            fresh = self.run_parallel(todo, workers, verbose)
+        else:
+            fresh = self.backtest(todo, verbose=verbose)
+        unique_results = list(cached)
+        for u, stats in zip(pending, fresh):
+            unique_results[u] = stats
+            if cache:
+                cache.put(unique_sets[u], stats)
+            
+        # Each requested parameter set gets its own (shared) result row, in draw order
+        by_key = {param_key(params): stats for params, stats in zip(unique_sets, unique_results)}
+        return [dict(by_key[param_key(params)], name=f"Config_{i}") for i, params in enumerate(self.iter_params(seed))]
+
+    def trial_cache(self) -> Optional[TrialCache]:
+        """Result cache for this experiment, if enabled and the method's trials are independent."""
+        opt = self.config.optimization
+        # Pruned and walk-forward results depend on the other candidates
+        if not opt.result_cache or opt.method not in ("grid", "monte_carlo"):
+            return None
+        return TrialCache.for_experiment(opt.result_cache, self.config, StrategyRegistry.get(self.config.strategy))
+
+    def run_parallel(self, param_sets: List[Dict[str, Any]], workers: int, verbose: bool = True):
+        """
+        Split the parameter sets into contiguous shards and backtest each shard in
+        its own process. Results are merged back in the original order.
+        """
+        bounds = np.linspace(0, len(param_sets), workers + 1).astype(int)
+        shards = [(int(lo), param_sets[lo:hi]) for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+        
+        if verbose:
+            sizes = ", ".join(str(len(shard)) for _, shard in shards)
+            print(f"🧵 Running {len(shards)} worker processes (shard sizes: {sizes})")
+            
+        start_time = time.perf_counter()
+        # Polars/Arrow thread pools are not fork-safe: always spawn fresh workers
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=len(shards), mp_context=ctx) as pool:
+            if self.config.optimization.shared_memory:
+                shard_results = self._run_broadcast(pool, ctx, shards, verbose)
+            else:
+                futures = [pool.submit(_run_shard, self.config, offset, shard, None, self.resume, self.profile)
+                           for offset, shard in shards]
+                shard_results = [f.result() for f in futures]
+        duration = time.perf_counter() - start_time
+        
+        if self.profile:
+            self.profile_report = merge_reports([p for _, p in shard_results] + [self.profile_report], duration)
+        
+        if verbose:
+            print(f"✅ Simulation Complete in {duration:.2f}s")
+            
+        self.strategies = []
+        return [res for shard, _ in shard_results for res in shard]
+
+    def _run_broadcast(self, pool, ctx, shards, verbose: bool = True):
+        """Decode the data once in this process and broadcast it to the shard workers."""
+        with ctx.Manager() as manager:
+            broadcaster = BatchBroadcaster(len(shards), manager, slots=self.config.optimization.inflight_batches,
+                                           schema=self._stream_schema())
+            try:
+                # Every shard skips what it already consumed; start from the least advanced one
+                points = [self._restore_point(offset, shard) for offset, shard in shards]
+                start, tail = None, None
+                if all(points):
+                    start = min(tuple(header["position"]) for _, header in points)
+                    tails = {self._tail_offset(header) for _, header in points}
+                    tail = tails.pop() if len(tails) == 1 else None
+                futures = [
+                    pool.submit(_run_shard, self.config, offset, shard, broadcaster.consumer(i), self.resume, self.profile, start)
+                    for i, (offset, shard) in enumerate(shards)
+                ]
+                source = self._open_source(start, tail)
+                profiler = Profiler() if self.profile else None
+                if profiler is not None:
+                    # The parent only decodes; workers report the rest
+                    source = profiler.timed(source)
+                    profiler.start()
+                rows = broadcaster.publish(source, abort=lambda: any(f.done() for f in futures))
+                if profiler is not None:
+                    profiler.stop()
+                    self.profile_report = profiler.report()
+                if verbose:
+                    print(f"📡 Broadcast {rows:,} rows to {len(shards)} workers via shared memory")
+                self._report_prefetch(verbose)
+                return [f.result() for f in futures]
+            finally:
+                broadcaster.close()
+
+    def backtest(self, param_sets: List[Dict[str, Any]], offset: int = 0, verbose: bool = True,
+                 stream: Optional[BatchConsumer] = None, stream_start: Optional[Tuple[int, int]] = None):
+        """
+        Backtest a list of parameter sets in a single streaming pass.
+        `stream` replaces the configured data source (e.g. a shared-memory consumer);
+        `stream_start` is the position that stream already starts after.
+        """
+        opt = self.config.optimization
+        checkpointing = opt.checkpoint_interval > 0 or self.resume
+        key = run_key(self.config, offset, param_sets) if checkpointing else None
+        point = self._restore_point(offset, param_sets)
+        restored = load_checkpoint(point[0], point[1]["key"]) if point else None
+        
+        # 2. Instantiate Strategies
+        if restored is None:
+            self.strategies = self.build_strategies(param_sets, offset)
+        else:
+            self.strategies = restored["strategies"]
             
         if verbose:
             print(f"🚀 Initialized {len(self.strategies)} strategy instances.")
+            if restored is not None:
+                kind = "snapshot (appended data only)" if "watermark" in point[1] else "checkpoint"
+                print(f"⏯️  Resuming from {kind} after {restored['rows']:,} rows")
             
         # 3. Setup Backtester
-        # Dummy data for initialization
-        dummy_df = pl.DataFrame({"ts_exchange":[0],"price":[0],"qty":[0],"side":[1],"symbol_id":[0]}).lazy()
-        
-        bt = Backtester(
-            data={"BTCUSDT": dummy_df}, 
-            python_mode="batch", 
-            batch_ms=1000 
-        )
+        bt = self._stream_backtester(verbose)
         
         # 4. Stream Data
         # Creating wrapper
-        wrapper = MultiStrategyWrapper(self.strategies)
+        if restored is None:
+            wrapper = MultiStrategyWrapper(self.strategies, vectorize=self.config.engine.vectorize,
+                                           dtype=self.config.engine.float_dtype)
+            if opt.method == "successive_halving":
+                check_metric(self.strategies, opt.metric)
+                wrapper.hooks.append(SuccessiveHalving(eta=opt.eta, min_rows=opt.min_rows, metric=opt.metric))
+        else:
+            wrapper = MultiStrategyWrapper(restored["active"], vectorize=self.config.engine.vectorize,
+                                           dtype=self.config.engine.float_dtype)
+            wrapper.kernels = restored["kernels"]
+            wrapper.hooks = restored["hooks"]
+            wrapper.rows_seen = restored["rows"]
+            wrapper.batches_seen = restored["batches"]
+            wrapper.position = tuple(restored["position"])
+        pruner = next((h for h in wrapper.hooks if isinstance(h, SuccessiveHalving)), None)
         
-        iterator = create_arrow_iterator(self.config.data.path)
-        execution_schema = pa.schema([
-            ("ts_exchange", pa.int64()), ("price", pa.int64()),
-            ("qty", pa.int64()), ("side", pa.int8()), ("symbol_id", pa.int64()), 
-        ])
-        rb_reader = pa.RecordBatchReader.from_batches(execution_schema, iterator)
+        checkpointer = None
+        if opt.checkpoint_interval > 0:
+            checkpointer = Checkpointer(self.checkpoint_path(offset), key, self.strategies, opt.checkpoint_interval)
+            wrapper.hooks.append(checkpointer)
+        
+        self.profiler = None
+        if self.profile:
+            self.profiler = wrapper.profiler = Profiler()
+            self.profiler.instances = len(self.strategies)
+        
+        position, tail, pending = None, None, None
+        if restored is not None:
+            position, tail, pending = tuple(point[1]["position"]), self._tail_offset(point[1]), restored["pending"]
+        rb_reader = self._open_reader(bt, stream, position, tail, stream_start, pending)
+        # Incremental runs snapshot before the last window: appended rows may still belong to it
+        holder = HoldLastWindow(wrapper) if opt.incremental else None
         
         start_time = time.perf_counter()
+        if self.profiler is not None:
+            self.profiler.start()
         
-        # Call on_start hooks
-        for s in self.strategies:
-            s.on_start(None) # Context not fully available in simple mode yet
+        if restored is None:
+            # Call on_start hooks and build vectorized banks
+            wrapper.start(None) # Context not fully available in simple mode yet
+        else:
+            # Instances already carry their started state
+            wrapper.build_banks()
             
-        bt.run_arrow(stream=rb_reader, strategy=wrapper)
+        bt.run_arrow(stream=rb_reader, strategy=holder or wrapper)
         
-        # Call on_finish hooks
-        for s in self.strategies:
-            s.on_finish(None)
+        if holder is not None:
+            # State before the last window, which is kept unconsumed in the snapshot,
+            # plus a watermark, for the next appended run
+            snapshot = Checkpointer(self.snapshot_path(offset), run_key(self.config, offset, param_sets, include_data=False),
+                                    self.strategies)
+            wrapper.hooks = [h for h in wrapper.hooks if h is not checkpointer]
+            snapshot.save(wrapper, pending=holder.held_batch(), watermark=dataset_fingerprint(self.config.data))
+            holder.flush()
+            snapshot.close()
+        if self.profiler is not None:
+            self.profiler.stop()
+            self.profile_report = self.profiler.report()
+        self._report_prefetch(verbose)
+        
+        # Flush banks and call on_finish hooks
+        wrapper.finish(None)
+        
+        # The pass completed: its checkpoint is no longer needed
+        if checkpointer is not None:
+            checkpointer.close()
+        if checkpointing and os.path.exists(self.checkpoint_path(offset)):
+            os.remove(self.checkpoint_path(offset))
             
         duration = time.perf_counter() - start_time
         
         if verbose:
             print(f"✅ Simulation Complete in {duration:.2f}s")
+            if duration > 0:
+                events = wrapper.rows_seen * len(self.strategies)
+                print(f"   {wrapper.rows_seen:,} rows x {len(self.strategies)} instances = {events / duration:,.0f} strategy-events/s")
+            if pruner is not None:
+                print(f"✂️  Pruned {len(pruner.pruned)} of {len(self.strategies)} candidates over {pruner.rung} rungs")
             
         # 5. Collect Results
-        results = [s.get_stats() for s in self.strategies]
+        results = []
+        for s in self.strategies:
+            stats = s.get_stats()
+            if getattr(s, "pruned_at", None) is not None:
+                stats["pruned_at"] = s.pruned_at
+            results.append(stats)
+        symbols = self.symbols()
+        if len(symbols) > 1:
+            # Instances of one parameter set are consecutive, in symbol order
+            k = len(symbols)
+            results = [combine_symbols(results[i:i + k], symbols, self.strategies[i].params)
+                       for i in range(0, len(results), k)]
         return results
+
+    def run_walk_forward(self, param_sets: List[Dict[str, Any]], verbose: bool = True):
+        """
+        Walk-forward optimization in one streaming pass over the data.
+        
+        All folds share the decoded batches (see WalkForwardRunner). Returns one
+        row per out-of-sample winner; per-fold and aggregate scores go to `summary`.
+        """
+        opt = self.config.optimization
+        check_metric(self.build_strategies(param_sets[:1]), opt.metric)
+        self.profiler = None
+        if self.profile:
+            self.profiler = Profiler()
+            self.profiler.instances = len(param_sets)
+            
+        def make_wrapper(strategies):
+            wrapper = MultiStrategyWrapper(strategies, vectorize=self.config.engine.vectorize,
+                                           dtype=self.config.engine.float_dtype)
+            wrapper.profiler = self.profiler
+            wrapper.counts_pass = False # The runner counts the shared pass
+            return wrapper
+            
+        runner = WalkForwardRunner(
+            param_sets,
+            build=lambda sets, names: self.build_strategies(sets, names=names),
+            make_wrapper=make_wrapper,
+            train_ms=opt.train_ms, test_ms=opt.test_ms, top_k=opt.top_k, metric=opt.metric,
+        )
+        runner.profiler = self.profiler
+        bt = self._stream_backtester(verbose)
+        rb_reader = self._open_reader(bt, None)
+        
+        start_time = time.perf_counter()
+        if self.profiler is not None:
+            self.profiler.start()
+        bt.run_arrow(stream=rb_reader, strategy=runner)
+        runner.finish(None)
+        duration = time.perf_counter() - start_time
+        if self.profiler is not None:
+            self.profiler.stop()
+            self.profile_report = self.profiler.report()
+        self._report_prefetch(verbose)
+        
+        self.summary = {"walk_forward": runner.summary()}
+        if verbose:
+            wf = self.summary["walk_forward"]
+            print(f"✅ Walk-forward complete in {duration:.2f}s: {len(wf['folds'])} folds x {len(param_sets)} candidates")
+            mean_is, mean_oos = wf[f"mean_is_{opt.metric}"], wf[f"mean_oos_{opt.metric}"]
+            if mean_is is not None:
+                print(f"   mean {opt.metric}: in-sample {mean_is:.2f} / out-of-sample {mean_oos:.2f}")
+        self.strategies = []
+        return runner.results()
+
+    def _stream_backtester(self, verbose: bool = True):
+        """Backtester for Arrow streaming (the registered frames are placeholders naming the symbols)."""
+        # Dummy data for initialization, one frame per symbol_id
+        data = {
+            symbol: pl.DataFrame({"ts_exchange":[0],"price":[0],"qty":[0],"side":[1],"symbol_id":[k]}).lazy()
+            for k, symbol in enumerate(self.symbols())
+        }
+        
+        bt = self.create_backtester(data=data, batch_ms=self.config.engine.batch_ms)
+        if verbose:
+            print(f"⚙️  Engine: {'python' if isinstance(bt, PyBacktester) else 'rust'}")
+        return bt
+
+    def _open_reader(self, bt, stream: Optional[BatchConsumer] = None, position: Optional[Tuple[int, int]] = None,
+                     tail: Optional[int] = None, stream_start: Optional[Tuple[int, int]] = None,
+                     pending: Optional[pa.RecordBatch] = None) -> pa.RecordBatchReader:
+        """
+        RecordBatchReader over the configured data, or over `stream` when given.
+        `position` (ts_exchange, rows at it) skips the rows already consumed (resume);
+        `tail` is a CSV byte offset where those rows are known to end, `stream_start` the
+        position `stream` starts after. `pending` rows are replayed first.
+        """
+        if stream is None:
+            iterator = self._open_source(position, tail)
+        else:
+            # Only the Python engine is known to copy what it keeps across batches
+            iterator = stream.iter_batches(copy=not isinstance(bt, PyBacktester))
+            if position is not None:
+                iterator = skip_stream(iterator, relative_position(position, stream_start))
+        if pending is not None:
+            iterator = itertools.chain([pending], iterator)
+        if self.profiler is not None:
+            iterator = self.profiler.timed(iterator)
+        return pa.RecordBatchReader.from_batches(self._stream_schema(), iterator)
+
+    def _open_source(self, position: Optional[Tuple[int, int]] = None, tail: Optional[int] = None):
+        """
+        Batches of the configured data source, resuming after `position` when given.
+        With `data.prefetch`, decoding runs ahead on a background thread (see `prefetcher`).
+        """
+        if position is None:
+            stream = open_stream(self.config.data, float_prices=self._float_prices())
+        elif tail is not None:
+            # Appended CSV rows: parse only the bytes after the previous end of file. The offset
+            # already isolates them, so rows sharing the last processed timestamp are kept
+            stream = clip_stream(iter_csv_tail(single_file(self.config.data), tail, float_prices=self._float_prices()),
+                                 None, to_ts_exchange(self.config.data.end))
+        else:
+            # Seek to the containing millisecond (through the index of a columnar source; a plain CSV
+            # is filtered while streaming), then skip the consumed rows by count: rows appended at the
+            # last timestamp are kept
+            data = replace(self.config.data, start=position[0] // TS_PER_MS)
+            stream = skip_stream(open_stream(data, float_prices=self._float_prices()), position)
+        stream = prefetch(stream, self.config.data.prefetch)
+        self.prefetcher = stream if isinstance(stream, Prefetcher) else None
+        return stream
+
+    def _float_prices(self) -> bool:
+        """Sources may skip the fixed-point encoding: only the Rust engine needs it."""
+        backend = self.config.engine.backend
+        return backend == "python" or (backend == "auto" and Backtester is None)
+        
+    def _stream_schema(self) -> pa.Schema:
+        return stream_schema(self.config.data, self._float_prices())
+        
+    def _report_prefetch(self, verbose: bool = True):
+        """Print the prefetch queue stats of the last pass and add them to the profile report."""
+        if self.prefetcher is None:
+            return
+        stats = self.prefetcher.stats()
+        if self.profile_report:
+            self.profile_report["prefetch"] = stats
+        if verbose:
+            print(f"📦 Prefetch (depth {stats['depth']}): consumer waited on {stats['starved']}/{stats['batches']} batches "
+                  f"({stats['starved_seconds']:.2f}s), decoder blocked on {stats['blocked']} ({stats['blocked_seconds']:.2f}s)")
+            
+    def checkpoint_path(self, offset: int = 0) -> str:
+        """Checkpoint file of the pass starting at parameter set `offset`."""
+        directory = self.config.optimization.checkpoint_dir or os.path.join("reports", self.config.experiment_name, "checkpoints")
+        return os.path.join(directory, f"shard-{offset}.ckpt")
+
+    def snapshot_path(self, offset: int = 0) -> str:
+        """End-of-data snapshot of the pass starting at parameter set `offset` (incremental runs)."""
+        return os.path.join("reports", self.config.experiment_name, "snapshots", f"shard-{offset}.ckpt")
+
+    def _restore_point(self, offset: int, param_sets: List[Dict[str, Any]]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        (path, header) of the saved state this pass continues from, or None to start fresh:
+        the checkpoint of an interrupted run when resuming, else the incremental snapshot
+        if the data has only grown since it was taken.
+        """
+        opt = self.config.optimization
+        if self.resume:
+            path = self.checkpoint_path(offset)
+            header = read_checkpoint_header(path)
+            if (header is not None and header.get("position") is not None
+                    and header.get("key") == run_key(self.config, offset, param_sets)):
+                return path, header
+        if opt.incremental:
+            path = self.snapshot_path(offset)
+            header = read_checkpoint_header(path)
+            if (header is not None and header.get("position") is not None
+                    and header.get("key") == run_key(self.config, offset, param_sets, include_data=False)
+                    and dataset_appended(self.config.data, header["watermark"])):
+                return path, header
+        return None
+
+    def _tail_offset(self, header: Dict[str, Any]) -> Optional[int]:
+        """CSV byte offset of the rows appended after a snapshot (None: seek by timestamp instead)."""
+        data = self.config.data
+        if "watermark" not in header or data.format != "csv" or data.cache:
+            return None
+        path = single_file(data)
+        return csv_tail_offset(path, header["watermark"]) if path is not None else None
+
+def _run_shard(config: ExperimentConfig, offset: int, param_sets: List[Dict[str, Any]],
+               stream: Optional[BatchConsumer] = None, resume: bool = False, profile: bool = False,
+               stream_start: Optional[Tuple[int, int]] = None):
+    """Worker entry point: backtest one shard of parameter sets. Returns (results, profile report)."""
+    # Spawned workers start with an empty registry
+    discover_strategies()
+    opt = Optimizer(config)
+    opt.resume = resume
+    opt.profile = profile
+    results = opt.backtest(param_sets, offset=offset, verbose=False, stream=stream, stream_start=stream_start)
+    return results, opt.profile_report
+
+# How the metrics of one parameter set's instances combine across symbols
+# (equal capital per symbol, so the portfolio ROI is the mean ROI)
+SYMBOL_AGGREGATES = {"roi": np.mean, "pnl": np.sum, "trades": np.sum, "max_dd": np.max, "sharpe": np.mean}
+
+def combine_symbols(stats: List[Dict[str, Any]], symbols: List[str], params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    One result row for a parameter set traded on every symbol: its parameters,
+    the metrics of SYMBOL_AGGREGATES combined across symbols, and each symbol's
+    own metrics under "symbols".
+    """
+    row = {"name": stats[0]["name"].rsplit("/", 1)[0]}
+    row.update((k, v) for k, v in stats[0].items() if k in params)
+    per_symbol = {
+        symbol: {k: v for k, v in s.items() if k != "name" and k not in params}
+        for symbol, s in zip(symbols, stats)
+    }
+    for key, combine in SYMBOL_AGGREGATES.items():
+        if all(key in s for s in stats):
+            row[key] = combine([s[key] for s in stats]).item()
+    row["symbols"] = per_symbol
+    return row
+
+def param_key(params: Dict[str, Any]) -> Tuple:
+    """Hashable, order-independent identity of a parameter set."""
+    return tuple(sorted(params.items()))
+
+def unique_params(param_sets: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Each distinct parameter set of a stream (e.g. iter_params()) once, in first-seen order."""
+    seen = set()
+    for params in param_sets:
+        key = param_key(params)
+        if key not in seen:
+            seen.add(key)
+            yield params
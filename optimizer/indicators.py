@@ -0,0 +1,186 @@
+import numpy as np
+
+# Largest magnitude of decay**-t allowed inside one block of decay_scan
+SCAN_RANGE = 1e150
+
+def decay_scan(carry, decay, x):
+    """
+    Exponential-decay scan y_t = decay * y_{t-1} + x_t, for many decays at once.
+
+    `carry` and `decay` have one entry per row, `x` is the shared input
+    sequence; returns the (rows, len(x)) path. Each block is a closed form
+    y_t = decay^(t+1) * (y_-1 + cumsum(x_j / decay^(j+1))) built with
+    cumulative products, and blocks are kept short enough that decay^-t stays finite.
+    """
+    carry = np.asarray(carry, dtype=np.float64)
+    decay = np.asarray(decay, dtype=np.float64)
+    x = np.asarray(x, dtype=np.float64)
+    n, T = len(carry), len(x)
+    out = np.empty((n, T), dtype=np.float64)
+    if T == 0 or n == 0:
+        return out
+
+    # decay == 0 keeps only the current input
+    zero = decay <= 0.0
+    d = np.where(zero, 1.0, decay)
+    d_min = d.min()
+    block = T if d_min >= 1.0 else max(1, min(T, int(np.log(SCAN_RANGE) / -np.log(d_min))))
+
+    y = carry.copy()
+    for lo in range(0, T, block):
+        xb = x[lo:lo + block]
+        powers = np.cumprod(np.broadcast_to(d[:, None], (n, len(xb))), axis=1)
+        out[:, lo:lo + len(xb)] = powers * (y[:, None] + np.cumsum(xb[None, :] / powers, axis=1))
+        y = out[:, lo + len(xb) - 1]
+    out[zero] = x
+    return out
+
+class RollingMoments:
+    """
+    Rolling mean / population std over the last `window` values of a stream.
+
+    State survives batch boundaries: a ring buffer keeps the last `window`
+    values and running sum / sum-of-squares are carried between batches.
+    `update` evaluates the statistics at every value of a batch with
+    cumulative sums, so its cost is proportional to the batch length.
+    """
+    def __init__(self, window: int):
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        self.window = window
+        self.buffer = np.zeros(window, dtype=np.float64) # Centered values
+        self.pos = 0    # Next write index in the ring
+        self.count = 0  # Values in the ring (<= window)
+        self.sum = 0.0
+        self.sum_sq = 0.0
+        # Values are centered on the first observation to keep sums small
+        self.shift = None
+        self._since_resync = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.window
+
+    def update(self, values):
+        """
+        Push a batch of values and return (mean, std) arrays aligned with it.
+        Entries are NaN until `window` values have been seen in total.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        n = len(values)
+        w = self.window
+        if n == 0:
+            empty = np.empty(0, dtype=np.float64)
+            return empty, empty
+        if self.shift is None:
+            self.shift = float(values[0])
+        x = values - self.shift
+
+        # Value j evicts everything before position m + j - w + 1 of [ring..., x...]
+        m = self.count
+        evicted = np.maximum(np.arange(m - w + 1, m - w + 1 + n), 0)
+        e_max = int(evicted[-1])
+        from_ring = min(e_max, m)
+        oldest = self.pos if m == w else 0
+        old = np.concatenate((self.buffer[(oldest + np.arange(from_ring)) % w], x[:e_max - from_ring]))
+
+        old_sum = np.concatenate(([0.0], np.cumsum(old)))
+        old_sq = np.concatenate(([0.0], np.cumsum(old * old)))
+        sums = self.sum + np.cumsum(x) - old_sum[evicted]
+        sums_sq = self.sum_sq + np.cumsum(x * x) - old_sq[evicted]
+
+        counts = np.minimum(np.arange(m + 1, m + n + 1), w)
+        mean_c = sums / counts
+        var = np.maximum(sums_sq / counts - mean_c * mean_c, 0.0)
+        std = np.sqrt(var)
+        mean = mean_c + self.shift
+        not_ready = np.arange(m + 1, m + n + 1) < w
+        if not_ready.any():
+            mean[not_ready] = np.nan
+            std[not_ready] = np.nan
+
+        # Carry state: the last min(n, w) values enter the ring
+        k = min(n, w)
+        self.buffer[(self.pos + np.arange(n - k, n)) % w] = x[n - k:]
+        self.pos = (self.pos + n) % w
+        self.count = min(w, m + n)
+        self.sum = float(sums[-1])
+        self.sum_sq = float(sums_sq[-1])
+
+        # Re-sum the ring once per `window` values (amortized O(1)) to stop drift
+        self._since_resync += n
+        if self._since_resync >= w:
+            live = self.buffer if self.count == w else self.buffer[:self.count]
+            self.sum = float(live.sum())
+            self.sum_sq = float((live * live).sum())
+            self._since_resync = 0
+
+        return mean, std
+
+class RollingStatsKernel:
+    """
+    Rolling mean / population std for many window lengths over one price stream.
+
+    `update` builds prefix sums and prefix sums of squares once per batch over
+    the carried history plus the new batch; the statistics of any window up to
+    `max_window` are then O(1) differences, vectorized across all windows.
+    """
+    def __init__(self, max_window: int):
+        if max_window < 1:
+            raise ValueError("max_window must be >= 1")
+        self.max_window = max_window
+        self.history = np.empty(0, dtype=np.float64) # Last max_window centered values
+        self.seen = 0 # Values seen in total
+        self.shift = None
+        self.prefix = np.zeros(1, dtype=np.float64)
+        self.prefix_sq = np.zeros(1, dtype=np.float64)
+        self.batch_len = 0
+
+    def update(self, values) -> None:
+        """Append a batch and rebuild the prefix sums over history + batch."""
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+        if self.shift is None:
+            self.shift = float(values[0])
+        ext = np.concatenate((self.history, values - self.shift))
+
+        self.prefix = np.concatenate(([0.0], np.cumsum(ext)))
+        self.prefix_sq = np.concatenate(([0.0], np.cumsum(ext * ext)))
+        self.batch_len = len(values)
+        self.seen += len(values)
+        self.history = ext[-self.max_window:]
+
+    def recent(self, n: int) -> np.ndarray:
+        """The last `n` values seen (fewer if the stream is shorter), at most `max_window`."""
+        if self.shift is None:
+            return np.empty(0, dtype=np.float64)
+        return self.history[-n:] + self.shift
+
+    def window_stats(self, windows):
+        """(mean, std) at the last value of the batch for each window. NaN until warm."""
+        windows = np.asarray(windows, dtype=np.int64)
+        end = len(self.prefix) - 1
+        start = np.maximum(end - windows, 0)
+        sums = self.prefix[end] - self.prefix[start]
+        sums_sq = self.prefix_sq[end] - self.prefix_sq[start]
+        return self._finish(sums, sums_sq, windows, self.seen >= windows)
+
+    def window_stats_path(self, windows):
+        """(mean, std) at every value of the last batch: arrays of shape (len(windows), batch length)."""
+        windows = np.asarray(windows, dtype=np.int64)[:, None]
+        first = len(self.prefix) - self.batch_len # Prefix index just after the batch's first value
+        ends = np.arange(first, first + self.batch_len)
+        starts = np.maximum(ends - windows, 0)
+        sums = self.prefix[ends] - self.prefix[starts]
+        sums_sq = self.prefix_sq[ends] - self.prefix_sq[starts]
+        seen = self.seen - self.batch_len + 1 + np.arange(self.batch_len)
+        return self._finish(sums, sums_sq, windows, seen >= windows)
+
+    def _finish(self, sums, sums_sq, windows, warm):
+        mean_c = sums / windows
+        std = np.sqrt(np.maximum(sums_sq / windows - mean_c * mean_c, 0.0))
+        mean = mean_c + (self.shift or 0.0)
+        mean = np.where(warm, mean, np.nan)
+        std = np.where(warm, std, np.nan)
+        return mean, std
@@ -0,0 +1,167 @@
+import numpy as np
+from typing import List
+
+class OnlineMetrics:
+    """
+    Bounded-memory risk metrics for one equity curve.
+
+    Streams the running peak, max drawdown and Welford mean/variance of
+    per-observation returns (for Sharpe). Returns from zero equity are undefined
+    and skipped; drawdown is measured once the peak is positive. Optionally keeps a preallocated,
+    downsampled equity buffer of `capacity` points for charts: when full,
+    every other point is dropped and the sampling stride doubles.
+    """
+    def __init__(self, capacity: int = 0):
+        self.capacity = capacity + (capacity % 2) # Even, so halving is exact
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.last = 0.0
+        self.peak = 0.0
+        self.max_dd = 0.0 # Fraction of peak
+        self.n_returns = 0
+        self.ret_mean = 0.0
+        self.ret_m2 = 0.0
+        self.samples = np.empty(self.capacity, dtype=np.float64)
+        self.n_samples = 0
+        self.stride = 1
+        self.skip = 0
+
+    def update(self, equity: float) -> None:
+        """Record one equity observation."""
+        if self.count == 0:
+            self.peak = equity
+        elif self.last != 0:
+            r = (equity - self.last) / self.last
+            self.n_returns += 1
+            delta = r - self.ret_mean
+            self.ret_mean += delta / self.n_returns
+            self.ret_m2 += delta * (r - self.ret_mean)
+
+        if equity > self.peak:
+            self.peak = equity
+        if self.peak > 0:
+            dd = (self.peak - equity) / self.peak
+            if dd > self.max_dd:
+                self.max_dd = dd
+
+        self.last = equity
+        self.count += 1
+        if self.capacity:
+            self._sample(equity)
+
+    def _sample(self, equity: float) -> None:
+        if self.skip > 0:
+            self.skip -= 1
+            return
+        if self.n_samples == self.capacity:
+            half = self.capacity // 2
+            self.samples[:half] = self.samples[0:self.capacity:2]
+            self.n_samples = half
+            self.stride *= 2
+        self.samples[self.n_samples] = equity
+        self.n_samples += 1
+        self.skip = self.stride - 1
+
+    @property
+    def max_drawdown_pct(self) -> float:
+        return self.max_dd * 100.0
+
+    @property
+    def sharpe(self) -> float:
+        """Per-observation Sharpe ratio (mean / population std of returns)."""
+        if self.n_returns == 0:
+            return 0.0
+        std = np.sqrt(self.ret_m2 / self.n_returns)
+        return self.ret_mean / std if std > 0 else 0.0
+
+    def equity_samples(self) -> np.ndarray:
+        """Copy of the downsampled equity curve."""
+        return self.samples[:self.n_samples].copy()
+
+class MetricsBank:
+    """
+    OnlineMetrics for many equity curves updated in lockstep (one slot per
+    strategy instance). Used by StrategyBank; writes back with `sync`.
+    """
+    def __init__(self, metrics: List[OnlineMetrics]):
+        self.size = len(metrics)
+        first = metrics[0] if metrics else OnlineMetrics()
+        if any(m.count != first.count or m.capacity != first.capacity for m in metrics):
+            raise ValueError("MetricsBank requires curves with the same length and capacity")
+
+        self.capacity = first.capacity
+        self.count = first.count
+        self.stride = first.stride
+        self.skip = first.skip
+        self.n_samples = first.n_samples
+
+        self.last = np.array([m.last for m in metrics], dtype=np.float64)
+        self.peak = np.array([m.peak for m in metrics], dtype=np.float64)
+        self.max_dd = np.array([m.max_dd for m in metrics], dtype=np.float64)
+        self.n_returns = np.array([m.n_returns for m in metrics], dtype=np.int64)
+        self.ret_mean = np.array([m.ret_mean for m in metrics], dtype=np.float64)
+        self.ret_m2 = np.array([m.ret_m2 for m in metrics], dtype=np.float64)
+        self.samples = np.empty((self.size, self.capacity), dtype=np.float64)
+        for i, m in enumerate(metrics):
+            self.samples[i, :self.n_samples] = m.samples[:self.n_samples]
+
+    def update(self, equity: np.ndarray) -> None:
+        """Record one equity observation per instance (same arithmetic as OnlineMetrics)."""
+        if self.count == 0:
+            self.peak = equity.copy()
+        else:
+            if self.last.all(): # No zero equity
+                r = (equity - self.last) / self.last
+                self.n_returns += 1
+                delta = r - self.ret_mean
+                self.ret_mean += delta / self.n_returns
+            else:
+                # Instances at zero equity skip the return (delta 0 leaves mean and m2 as they are)
+                valid = self.last != 0
+                r = np.divide(equity - self.last, self.last, out=np.zeros(self.size), where=valid)
+                self.n_returns += valid
+                delta = np.where(valid, r - self.ret_mean, 0.0)
+                self.ret_mean += delta / np.maximum(self.n_returns, 1)
+            self.ret_m2 += delta * (r - self.ret_mean)
+
+        np.maximum(self.peak, equity, out=self.peak)
+        if self.peak.min(initial=1.0) > 0:
+            dd = (self.peak - equity) / self.peak
+        else:
+            dd = np.divide(self.peak - equity, self.peak, out=np.zeros(self.size), where=self.peak > 0)
+        np.maximum(self.max_dd, dd, out=self.max_dd)
+
+        self.last = equity
+        self.count += 1
+        if self.capacity:
+            self._sample(equity)
+
+    def _sample(self, equity: np.ndarray) -> None:
+        if self.skip > 0:
+            self.skip -= 1
+            return
+        if self.n_samples == self.capacity:
+            half = self.capacity // 2
+            self.samples[:, :half] = self.samples[:, 0:self.capacity:2]
+            self.n_samples = half
+            self.stride *= 2
+        self.samples[:, self.n_samples] = equity
+        self.n_samples += 1
+        self.skip = self.stride - 1
+
+    def sync(self, metrics: List[OnlineMetrics]) -> None:
+        """Write the vectorized state back to per-instance accumulators."""
+        for i, m in enumerate(metrics):
+            m.count = self.count
+            m.stride = self.stride
+            m.skip = self.skip
+            m.n_samples = self.n_samples
+            m.last = float(self.last[i])
+            m.peak = float(self.peak[i])
+            m.max_dd = float(self.max_dd[i])
+            m.n_returns = int(self.n_returns[i])
+            m.ret_mean = float(self.ret_mean[i])
+            m.ret_m2 = float(self.ret_m2[i])
+            m.samples[:self.n_samples] = self.samples[i, :self.n_samples]
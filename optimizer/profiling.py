@@ -0,0 +1,156 @@
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# Stages of one streaming pass, in pipeline order
+STAGES = ("decode", "convert", "kernel", "strategies", "hooks", "engine")
+
+class Profiler:
+    """
+    Low-overhead per-stage timer for one streaming pass.
+
+    Stages accumulate `perf_counter` deltas (no per-row work):
+      - decode: producing source batches (CSV parse, IPC/Parquet reads, shared-memory copies)
+      - convert: Arrow -> NumPy extraction in MultiStrategyWrapper
+      - kernel: shared rolling-statistics prefix sums
+      - strategies: bank and per-instance on_ticks
+      - hooks: after_batch hooks (pruning, checkpoints)
+      - engine: everything else inside the backtester (windowing, dispatch)
+
+    Bank time is split evenly across the bank's members when ranking instances;
+    instances outside a bank are timed individually.
+    """
+    def __init__(self):
+        self.seconds: Dict[str, float] = {stage: 0.0 for stage in STAGES}
+        self.calls: Dict[str, int] = {stage: 0 for stage in STAGES}
+        # id(bank or instance) -> [label, member names, seconds]
+        self.units: Dict[int, List[Any]] = {}
+        self.rows = 0
+        self.batches = 0
+        self.instances = 0
+        self.wall = 0.0
+        self._started: Optional[float] = None
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+
+    def stop(self) -> None:
+        if self._started is not None:
+            self.wall += time.perf_counter() - self._started
+            self._started = None
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.seconds[stage] += seconds
+        self.calls[stage] += 1
+
+    def add_unit(self, unit: Any, seconds: float) -> None:
+        """Charge `seconds` of on_ticks to a bank or a single instance."""
+        entry = self.units.get(id(unit))
+        if entry is None:
+            members = getattr(unit, "strategies", None)
+            names = [s.name for s in members] if members is not None else [unit.name]
+            label = type(unit).__name__ if members is not None else "instance"
+            entry = self.units[id(unit)] = [label, names, 0.0]
+        entry[2] += seconds
+
+    def count(self, batch: Any) -> None:
+        """Count one batch of the pass (once per pass, however many consumers see it)."""
+        self.rows += batch.num_rows
+        self.batches += 1
+
+    def timed(self, stream: Iterable[Any], stage: str = "decode") -> Iterator[Any]:
+        """Yield from `stream`, charging the time spent producing each item to `stage`."""
+        iterator = iter(stream)
+        while True:
+            t0 = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add(stage, time.perf_counter() - t0)
+                return
+            self.add(stage, time.perf_counter() - t0)
+            yield item
+
+    def instance_seconds(self) -> Dict[str, float]:
+        """Per-instance on_ticks time (bank time shared evenly)."""
+        totals: Dict[str, float] = {}
+        for _, names, seconds in self.units.values():
+            share = seconds / len(names) if names else 0.0
+            for name in names:
+                totals[name] = totals.get(name, 0.0) + share
+        return totals
+
+    def report(self, top: int = 10) -> Dict[str, Any]:
+        """JSON-ready summary: stage times and shares, throughput and the slowest instances."""
+        seconds = dict(self.seconds)
+        # Engine time is whatever the pass spent outside the measured stages
+        measured = sum(v for k, v in seconds.items() if k != "engine")
+        seconds["engine"] = max(0.0, self.wall - measured) + self.seconds["engine"]
+        slowest = sorted(self.instance_seconds().items(), key=lambda kv: -kv[1])[:top]
+        units = sorted(self.units.values(), key=lambda u: -u[2])
+        return {
+            "wall_seconds": self.wall,
+            "rows": self.rows,
+            "batches": self.batches,
+            "instances": self.instances,
+            "rows_per_sec": _rate(self.rows, self.wall),
+            "batches_per_sec": _rate(self.batches, self.wall),
+            "events_per_sec": _rate(self.rows * self.instances, self.wall),
+            "stages": {
+                stage: {
+                    "seconds": seconds[stage],
+                    "calls": self.calls[stage],
+                    "share": seconds[stage] / self.wall if self.wall > 0 else 0.0,
+                }
+                for stage in STAGES
+            },
+            "units": [{"kind": label, "instances": len(names), "seconds": secs} for label, names, secs in units[:top]],
+            "slowest_instances": [{"name": name, "seconds": secs} for name, secs in slowest],
+        }
+
+def merge_reports(reports: List[Dict[str, Any]], wall: float, top: int = 10) -> Dict[str, Any]:
+    """
+    Combine the profiles of parallel shards (and of the broadcasting parent, which
+    only decodes). Stage seconds are summed across processes, so shares are of total
+    CPU time; throughput is against the parent's `wall` time.
+    """
+    reports = [r for r in reports if r]
+    if len(reports) == 1:
+        return reports[0]
+    rows = max((r["rows"] for r in reports), default=0)
+    instances = sum(r["instances"] for r in reports)
+    stages = {}
+    for stage in STAGES:
+        secs = sum(r["stages"][stage]["seconds"] for r in reports)
+        stages[stage] = {
+            "seconds": secs,
+            "calls": sum(r["stages"][stage]["calls"] for r in reports),
+            "share": 0.0,
+        }
+    total = sum(s["seconds"] for s in stages.values())
+    for s in stages.values():
+        s["share"] = s["seconds"] / total if total > 0 else 0.0
+    slowest = sorted((i for r in reports for i in r["slowest_instances"]), key=lambda i: -i["seconds"])[:top]
+    units = sorted((u for r in reports for u in r["units"]), key=lambda u: -u["seconds"])[:top]
+    merged = {
+        "wall_seconds": wall,
+        "workers": sum(1 for r in reports if r["instances"]),
+        "rows": rows,
+        "batches": max((r["batches"] for r in reports), default=0),
+        "instances": instances,
+        "rows_per_sec": _rate(rows, wall),
+        "batches_per_sec": _rate(max((r["batches"] for r in reports), default=0), wall),
+        "events_per_sec": _rate(sum(r["rows"] * r["instances"] for r in reports), wall),
+        "stages": stages,
+        "units": units,
+        "slowest_instances": slowest,
+    }
+    prefetch = [r["prefetch"] for r in reports if "prefetch" in r]
+    if prefetch:
+        # Counters add up across processes; depth is the configured one
+        merged["prefetch"] = {key: sum(p[key] for p in prefetch) for key in prefetch[0] if key not in ("depth", "mean_ready")}
+        merged["prefetch"]["depth"] = prefetch[0]["depth"]
+        merged["prefetch"]["mean_ready"] = sum(p["mean_ready"] for p in prefetch) / len(prefetch)
+    return merged
+
+def _rate(count: float, seconds: float) -> float:
+    return count / seconds if seconds > 0 else 0.0
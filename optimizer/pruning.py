@@ -0,0 +1,70 @@
+from typing import Any, Dict, List
+
+# Metrics where a smaller value ranks higher
+LOWER_IS_BETTER = {"max_dd"}
+
+def metric_value(stats: Dict[str, Any], metric: str) -> Any:
+    """`metric` from a get_stats() dict; raises ValueError when the strategy does not report it."""
+    if metric not in stats:
+        reported = sorted(k for k, v in stats.items() if isinstance(v, (int, float)) and not isinstance(v, bool))
+        raise ValueError(f"Ranking metric '{metric}' is not reported by strategy '{stats.get('name')}' "
+                         f"(available: {reported})")
+    return stats[metric]
+
+def check_metric(strategies: List[Any], metric: str) -> None:
+    """Fail fast, before streaming, when the strategies cannot be ranked by `metric`."""
+    if strategies:
+        metric_value(strategies[0].get_stats(), metric)
+
+def rank_strategies(strategies: List[Any], metric: str) -> List[int]:
+    """Indices of `strategies` ordered best first by `metric` (ties keep config order)."""
+    sign = -1.0 if metric in LOWER_IS_BETTER else 1.0
+    scores = []
+    for s in strategies:
+        value = metric_value(s.get_stats(), metric)
+        scores.append(sign * value if value is not None else float("-inf"))
+    return sorted(range(len(strategies)), key=lambda i: -scores[i])
+
+class SuccessiveHalving:
+    """
+    Successive-halving (Hyperband-style) pruning hook for MultiStrategyWrapper.
+
+    Rung r ends after `min_rows * eta**r` rows. At each rung the active
+    instances are ranked by `metric` and only the best 1/eta continue;
+    the rest are removed from the wrapper mid-stream and keep the stats
+    they had when pruned.
+    """
+    def __init__(self, eta: int = 3, min_rows: int = 100_000, metric: str = "roi", min_survivors: int = 1):
+        if eta < 2:
+            raise ValueError("eta must be >= 2")
+        if min_rows < 1:
+            raise ValueError("min_rows must be >= 1")
+        self.eta = eta
+        self.metric = metric
+        self.min_survivors = max(1, min_survivors)
+        self.next_rung = min_rows
+        self.rung = 0
+        self.pruned: List[Any] = []
+
+    def after_batch(self, wrapper, ctx) -> None:
+        if wrapper.rows_seen < self.next_rung:
+            return
+        while self.next_rung <= wrapper.rows_seen:
+            self.next_rung *= self.eta
+        self.rung += 1
+
+        active = wrapper.strategies
+        keep = max(self.min_survivors, len(active) // self.eta)
+        if keep >= len(active):
+            return
+
+        # Rank on up-to-date state
+        wrapper.sync()
+        ranked = rank_strategies(active, self.metric)
+        losers = [active[i] for i in ranked[keep:]]
+
+        for s in losers:
+            s.pruned_at = wrapper.rows_seen
+            s.on_finish(ctx)
+        wrapper.remove(losers)
+        self.pruned.extend(losers)
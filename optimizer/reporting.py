@@ -1,6 +1,6 @@
 import json
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime
 
 class Reporter:
@@ -15,8 +15,8 @@ class Reporter:
             print("No results to report.")
             return
 
-        # Sort by ROI descending
-        sorted_res = sorted(results, key=lambda x: x.get('roi', -999), reverse=True)
+        # Sort by ROI descending; candidates pruned early rank below full runs
+        sorted_res = sorted(results, key=lambda x: ('pruned_at' not in x, x.get('roi', -999)), reverse=True)
         top_5 = sorted_res[:15]
 
         print("\n" + "="*95)
@@ -30,6 +30,7 @@ class Reporter:
             sharpe = res.get('sharpe', 0.0)
             
             name = res.get('name', 'Unknown')
+            if 'pruned_at' in res: name = f"{name} (pruned)"
             if len(name) > 25: name = name[:22] + "..."
             
             print(f"#{i+1:<3} | {name:<25} | {roi:>6.2f}% | {max_dd:>6.2f}% | {sharpe:>6.2f} | {trades:<6}")
@@ -39,13 +40,57 @@ class Reporter:
             best = sorted_res[0]
             print(f"\n🏆 WINNER: {best.get('name')} -> ROI: {best.get('roi', 0):.2f}%")
 
-    def save_json(self, results: List[Dict[str, Any]]):
+    def print_summary(self, summary: Dict[str, Any]):
+        """Print run-level summaries (walk-forward folds)."""
+        wf = summary.get("walk_forward")
+        if not wf:
+            return
+        metric = wf["metric"]
+        print(f"\n🔁 WALK-FORWARD ({metric}, top winner per fold)")
+        print(f"{'FOLD':<4} | {'IS':>8} | {'OOS':>8} | PARAMS")
+        for fold in wf["folds"]:
+            is_val = fold.get(f"is_{metric}") or 0.0
+            oos_val = fold.get(f"oos_{metric}") or 0.0
+            partial = "" if fold["complete"] else " (partial)"
+            print(f"{fold['fold']:<4} | {is_val:>8.2f} | {oos_val:>8.2f} | {fold['params']}{partial}")
+        if wf[f"mean_is_{metric}"] is not None:
+            print(f"MEAN | {wf[f'mean_is_{metric}']:>8.2f} | {wf[f'mean_oos_{metric}']:>8.2f} |")
+
+    def print_profile(self, profile: Dict[str, Any]):
+        """Print per-stage timings, throughput and the slowest instances of a profiled run."""
+        if not profile:
+            return
+        wall = profile["wall_seconds"]
+        print(f"\n⏱️  PROFILE ({wall:.2f}s wall, {profile['rows']:,} rows, {profile['batches']:,} batches)")
+        print(f"{'STAGE':<10} | {'SECONDS':>8} | {'SHARE':>6} | {'CALLS':>8}")
+        for stage, row in profile["stages"].items():
+            print(f"{stage:<10} | {row['seconds']:>8.3f} | {row['share'] * 100:>5.1f}% | {row['calls']:>8,}")
+        print(f"   {profile['rows_per_sec']:,.0f} rows/s | {profile['batches_per_sec']:,.1f} batches/s | "
+              f"{profile['events_per_sec']:,.0f} strategy-events/s")
+        slowest = profile.get("slowest_instances", [])[:5]
+        if slowest:
+            print("   Slowest instances: " + ", ".join(f"{i['name']} ({i['seconds'] * 1000:.1f}ms)" for i in slowest))
+
+    def save_profile(self, profile: Dict[str, Any]):
+        path = os.path.join(self.report_dir, "profile.json")
+        data = {
+            "experiment_id": self.experiment_id,
+            "timestamp": datetime.now().isoformat(),
+            **profile,
+        }
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+        print(f"📄 Saved profile to {path}")
+
+    def save_json(self, results: List[Dict[str, Any]], summary: Optional[Dict[str, Any]] = None):
         path = os.path.join(self.report_dir, "results.json")
         data = {
             "experiment_id": self.experiment_id,
             "timestamp": datetime.now().isoformat(),
             "results": results
         }
+        if summary:
+            data["summary"] = summary
         with open(path, "w") as f:
             json.dump(data, f, indent=2)
         print(f"📄 Saved results to {path}")
@@ -1,5 +1,43 @@
+import numpy as np
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, List
+from optimizer.metrics import OnlineMetrics, MetricsBank
+
+# Annualization factor for per-batch Sharpe ratios
+SHARPE_ANNUALIZATION = np.sqrt(252 * 1440)
+
+# Execution modes: act once per batch at its last tick, or on every tick of the batch
+EXECUTION_MODES = ("batch", "tick")
+
+def toggle_path(long0: np.ndarray, enter: np.ndarray, exit: np.ndarray) -> np.ndarray:
+    """
+    Long/flat state after every tick for long-only positions that go long on
+    `enter` while flat and flat on `exit` while long.
+
+    `long0` has one entry per row, `enter`/`exit` are (rows, ticks) masks.
+    The state is the last trigger seen (a forward fill of trigger indices);
+    rows where both masks fire on the same tick toggle and are walked tick by tick.
+    """
+    n, T = enter.shape
+    last = np.where(enter | exit, np.arange(T, dtype=np.int32), np.int32(-1))
+    np.maximum.accumulate(last, axis=1, out=last)
+    state = np.take_along_axis(enter, np.maximum(last, 0), axis=1)
+    state = np.where(last >= 0, state, np.asarray(long0, dtype=bool)[:, None])
+
+    for i in np.flatnonzero((enter & exit).any(axis=1)):
+        held = bool(long0[i])
+        for t in np.flatnonzero(enter[i] | exit[i]):
+            if held and exit[i, t]:
+                held = False
+            elif not held and enter[i, t]:
+                held = True
+            state[i, t:] = held
+    return state
+
+def _fills(long0: np.ndarray, state: np.ndarray):
+    """(buys, sells) masks: ticks where the state turns long / flat."""
+    prev = np.concatenate((np.asarray(long0, dtype=bool)[:, None], state[:, :-1]), axis=1)[:, :state.shape[1]]
+    return state & ~prev, prev & ~state
 
 class BaseStrategy(ABC):
     """
@@ -20,7 +58,37 @@ class BaseStrategy(ABC):
         self.cash = 100_000.0
         self.position = 0.0
         self.initial_value = 100_000.0
-        self.equity_history: List[float] = [] # Track equity per batch for analytics
+        # Streaming risk metrics, updated once per batch via record_equity()
+        self.metrics = OnlineMetrics()
+        self.execution = "batch" # See EXECUTION_MODES
+        # Trade only the rows of this symbol_id (None: every row of the stream)
+        self.symbol_id: Optional[int] = None
+        
+    @property
+    def equity_history(self) -> List[float]:
+        """Downsampled equity curve (empty unless metrics were given a sample capacity)."""
+        return self.metrics.equity_samples().tolist()
+        
+    @equity_history.setter
+    def equity_history(self, values: List[float]) -> None:
+        # Replay a full curve, e.g. from tests or older result files
+        self.metrics = OnlineMetrics(max(len(values), self.metrics.capacity))
+        for v in values:
+            self.metrics.update(v)
+            
+    def record_equity(self, equity: float) -> None:
+        """Feed one equity observation to the online metrics."""
+        self.metrics.update(equity)
+        
+    def risk_stats(self) -> Dict[str, Any]:
+        """Max drawdown (%) and annualized Sharpe from the online metrics."""
+        stats = {
+            "max_dd": self.metrics.max_drawdown_pct,
+            "sharpe": self.metrics.sharpe * SHARPE_ANNUALIZATION,
+        }
+        if self.metrics.capacity:
+            stats["equity_curve"] = self.equity_history
+        return stats
         
     def on_start(self, ctx: Any) -> None:
         """Called before the backtest starts."""
@@ -32,7 +100,7 @@ class BaseStrategy(ABC):
         Returns True if successful, False if insufficient funds.
         """
         fee_rate = self.params.get("fee_rate", 0.0)
-        cost = price * qty
+        cost = float(price) * qty # Settle in float64 even when handed float32 prices
         fee = cost * fee_rate
         total_cost = cost + fee
         
@@ -49,7 +117,7 @@ class BaseStrategy(ABC):
         Returns True if successful, False if insufficient position.
         """
         fee_rate = self.params.get("fee_rate", 0.0)
-        revenue = price * qty
+        revenue = float(price) * qty
         fee = revenue * fee_rate
         net_revenue = revenue - fee
         
@@ -60,6 +128,29 @@ class BaseStrategy(ABC):
             return True
         return False
         
+    def execute_path(self, enter: np.ndarray, exit: np.ndarray, prices: np.ndarray, qty: float) -> None:
+        """
+        Intra-batch execution: buy `qty` at the first `enter` tick while flat and
+        sell it at the first `exit` tick while long, at those ticks' prices.
+        Only ticks with fills are visited; a rejected order re-derives the rest of the path.
+        """
+        long0 = np.array([self.position > 0])
+        buys, sells = _fills(long0, toggle_path(long0, enter[None, :], exit[None, :]))
+        buys, sells = buys[0], sells[0]
+        ticks = np.flatnonzero(buys | sells)
+        k = 0
+        while k < len(ticks):
+            t = ticks[k]
+            k += 1
+            ok = self.execute_buy(prices[t], qty) if buys[t] else self.execute_sell(prices[t], qty)
+            if ok:
+                continue
+            held = np.array([self.position > 0])
+            rest_buys, rest_sells = _fills(held, toggle_path(held, enter[None, t + 1:], exit[None, t + 1:]))
+            buys[t + 1:] = rest_buys[0]
+            sells[t + 1:] = rest_sells[0]
+            ticks = np.concatenate((ticks[:k], np.flatnonzero(buys[t + 1:] | sells[t + 1:]) + t + 1))
+        
     @abstractmethod
     def on_ticks(self, batch: Any, ctx: Any) -> None:
         """
@@ -72,19 +163,12 @@ class BaseStrategy(ABC):
         pass
         
     def calculate_drawdown(self, equity_curve: list) -> float:
-        """Helper to calculate Max Drawdown %."""
-        if not equity_curve: return 0.0
+        """Helper to calculate Max Drawdown % of a full equity curve."""
+        if len(equity_curve) == 0: return 0.0
         
-        peak = equity_curve[0]
-        max_dd = 0.0
-        
-        for val in equity_curve:
-            if val > peak:
-                peak = val
-            dd = (peak - val) / peak
-            if dd > max_dd:
-                max_dd = dd
-        return max_dd * 100.0
+        curve = np.asarray(equity_curve, dtype=np.float64)
+        peak = np.maximum.accumulate(curve)
+        return float(np.max((peak - curve) / peak)) * 100.0
         
     def on_finish(self, ctx: Any) -> None:
         """Called after the backtest ends."""
@@ -99,3 +183,139 @@ class BaseStrategy(ABC):
         """Update strategy hyperparameters."""
         self.params.update(params)
         # Allow subclasses to react to param changes if needed
+
+    @classmethod
+    def create_bank(cls, strategies: List["BaseStrategy"]) -> Optional["StrategyBank"]:
+        """
+        Build a vectorized bank for many instances of this class.
+        Returns None when the strategy has no bank implementation.
+        """
+        return None
+
+class StrategyBank(ABC):
+    """
+    Vectorized execution of many instances of one strategy class.
+    
+    The bank copies the state of its instances into NumPy arrays, updates
+    all of them in one step per batch, and writes the state back on sync().
+    """
+    
+    def __init__(self, strategies: List[BaseStrategy]):
+        self.strategies = strategies
+        self.fee_rate = np.array([s.params.get("fee_rate", 0.0) for s in strategies], dtype=np.float64)
+        self.cash = np.array([s.cash for s in strategies], dtype=np.float64)
+        self.position = np.array([s.position for s in strategies], dtype=np.float64)
+        self.trade_count = np.array([s.trade_count for s in strategies], dtype=np.int64)
+        self.metrics = MetricsBank([s.metrics for s in strategies])
+        self.execution = strategies[0].execution if strategies else "batch"
+        self.symbol_id = getattr(strategies[0], "symbol_id", None) if strategies else None
+        
+    def record_equity(self, equity: np.ndarray) -> None:
+        """Feed one equity observation per instance to the vectorized metrics."""
+        self.metrics.update(equity)
+        
+    def execute(self, buy: np.ndarray, sell: np.ndarray, price: float, qty: float) -> np.ndarray:
+        """
+        Vectorized execute_buy / execute_sell for the instances selected by the masks.
+        Uses the same arithmetic as BaseStrategy so results match instance by instance.
+        Returns the mask of orders rejected for lack of cash or position.
+        """
+        cost = float(price) * qty
+        rejected = np.zeros(len(self.strategies), dtype=bool)
+        
+        if buy.any():
+            idx = np.flatnonzero(buy)
+            total_cost = cost + (cost * self.fee_rate[idx])
+            idx_ok = self.cash[idx] >= total_cost
+            rejected[idx[~idx_ok]] = True
+            idx = idx[idx_ok]
+            self.cash[idx] -= total_cost[idx_ok]
+            self.position[idx] += qty
+            self.trade_count[idx] += 1
+            
+        if sell.any():
+            idx = np.flatnonzero(sell)
+            net_revenue = cost - (cost * self.fee_rate[idx])
+            idx_ok = self.position[idx] >= qty
+            rejected[idx[~idx_ok]] = True
+            idx = idx[idx_ok]
+            self.position[idx] -= qty
+            self.cash[idx] += net_revenue[idx_ok]
+            self.trade_count[idx] += 1
+        return rejected
+        
+    def execute_path(self, enter: np.ndarray, exit: np.ndarray, prices: np.ndarray, qty: float) -> None:
+        """
+        Vectorized BaseStrategy.execute_path over (instances, ticks) signal masks.
+        
+        Fills are derived from the long/flat path and settled with one cumulative
+        sum over each instance's fills (seeded with its cash, so additions happen
+        in the same order as sequential fills). Instances with a rejected buy, or
+        a position other than flat / `qty`, are replayed fill by fill instead.
+        """
+        n = len(self.strategies)
+        long0 = self.position > 0
+        state = toggle_path(long0, enter, exit)
+        buys, sells = _fills(long0, state)
+        
+        # Fills are sparse: settle them in an (instances, fills + 1) ledger
+        rows, ticks = np.nonzero(buys | sells)
+        counts = np.bincount(rows, minlength=n)
+        slot = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+        cost = prices[ticks].astype(np.float64) * qty
+        fee = cost * self.fee_rate[rows]
+        is_buy = buys[rows, ticks]
+        amount = np.where(is_buy, cost + fee, cost - fee)
+        ledger = np.zeros((n, (counts.max() if n else 0) + 1), dtype=np.float64)
+        ledger[:, 0] = self.cash
+        ledger[rows, slot + 1] = np.where(is_buy, -amount, amount)
+        np.cumsum(ledger, axis=1, out=ledger)
+        
+        replay = np.zeros(n, dtype=bool)
+        replay[rows[is_buy & (ledger[rows, slot] < amount)]] = True
+        replay |= (self.position != 0.0) & (self.position != qty)
+        ok = ~replay
+        ends_long = state[:, -1] if state.shape[1] else long0
+        self.cash[ok] = ledger[ok, -1]
+        self.position[ok] = np.where(ends_long[ok], qty, 0.0)
+        self.trade_count[ok] += counts[ok]
+        
+        if replay.any():
+            buys[ok] = False
+            sells[ok] = False
+            self._replay_fills(buys, sells, enter, exit, prices, qty)
+            
+    def _replay_fills(self, buys, sells, enter, exit, prices, qty) -> None:
+        """Apply fills tick by tick; rejected instances re-derive the rest of their path."""
+        ticks = np.flatnonzero((buys | sells).any(axis=0))
+        k = 0
+        while k < len(ticks):
+            t = ticks[k]
+            k += 1
+            rejected = self.execute(buys[:, t], sells[:, t], prices[t], qty)
+            if not rejected.any():
+                continue
+            rows = np.flatnonzero(rejected)
+            held = self.position[rows] > 0
+            rest_buys, rest_sells = _fills(held, toggle_path(held, enter[rows, t + 1:], exit[rows, t + 1:]))
+            buys[rows, t + 1:] = rest_buys
+            sells[rows, t + 1:] = rest_sells
+            ticks = np.concatenate((ticks[:k], np.flatnonzero((buys[:, t + 1:] | sells[:, t + 1:]).any(axis=0)) + t + 1))
+            
+    def sync_account(self) -> None:
+        """Write cash, position, trade count and metrics back to the instances."""
+        for i, s in enumerate(self.strategies):
+            s.cash = float(self.cash[i])
+            s.position = float(self.position[i])
+            s.trade_count = int(self.trade_count[i])
+        self.metrics.sync([s.metrics for s in self.strategies])
+        
+    @abstractmethod
+    def on_ticks(self, prices: Any, qtys: Any, sides: Any, ctx: Any) -> None:
+        """Process one batch for every instance in the bank."""
+        pass
+        
+    @abstractmethod
+    def sync(self) -> None:
+        """Write the vectorized state back to the strategy instances."""
+        pass
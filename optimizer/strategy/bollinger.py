@@ -1,11 +1,16 @@
 import numpy as np
-from optimizer.strategy.base import BaseStrategy
+from optimizer.indicators import RollingMoments
+from optimizer.strategy.base import BaseStrategy, StrategyBank
 from optimizer.strategy.registry import register_strategy
 
 @register_strategy("BollingerReversion")
 class BollingerReversion(BaseStrategy):
     """
     Bollinger Bands Mean Reversion Strategy.
+    
+    The bands are a true rolling window over the last `window` ticks,
+    carried across batch boundaries. In tick execution every tick is tested
+    against its own bands and fills happen at the crossing ticks.
     """
     def __init__(self, name: str = "Bollinger"):
         super().__init__(name)
@@ -15,43 +20,132 @@ class BollingerReversion(BaseStrategy):
         })
         
         self.last_price = 0.0
+        self.rolling = None
+        # Recent prices that seed the bands when they are rebuilt (set when a bank syncs)
+        self.warmup = None
 
     def on_start(self, ctx):
-        pass
+        self.rolling = RollingMoments(int(self.params["window"]))
 
     def on_ticks(self, prices, qtys, sides, ctx):
-        self.last_price = prices[-1]
+        self.last_price = float(prices[-1])
         
-        # Simple Logic: Compute rolling stats on the *current batch*
         window = int(self.params["window"])
         k = self.params.get("std_dev", 2.0)
         
-        if len(prices) < window:
-            return
+        if self.rolling is None or self.rolling.window != window:
+            self.rolling = RollingMoments(window)
+            if self.warmup is not None:
+                self.rolling.update(self.warmup[-window:])
+                self.warmup = None
             
-        recent = prices[-window:]
-        mean = np.mean(recent)
-        std = np.std(recent)
-        
-        upper = mean + (k * std)
-        lower = mean - (k * std)
-        current = prices[-1]
-        
+        # Rolling stats for every tick of the batch, O(len(prices))
+        means, stds = self.rolling.update(prices)
         trade_qty = 1.0
         
-        if current < lower and self.position <= 0:
-            self.execute_buy(current, trade_qty)
-        elif current > upper and self.position >= 0:
-            self.execute_sell(current, trade_qty)
+        if self.execution == "tick":
+            # NaN bands (window not warm yet) compare False on both sides
+            self.execute_path(prices < means - k * stds, prices > means + k * stds, prices, trade_qty)
+            self.record_equity(self.cash + (self.position * self.last_price))
+            return
+            
+        if self.rolling.ready:
+            mean = means[-1]
+            std = stds[-1]
+            
+            upper = mean + (k * std)
+            lower = mean - (k * std)
+            current = self.last_price
             
+            if current < lower and self.position <= 0:
+                self.execute_buy(current, trade_qty)
+            elif current > upper and self.position >= 0:
+                self.execute_sell(current, trade_qty)
+                
+        # Track Equity for Analytics
+        self.record_equity(self.cash + (self.position * self.last_price))
+            
+    @classmethod
+    def create_bank(cls, strategies):
+        # Subclasses that override the signal logic cannot share the bank
+        if cls.on_ticks is not BollingerReversion.on_ticks:
+            return None
+        return BollingerReversionBank(strategies)
+
     def get_stats(self):
-        # Use simple stats for now, can implement equity tracking like OFI if needed
         equity = self.cash + (self.position * self.last_price)
         pnl = equity - self.initial_value
         return {
             "name": self.name,
             "window": self.params["window"],
             "std_dev": self.params["std_dev"],
+            "pnl": pnl,
             "roi": (pnl/self.initial_value)*100,
+            # Max DD and simple Sharpe (per-batch returns) from the online metrics
+            **self.risk_stats(),
             "trades": self.trade_count
         }
+
+class BollingerReversionBank(StrategyBank):
+    """
+    Vectorized BollingerReversion.
+    
+    Mean/std come from the engine's shared RollingStatsKernel (assigned to
+    `kernel` by MultiStrategyWrapper): each distinct window is read once as a
+    prefix-sum difference and broadcast to every instance using it.
+    """
+    def __init__(self, strategies):
+        super().__init__(strategies)
+        windows = np.array([int(s.params["window"]) for s in strategies], dtype=np.int64)
+        self.windows, self.window_index = np.unique(windows, return_inverse=True)
+        self.k = np.array([s.params.get("std_dev", 2.0) for s in strategies], dtype=np.float64)
+        self.last_price = strategies[0].last_price if strategies else 0.0
+        self.kernel = None
+        
+    @property
+    def max_window(self) -> int:
+        return int(self.windows.max()) if len(self.windows) else 0
+
+    def on_ticks(self, prices, qtys, sides, ctx):
+        current = float(prices[-1])
+        self.last_price = current
+        
+        if self.execution == "tick":
+            # (instances, ticks) bands from one (windows, ticks) kernel read
+            means, stds = self.kernel.window_stats_path(self.windows)
+            mean = means[self.window_index]
+            std = stds[self.window_index]
+            k = self.k[:, None]
+            self.execute_path(prices < mean - k * std, prices > mean + k * std, prices, 1.0)
+            self.record_equity(self.cash + (self.position * current))
+            return
+        
+        means, stds = self.kernel.window_stats(self.windows)
+        mean = means[self.window_index]
+        std = stds[self.window_index]
+        
+        upper = mean + (self.k * std)
+        lower = mean - (self.k * std)
+        
+        trade_qty = 1.0
+        
+        # NaN bands (window not warm yet) compare False on both sides
+        buy = (current < lower) & (self.position <= 0)
+        sell = (current > upper) & (self.position >= 0) & ~buy
+        self.execute(buy, sell, current, trade_qty)
+        
+        # Track Equity for Analytics
+        self.record_equity(self.cash + (self.position * current))
+
+    def sync(self):
+        self.sync_account()
+        for s in self.strategies:
+            s.last_price = self.last_price
+        if self.kernel is None:
+            return
+        # The instances' own bands went stale while banked: hand them the recent prices
+        # (one array per distinct window) to rebuild from if they ever run unbanked
+        recent = [self.kernel.recent(w) for w in self.windows.tolist()]
+        for s, i in zip(self.strategies, self.window_index):
+            s.rolling = None
+            s.warmup = recent[i]
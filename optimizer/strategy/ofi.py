@@ -1,5 +1,6 @@
 import numpy as np
-from optimizer.strategy.base import BaseStrategy
+from optimizer.indicators import decay_scan
+from optimizer.strategy.base import BaseStrategy, StrategyBank
 from optimizer.strategy.registry import register_strategy
 
 @register_strategy("OFI_Momentum")
@@ -8,7 +9,7 @@ class OFIMomentum(BaseStrategy):
     Order Flow Imbalance (OFI) Momentum Strategy.
     
     Params:
-        window (int): Decay window for OFI metric.
+        window (int): Decay window for OFI metric (per batch, or per tick in tick execution).
         threshold (float): Signal threshold.
     """
     def __init__(self, name: str = "OFI"):
@@ -33,17 +34,24 @@ class OFIMomentum(BaseStrategy):
 
     def on_ticks(self, prices, qtys, sides, ctx):
         # prices, qtys, sides are numpy arrays (float, float, int)
-        self.last_price = prices[-1]
+        self.last_price = float(prices[-1])
+        trade_qty = 1.0
+        threshold = self.params.get("threshold", 5.0)
+        
+        if self.execution == "tick":
+            # OFI after every tick, trading at the ticks where it crosses the thresholds
+            path = decay_scan([self.ofi_sum], [self.decay], qtys * sides)[0]
+            self.ofi_sum = path[-1]
+            self.execute_path(path > threshold, path < -threshold, prices, trade_qty)
+            self.record_equity(self.cash + (self.position * self.last_price))
+            return
 
-        # Net Flow for this batch
-        net_flow = np.sum(qtys * sides)
+        # Net Flow for this batch (accumulated in float64 whatever the input dtype)
+        net_flow = float(np.sum(qtys * sides))
         
         # Update Smoothed OFI
         self.ofi_sum = (self.ofi_sum * self.decay) + net_flow
         
-        trade_qty = 1.0
-        threshold = self.params.get("threshold", 5.0)
-        
         # Momentum Logic
         if self.ofi_sum > threshold and self.position <= 0:
             self.execute_buy(self.last_price, trade_qty)
@@ -53,16 +61,18 @@ class OFIMomentum(BaseStrategy):
             
         # Track Equity for Analytics
         current_equity = self.cash + (self.position * self.last_price)
-        self.equity_history.append(current_equity)
+        self.record_equity(current_equity)
+
+    @classmethod
+    def create_bank(cls, strategies):
+        # Subclasses that override the signal logic cannot share the bank
+        if cls.on_ticks is not OFIMomentum.on_ticks:
+            return None
+        return OFIMomentumBank(strategies)
 
     def get_stats(self):
         equity = self.cash + (self.position * self.last_price)
         pnl = equity - self.initial_value
-        max_dd = self.calculate_drawdown(self.equity_history)
-        
-        # Simple Sharpe (assuming per-batch returns)
-        returns = np.diff(self.equity_history) / self.equity_history[:-1] if len(self.equity_history) > 1 else []
-        sharpe = np.mean(returns) / np.std(returns) if len(returns) > 0 and np.std(returns) > 0 else 0.0
         
         return {
             "name": self.name,
@@ -70,7 +80,51 @@ class OFIMomentum(BaseStrategy):
             "threshold": self.params["threshold"],
             "pnl": pnl,
             "roi": (pnl/self.initial_value)*100,
-            "max_dd": max_dd,
-            "sharpe": sharpe * np.sqrt(252*1440), 
+            # Max DD and simple Sharpe (per-batch returns) from the online metrics
+            **self.risk_stats(),
             "trades": self.trade_count
         }
+
+class OFIMomentumBank(StrategyBank):
+    """
+    Vectorized OFIMomentum: every configuration lives in one slot of the
+    state arrays, so a batch costs one NumPy pass regardless of instance count.
+    """
+    def __init__(self, strategies):
+        super().__init__(strategies)
+        self.decay = np.array([s.decay for s in strategies], dtype=np.float64)
+        self.threshold = np.array([s.params.get("threshold", 5.0) for s in strategies], dtype=np.float64)
+        self.ofi_sum = np.array([s.ofi_sum for s in strategies], dtype=np.float64)
+        self.last_price = strategies[0].last_price if strategies else 0.0
+
+    def on_ticks(self, prices, qtys, sides, ctx):
+        last_price = float(prices[-1])
+        self.last_price = last_price
+        trade_qty = 1.0
+        
+        if self.execution == "tick":
+            # (instances, ticks) OFI paths from one scan over the shared order flow
+            paths = decay_scan(self.ofi_sum, self.decay, qtys * sides)
+            self.ofi_sum = paths[:, -1].copy()
+            threshold = self.threshold[:, None]
+            self.execute_path(paths > threshold, paths < -threshold, prices, trade_qty)
+            self.record_equity(self.cash + (self.position * last_price))
+            return
+        
+        # Net Flow is identical for every instance: compute it once
+        net_flow = np.sum(qtys * sides)
+        self.ofi_sum = (self.ofi_sum * self.decay) + net_flow
+        
+        # Momentum Logic
+        buy = (self.ofi_sum > self.threshold) & (self.position <= 0)
+        sell = (self.ofi_sum < -self.threshold) & (self.position >= 0) & ~buy
+        self.execute(buy, sell, last_price, trade_qty)
+            
+        # Track Equity for Analytics
+        self.record_equity(self.cash + (self.position * last_price))
+
+    def sync(self):
+        self.sync_account()
+        for i, s in enumerate(self.strategies):
+            s.ofi_sum = float(self.ofi_sum[i])
+            s.last_price = self.last_price
@@ -0,0 +1,77 @@
+import unittest
+import numpy as np
+import polars as pl
+import pyarrow as pa
+
+from optimizer.backtester import PyBacktester
+from optimizer.data.loader import TS_PER_MS
+from optimizer.config import ExperimentConfig, OptimizationConfig, ParameterSpace, DataConfig, EngineConfig
+from optimizer.engine import Optimizer
+from optimizer.data.synthetic import random_walk_trades
+
+class Recorder:
+    def __init__(self):
+        self.batches = []
+        self.ticks = []
+    def on_ticks(self, batch, ctx):
+        self.batches.append(batch.column("ts_exchange").to_pylist())
+    def on_tick(self, tick, ctx):
+        self.ticks.append((tick.ts_exchange, tick.exchange_name))
+
+def make_batch(ts_ms):
+    ts = np.array(ts_ms, dtype=np.int64) * TS_PER_MS
+    n = len(ts)
+    return pa.RecordBatch.from_pydict({
+        "ts_exchange": ts,
+        "price": np.full(n, 100, dtype=np.int64),
+        "qty": np.ones(n, dtype=np.int64),
+        "side": np.ones(n, dtype=np.int8),
+        "symbol_id": np.zeros(n, dtype=np.int64),
+    })
+
+class TestPyBacktester(unittest.TestCase):
+    def test_windows_span_input_batches(self):
+        stream = [make_batch([0, 10, 999, 1000]), make_batch([1500, 1999]), make_batch([2000, 4500]), make_batch([])]
+        rec = Recorder()
+        bt = PyBacktester(python_mode="batch", batch_ms=1000)
+        bt.run_arrow(stream=stream, strategy=rec)
+        
+        windows = [[t // TS_PER_MS for t in b] for b in rec.batches]
+        self.assertEqual(windows, [[0, 10, 999], [1000, 1500, 1999], [2000], [4500]])
+        self.assertEqual(bt.last_run["rows"], 8)
+        self.assertEqual(bt.last_run["batches"], 4)
+
+    def test_run_many_tick_mode(self):
+        df = pl.DataFrame({
+            "ts_exchange": [3, 1, 2],
+            "price": [300, 100, 200],
+            "exchange_name": ["C", "A", "B"],
+        })
+        recs = [Recorder(), Recorder()]
+        bt = PyBacktester(data={"BTCUSDT": df.lazy()}, python_mode="tick")
+        bt.run_many(recs)
+        for rec in recs:
+            self.assertEqual(rec.ticks, [(1, "A"), (2, "B"), (3, "C")])
+
+    def test_optimizer_python_backend(self):
+        import tempfile, os
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trades.csv")
+            random_walk_trades(5000, seed=1, step_ms=20).write_csv(path)
+            
+            config = ExperimentConfig(
+                experiment_name="TestPyEngine",
+                data=DataConfig(path=path),
+                strategy="OFI_Momentum",
+                optimization=OptimizationConfig(method="monte_carlo", samples=4, seed=3),
+                parameters={"threshold": ParameterSpace(type="float", min=0.5, max=2.0)},
+                engine=EngineConfig(backend="python"),
+            )
+            from optimizer.strategy.registry import discover_strategies
+            discover_strategies()
+            results = Optimizer(config).run(verbose=False)
+            self.assertEqual(len(results), 4)
+            self.assertTrue(all("roi" in r for r in results))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+from optimizer.bench import run_benchmarks, compare, same_machine
+
+class TestBench(unittest.TestCase):
+    def test_quick_sweep_and_regression_check(self):
+        results = run_benchmarks(["wrapper", "strategies"], rows=5_000, instances=[1, 4], batch_sizes=[500],
+                                 repeat=1, strategies=["OFI_Momentum"], verbose=False)
+        cases = results["cases"]
+        self.assertEqual(sorted(cases), [
+            "strategy/OFI_Momentum/n=1/batch=500",
+            "strategy/OFI_Momentum/n=4/batch=500",
+            "wrapper/batch=500",
+        ])
+        m = cases["strategy/OFI_Momentum/n=4/batch=500"]
+        self.assertEqual(m["events"], 5_000 * 4)
+        self.assertEqual(m["batches"], 10)
+        self.assertGreater(m["events_per_sec"], 0)
+        self.assertGreater(m["peak_rss_mb"], 0)
+
+        # Within tolerance of itself; a baseline twice as fast is a regression
+        baseline = {"cases": {k: {"events_per_sec": v["events_per_sec"]} for k, v in cases.items()}}
+        self.assertEqual(compare(results, baseline, tolerance=10), [])
+        baseline["cases"]["wrapper/batch=500"]["events_per_sec"] *= 2
+        baseline["cases"]["loader/csv"] = {"events_per_sec": 1.0} # Not run: ignored
+        regressions = compare(results, baseline, tolerance=10)
+        self.assertEqual([r["case"] for r in regressions], ["wrapper/batch=500"])
+        self.assertAlmostEqual(regressions[0]["change_pct"], -50.0)
+
+    def test_same_machine_matches_host_or_cpu(self):
+        here = {"host": "ci-1", "cpu": "Xeon 8375C"}
+        self.assertTrue(same_machine(here, {"host": "ci-1", "cpu": "EPYC 7R13"}))
+        self.assertTrue(same_machine(here, {"host": "ci-2", "cpu": "Xeon 8375C"}))
+        self.assertFalse(same_machine(here, {"host": "laptop", "cpu": "M2"}))
+        # Baselines recorded before the keys existed never match
+        self.assertFalse(same_machine(here, {"machine": "x86_64", "processor": ""}))
+        self.assertFalse(same_machine({"host": "", "cpu": ""}, {"host": "", "cpu": ""}))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,25 @@
+import os
+import tempfile
+import threading
 import unittest
+from unittest import mock
+import numpy as np
+import polars as pl
 from dataclasses import dataclass
 from typing import Dict, Any
 
-from optimizer.config import ExperimentConfig, OptimizationConfig, ParameterSpace, DataConfig
-from optimizer.engine import Optimizer
+from optimizer.config import ExperimentConfig, OptimizationConfig, ParameterSpace, DataConfig, EngineConfig
+from optimizer.engine import Optimizer, MultiStrategyWrapper, unique_params
+from optimizer.pruning import SuccessiveHalving, rank_strategies
+from optimizer.checkpoint import read_checkpoint_header
+from optimizer.strategy.ofi import OFIMomentum
+from optimizer.data.loader import FIXED_POINT, clip_stream
+from optimizer.data.synthetic import random_walk_trades
+import pyarrow as pa
 
 # Mock Strategy for testing
 from optimizer.strategy.base import BaseStrategy
-from optimizer.strategy.registry import register_strategy
+from optimizer.strategy.registry import register_strategy, discover_strategies
 
 @register_strategy("MockTestStrategy")
 class MockTestStrategy(BaseStrategy):
@@ -29,6 +41,7 @@ class TestOptimizer(unittest.TestCase):
             }
         )
         self.optimizer = Optimizer(self.config)
+        discover_strategies()
 
     def test_generate_params_grid(self):
         # Grid search logic check (simplistic check for now)
@@ -38,6 +51,46 @@ class TestOptimizer(unittest.TestCase):
         self.assertTrue(len(params) > 0)
         self.assertIn("p1", params[0])
 
+    def test_grid_is_cartesian_product(self):
+        self.config.optimization.method = "grid"
+        self.config.parameters = {
+            "window": ParameterSpace(type="int", min=10, max=30, step=10),
+            "threshold": ParameterSpace(type="float", min=0.5, max=1.5, step=0.5),
+            "mode": ParameterSpace(values=["a", "b", "a"]),
+        }
+        params = self.optimizer.generate_params()
+        self.assertEqual(len(params), 3 * 3 * 2)
+        self.assertEqual(params[0], {"window": 10, "threshold": 0.5, "mode": "a"})
+        self.assertEqual(params[-1], {"window": 30, "threshold": 1.5, "mode": "b"})
+        self.assertEqual(len(list(unique_params(params))), len(params))
+        self.assertEqual(self.optimizer.param_count(), len(params))
+        
+        # Int ranges without a step take `samples` points like floats
+        self.config.parameters = {f"p{i}": ParameterSpace(type="int", min=1, max=100) for i in range(5)}
+        self.assertEqual(self.optimizer.grid_values(self.config.parameters["p0"]), [1, 26, 50, 75, 100])
+        self.assertEqual(self.optimizer.param_count(), 5 ** 5)
+        
+        # A 10^10 product is rejected before the first point is drawn...
+        self.config.parameters = {f"p{i}": ParameterSpace(type="int", min=1, max=100, step=1) for i in range(5)}
+        with self.assertRaisesRegex(ValueError, "max_grid"):
+            next(self.optimizer.iter_params())
+        # ...and streamed lazily when the limit is lifted
+        self.config.optimization.max_grid = 0
+        first = next(self.optimizer.iter_params())
+        self.assertEqual(first, {f"p{i}": 1 for i in range(5)})
+
+    def test_unique_params(self):
+        sets = [{"a": 1, "b": 2}, {"b": 2, "a": 1}, {"a": 2, "b": 2}, {"a": 1, "b": 2}]
+        # Consumes a stream (e.g. iter_params()) one set at a time
+        stream = unique_params(iter(sets))
+        self.assertEqual(next(stream), {"a": 1, "b": 2})
+        self.assertEqual(list(stream), [{"a": 2, "b": 2}])
+        
+        # Ranges without a step fall back to `samples` points (reported by run)
+        self.config.optimization.method = "grid"
+        self.assertEqual(self.optimizer.implicit_grid_axes(), ["p1", "p2"])
+        self.assertEqual(len(self.optimizer.grid_values(self.config.parameters["p2"])), 5)
+
     def test_generate_params_monte_carlo(self):
         self.config.optimization.method = "monte_carlo"
         self.config.optimization.samples = 20
@@ -58,5 +111,427 @@ class TestOptimizer(unittest.TestCase):
         
         self.assertEqual(params1, params2)
 
+    def test_successive_halving_prunes_mid_stream(self):
+        rng = np.random.default_rng(2)
+        batches = []
+        for _ in range(100):
+            n = 10
+            batches.append(pa.RecordBatch.from_pydict({
+                "price": ((100.0 + rng.normal(0, 1.0, n)) * FIXED_POINT).astype(np.int64),
+                "qty": (rng.uniform(0.1, 3.0, n) * FIXED_POINT).astype(np.int64),
+                "side": rng.choice([-1, 1], n).astype(np.int8),
+            }))
+            
+        def make():
+            strats = []
+            for i in range(27):
+                strat = OFIMomentum(f"Config_{i}")
+                strat.set_params({"window": 2 + i, "threshold": 0.2 + 0.1 * i})
+                strats.append(strat)
+            return strats
+            
+        full = make()
+        wrapper = MultiStrategyWrapper(full)
+        wrapper.start(None)
+        for b in batches:
+            wrapper.on_ticks(b, None)
+        wrapper.finish(None)
+        
+        halved = make()
+        wrapper = MultiStrategyWrapper(halved)
+        pruner = SuccessiveHalving(eta=3, min_rows=100)
+        wrapper.hooks.append(pruner)
+        wrapper.start(None)
+        active_counts = []
+        for b in batches:
+            wrapper.on_ticks(b, None)
+            active_counts.append(len(wrapper.strategies))
+        wrapper.finish(None)
+        
+        # Rungs at 100, 300 and 900 rows
+        self.assertEqual(active_counts[9], 9)
+        self.assertEqual(active_counts[29], 3)
+        self.assertEqual(active_counts[89], 1)
+        self.assertEqual(len(pruner.pruned), 26)
+        
+        # Survivors are unaffected by pruning their peers
+        survivor = wrapper.strategies[0]
+        reference = full[halved.index(survivor)]
+        self.assertEqual(survivor.get_stats(), reference.get_stats())
+        # Pruned candidates were the worst at their rung
+        first_rung = [s for s in halved if getattr(s, "pruned_at", None) == 100]
+        self.assertEqual(len(first_rung), 18)
+
+    def test_ranking_rejects_unreported_metric(self):
+        from optimizer.strategy.bollinger import BollingerReversion
+        class Unranked:
+            def get_stats(self):
+                return {"name": "Unranked", "roi": 1.0}
+        with self.assertRaisesRegex(ValueError, "sharpe"):
+            rank_strategies([Unranked(), Unranked()], "sharpe")
+        # Walk-forward fails before it opens the data
+        config = ExperimentConfig(
+            experiment_name="TestMetric",
+            data=DataConfig(path="missing.csv"),
+            strategy="BollingerReversion",
+            optimization=OptimizationConfig(method="walk_forward", train_ms=1000, test_ms=1000, metric="calmar"),
+            parameters={"window": ParameterSpace(type="int", values=[5, 10])},
+        )
+        with self.assertRaisesRegex(ValueError, "calmar"):
+            Optimizer(config).run_walk_forward([{"window": 5}, {"window": 10}], verbose=False)
+        # Bollinger reports the risk metrics like OFI does
+        strats = [BollingerReversion(f"B{i}") for i in range(3)]
+        for metric in ("sharpe", "max_dd"):
+            self.assertEqual(sorted(rank_strategies(strats, metric)), [0, 1, 2])
+
+    def test_parallel_matches_serial(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trades.csv")
+            random_walk_trades(20_000, seed=5).write_csv(path)
+            
+            results = []
+            for workers, shared_memory in ((1, False), (3, False), (3, True)):
+                config = ExperimentConfig(
+                    experiment_name="TestParallel",
+                    data=DataConfig(path=path),
+                    strategy="OFI_Momentum",
+                    optimization=OptimizationConfig(method="monte_carlo", samples=10, seed=11,
+                                                    parallel_workers=workers, shared_memory=shared_memory),
+                    parameters={
+                        "window": ParameterSpace(type="int", min=2, max=200),
+                        "threshold": ParameterSpace(type="float", min=0.5, max=5.0),
+                    },
+                    engine=EngineConfig(backend="python"),
+                )
+                results.append(Optimizer(config).run(verbose=False))
+                
+            serial, parallel, broadcast = results
+            self.assertEqual([r["name"] for r in parallel], [f"Config_{i}" for i in range(10)])
+            self.assertEqual(serial, parallel)
+            self.assertEqual(serial, broadcast)
+
+    def test_multi_symbol_run_matches_per_file_runs(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = []
+            for k, symbol in enumerate(("BTCUSDT", "ETHUSDT")):
+                path = os.path.join(tmp, f"{symbol}-trades.csv")
+                random_walk_trades(15_000, seed=20 + k, start_ms=25 * k, start_price=100.0 + 900.0 * k).write_csv(path)
+                paths.append(path)
+                
+            def run(path, workers=1):
+                config = ExperimentConfig(
+                    experiment_name="TestMultiSymbol",
+                    data=DataConfig(path=path),
+                    strategy="BollingerReversion",
+                    optimization=OptimizationConfig(method="grid", parallel_workers=workers),
+                    parameters={
+                        "window": ParameterSpace(type="int", values=[5, 40, 200]),
+                        "std_dev": ParameterSpace(type="float", values=[1.0, 2.0]),
+                    },
+                    engine=EngineConfig(backend="python"),
+                )
+                return Optimizer(config).run(verbose=False)
+                
+            merged = run(paths)
+            btc, eth = run(paths[0]), run(paths[1])
+            self.assertEqual(len(merged), 6)
+            for row, b, e in zip(merged, btc, eth):
+                # Every symbol trades exactly as in its own single-file run
+                self.assertEqual(list(row["symbols"]), ["BTCUSDT", "ETHUSDT"])
+                self.assertEqual(row["symbols"]["BTCUSDT"]["roi"], b["roi"])
+                self.assertEqual(row["symbols"]["ETHUSDT"]["roi"], e["roi"])
+                self.assertEqual(row["trades"], b["trades"] + e["trades"])
+                self.assertAlmostEqual(row["roi"], (b["roi"] + e["roi"]) / 2)
+                self.assertEqual((row["window"], row["std_dev"]), (b["window"], b["std_dev"]))
+            self.assertTrue(any(row["trades"] for row in merged))
+            self.assertEqual(run(paths, workers=2), merged)
+            
+            with self.assertRaises(ValueError):
+                config = ExperimentConfig(
+                    experiment_name="TestMultiSymbol", data=DataConfig(path=paths), strategy="BollingerReversion",
+                    optimization=OptimizationConfig(method="successive_halving", samples=3),
+                    parameters={"window": ParameterSpace(type="int", min=5, max=50)},
+                )
+                Optimizer(config).run(verbose=False)
+
+    def test_profiled_run_reports_stages(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trades.csv")
+            n = 20_000
+            random_walk_trades(n, seed=9).write_csv(path)
+
+            def run(workers, profile):
+                config = ExperimentConfig(
+                    experiment_name="TestProfile",
+                    data=DataConfig(path=path),
+                    strategy="OFI_Momentum",
+                    optimization=OptimizationConfig(method="monte_carlo", samples=6, seed=2,
+                                                    parallel_workers=workers, shared_memory=True),
+                    parameters={"window": ParameterSpace(type="int", min=2, max=200)},
+                    engine=EngineConfig(backend="python"),
+                )
+                opt = Optimizer(config)
+                return opt.run(verbose=False, profile=profile), opt.profile_report
+
+            plain, empty = run(1, False)
+            profiled, report = run(1, True)
+            self.assertEqual(empty, {})
+            self.assertEqual(plain, profiled)
+            self.assertEqual(report["rows"], n)
+            self.assertEqual(report["instances"], 6)
+            self.assertGreater(report["stages"]["decode"]["calls"], 0)
+            self.assertGreater(report["stages"]["strategies"]["seconds"], 0.0)
+            self.assertEqual(len(report["slowest_instances"]), 6)
+
+            # Shards and the broadcasting parent merge into one report
+            sharded, merged = run(2, True)
+            self.assertEqual(plain, sharded)
+            self.assertEqual(merged["workers"], 2)
+            self.assertEqual(merged["rows"], n)
+            self.assertEqual(merged["instances"], 6)
+
+    def test_result_cache_runs_only_new_points(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trades.csv")
+            random_walk_trades(5_000, seed=3).write_csv(path)
+            
+            def run(windows):
+                config = ExperimentConfig(
+                    experiment_name="TestCache",
+                    data=DataConfig(path=path),
+                    strategy="OFI_Momentum",
+                    optimization=OptimizationConfig(method="grid", result_cache=os.path.join(tmp, "cache")),
+                    parameters={
+                        "window": ParameterSpace(type="int", values=windows),
+                        "threshold": ParameterSpace(type="float", values=[0.5, 2.0]),
+                    },
+                    engine=EngineConfig(backend="python"),
+                )
+                opt = Optimizer(config)
+                ran = []
+                backtest = opt.backtest
+                opt.backtest = lambda sets, **kw: ran.extend(sets) or backtest(sets, **kw)
+                return opt.run(verbose=False), ran
+                
+            first, ran = run([5, 20])
+            self.assertEqual(len(ran), 4)
+            again, ran = run([5, 20])
+            self.assertEqual(ran, [])
+            self.assertEqual(again, first)
+            
+            # Widening the grid only runs the new points
+            wider, ran = run([5, 20, 80])
+            self.assertEqual(ran, [{"window": 80, "threshold": 0.5}, {"window": 80, "threshold": 2.0}])
+            self.assertEqual(wider[:4], first)
+            
+            # Editing shared code (fills in BaseStrategy, indicators, ...) misses too
+            import inspect
+            getsource = inspect.getsource
+            for edited in ("optimizer.strategy.base", "optimizer.indicators", "optimizer.engine"):
+                def patched(obj, edited=edited):
+                    source = getsource(obj)
+                    return source + "# edit\n" if getattr(obj, "__name__", None) == edited else source
+                with mock.patch("optimizer.trial_cache.inspect.getsource", patched):
+                    _, ran = run([5])
+                self.assertEqual(len(ran), 2, edited)
+
+    def test_resume_from_checkpoint_matches_uninterrupted_run(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trades.csv")
+            random_walk_trades(20_000, seed=4).write_csv(path)
+            
+            def config(interval):
+                # Pruner and shared rolling kernel state must survive the restart too
+                return ExperimentConfig(
+                    experiment_name="TestResume",
+                    data=DataConfig(path=path),
+                    strategy="BollingerReversion",
+                    optimization=OptimizationConfig(method="successive_halving", samples=9, seed=3, eta=3,
+                                                    min_rows=5_000, checkpoint_interval=interval,
+                                                    checkpoint_dir=os.path.join(tmp, "ckpt")),
+                    parameters={
+                        "window": ParameterSpace(type="int", min=5, max=300),
+                        "std_dev": ParameterSpace(type="float", min=0.5, max=2.5),
+                    },
+                    engine=EngineConfig(backend="python"),
+                )
+                
+            expected = Optimizer(config(0.0)).run(verbose=False)
+            
+            on_ticks = MultiStrategyWrapper.on_ticks
+            def crash(wrapper, batch, ctx):
+                if wrapper.batches_seen == 600:
+                    raise RuntimeError("simulated crash")
+                on_ticks(wrapper, batch, ctx)
+                
+            interrupted = Optimizer(config(1e-9))
+            with mock.patch.object(MultiStrategyWrapper, "on_ticks", crash):
+                with self.assertRaises(RuntimeError):
+                    interrupted.run(verbose=False)
+            for t in threading.enumerate():
+                if t is not threading.current_thread():
+                    t.join()
+                    
+            ckpt = interrupted.checkpoint_path(0)
+            header = read_checkpoint_header(ckpt)
+            self.assertGreater(header["rows"], 5_000)
+            self.assertLessEqual(header["rows"], 600 * 20)
+            
+            resumed = Optimizer(config(1e-9)).run(verbose=False, resume=True)
+            self.assertEqual(resumed, expected)
+            self.assertFalse(os.path.exists(ckpt))
+
+    def test_incremental_run_streams_only_appended_rows(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            n = 20_000
+            frame = random_walk_trades(n, seed=6)
+            full_path = os.path.join(tmp, "full.csv")
+            frame.write_csv(full_path)
+            path = os.path.join(tmp, "trades.csv")
+            frame.head(12_000).write_csv(path)
+            
+            def config(data_path, incremental):
+                return ExperimentConfig(
+                    experiment_name=f"TestIncremental{incremental}",
+                    data=DataConfig(path=data_path),
+                    strategy="BollingerReversion",
+                    optimization=OptimizationConfig(method="monte_carlo", samples=6, seed=9, incremental=incremental),
+                    parameters={
+                        "window": ParameterSpace(type="int", min=5, max=300),
+                        "std_dev": ParameterSpace(type="float", min=0.5, max=2.5),
+                    },
+                    engine=EngineConfig(backend="python"),
+                )
+                
+            cwd = os.getcwd()
+            os.chdir(tmp) # Snapshots live under reports/
+            try:
+                expected = Optimizer(config(full_path, False)).run(verbose=False)
+                
+                Optimizer(config(path, True)).run(verbose=False)
+                # Nightly append of the remaining rows
+                with open(path, "a") as f:
+                    f.write(frame.tail(n - 12_000).write_csv(include_header=False))
+                    
+                streamed = []
+                def counting(stream, *args):
+                    for batch in clip_stream(stream, *args):
+                        streamed.append(batch.num_rows)
+                        yield batch
+                with mock.patch("optimizer.engine.clip_stream", counting):
+                    updated = Optimizer(config(path, True)).run(verbose=False)
+                    
+                # Trades appended within the last processed millisecond are not dropped
+                with open(path, "a") as f:
+                    f.write(frame.tail(3).with_columns(pl.lit(frame["time"][-1]).alias("time"))
+                            .write_csv(include_header=False))
+                late = []
+                def counting_late(stream, *args):
+                    for batch in clip_stream(stream, *args):
+                        late.append(batch.num_rows)
+                        yield batch
+                with mock.patch("optimizer.engine.clip_stream", counting_late):
+                    Optimizer(config(path, True)).run(verbose=False)
+            finally:
+                os.chdir(cwd)
+                
+            self.assertEqual(sum(streamed), n - 12_000)
+            self.assertEqual(sum(late), 3)
+            for got, want in zip(updated, expected):
+                self.assertAlmostEqual(got["roi"], want["roi"], places=9)
+                self.assertEqual(got["trades"], want["trades"])
+
+    def test_incremental_cached_append_mid_window(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            n, split = 20_000, 12_010 # 600.5s: the first run ends inside a 1s window
+            frame = random_walk_trades(n, seed=6)
+            # The first appended trades share the timestamp of the last processed one
+            time = frame["time"].to_numpy().copy()
+            time[split:split + 3] = time[split - 1]
+            frame = frame.with_columns(pl.Series("time", time))
+            full_path = os.path.join(tmp, "full.csv")
+            frame.write_csv(full_path)
+            path = os.path.join(tmp, "trades.csv")
+            frame.head(split).write_csv(path)
+
+            def config(data_path, incremental):
+                return ExperimentConfig(
+                    experiment_name=f"TestCachedIncremental{incremental}",
+                    data=DataConfig(path=data_path, cache="ipc"),
+                    # Trades once per window: a split window changes the results
+                    strategy="OFI_Momentum",
+                    optimization=OptimizationConfig(method="monte_carlo", samples=6, seed=9, incremental=incremental),
+                    parameters={
+                        "window": ParameterSpace(type="int", min=2, max=50),
+                        "threshold": ParameterSpace(type="float", min=0.5, max=10.0),
+                    },
+                    engine=EngineConfig(backend="python"),
+                )
+
+            cwd = os.getcwd()
+            os.chdir(tmp)
+            try:
+                expected = Optimizer(config(full_path, False)).run(verbose=False)
+                Optimizer(config(path, True)).run(verbose=False)
+                with open(path, "a") as f:
+                    f.write(frame.tail(n - split).write_csv(include_header=False))
+                updated = Optimizer(config(path, True)).run(verbose=False)
+                snapshot = read_checkpoint_header(os.path.join("reports", "TestCachedIncrementalTrue", "snapshots", "shard-0.ckpt"))
+            finally:
+                os.chdir(cwd)
+
+            self.assertEqual(snapshot["position"], [int(time[-1]) * 1_000_000, 1])
+            for got, want in zip(updated, expected):
+                self.assertAlmostEqual(got["roi"], want["roi"], places=9)
+                self.assertEqual(got["trades"], want["trades"])
+                self.assertAlmostEqual(got["max_dd"], want["max_dd"], places=9)
+
+    def test_walk_forward_folds(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trades.csv")
+            n = 20_000
+            frame = random_walk_trades(n, seed=8) # 1000 s
+            frame.write_csv(path)
+            
+            def config_for(data_path, method):
+                return ExperimentConfig(
+                    experiment_name="TestWalkForward",
+                    data=DataConfig(path=data_path),
+                    strategy="OFI_Momentum",
+                    optimization=OptimizationConfig(method=method, train_ms=200_000, test_ms=100_000,
+                                                    top_k=2, metric="roi"),
+                    parameters={
+                        "window": ParameterSpace(type="int", values=[5, 20, 80]),
+                        "threshold": ParameterSpace(type="float", values=[0.5, 2.0]),
+                    },
+                    engine=EngineConfig(backend="python"),
+                )
+                
+            opt = Optimizer(config_for(path, "walk_forward"))
+            results = opt.run(verbose=False)
+            wf = opt.summary["walk_forward"]
+            
+            # Folds 0-7 reach out-of-sample; fold 7 ends past the data
+            self.assertEqual([f["fold"] for f in wf["folds"]], list(range(8)))
+            self.assertEqual([f["complete"] for f in wf["folds"]], [True] * 7 + [False])
+            self.assertEqual(len(results), 8 * 2)
+            self.assertEqual(results[0]["name"].split("/")[0], "WF0")
+            
+            # Fold 1 out-of-sample equals a fresh run of its winner on [300 s, 400 s)
+            oos_path = os.path.join(tmp, "oos.csv")
+            frame.filter((pl.col("time") >= 300_000) & (pl.col("time") < 400_000)).write_csv(oos_path)
+            winner = results[2]
+            self.assertEqual(winner["fold"], 1)
+            fresh = Optimizer(config_for(oos_path, "grid")).backtest([winner["params"]], verbose=False)[0]
+            self.assertAlmostEqual(fresh["roi"], winner["roi"], places=9)
+            self.assertEqual(fresh["trades"], winner["trades"])
+            self.assertEqual(winner["oos_rows"], 2000)
+            
+            # Overlapping folds share the pass: every row is profiled once
+            profiled = Optimizer(config_for(path, "walk_forward"))
+            self.assertEqual(profiled.run(verbose=False, profile=True), results)
+            self.assertEqual(profiled.profile_report["rows"], n)
+            self.assertEqual(profiled.profile_report["batches"], 1000)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,122 @@
+import os
+import time
+import random
+import unittest
+import importlib.util
+import polars as pl
+
+# The simulator is a script with a hyphenated name: load it by path
+_SCRIPT = os.path.join(os.path.dirname(__file__), "..", "..", "crypt-arbitrage.py")
+_spec = importlib.util.spec_from_file_location("crypt_arbitrage", _SCRIPT)
+live = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(live)
+
+class TestPriceFetcher(unittest.TestCase):
+    def test_stub_payloads_parse_for_every_exchange(self):
+        for exchange in live.EXCHANGE_APIS:
+            self.assertEqual(live.parse_price(exchange, live.stub_payload(exchange, 61234.5)), 61234.5)
+
+    def test_keep_alive_and_receive_timestamps(self):
+        with live.StubExchangeServer(latency=0.01) as stub:
+            with live.PriceFetcher(stub.urls(), deadline=2.0) as fetcher:
+                snapshots = []
+                for _ in range(3):
+                    before = time.time_ns()
+                    snapshots.append((before, fetcher.snapshot(), time.time_ns()))
+            # One connection per exchange, reused by every later snapshot
+            self.assertEqual(stub.connections, len(live.EXCHANGE_APIS))
+            self.assertEqual(stub.requests, 3 * len(live.EXCHANGE_APIS))
+            for before, prices, after in snapshots:
+                self.assertEqual(set(prices), set(live.EXCHANGE_APIS))
+                stamps = [received for _, received in prices.values()]
+                self.assertTrue(all(before < ts <= after for ts in stamps))
+                self.assertGreater(len(set(stamps)), 1)
+
+    def test_slow_exchange_misses_its_deadline(self):
+        with live.StubExchangeServer(latency=0.0, latencies={"Kraken": 3.0}) as stub:
+            with live.PriceFetcher(stub.urls(), deadline=1.0, deadlines={"Kraken": 0.1}) as fetcher:
+                start = time.perf_counter()
+                prices = fetcher.snapshot()
+                elapsed = time.perf_counter() - start
+                self.assertNotIn("Kraken", prices)
+                self.assertEqual(len(prices), len(live.EXCHANGE_APIS) - 1)
+                self.assertLess(elapsed, 2.0)
+                # Still in flight: the next snapshot does not send Kraken a second request
+                fetcher.snapshot()
+                self.assertEqual(stub.requests, 2 * len(live.EXCHANGE_APIS) - 1)
+                stats = fetcher.summary()
+                self.assertEqual(stats["Kraken"]["late"], 2)
+                self.assertEqual(stats["Binance"]["ok"], 2)
+
+class TestVenueBook(unittest.TestCase):
+    def test_matches_full_rescan_with_ties_and_drops(self):
+        rng = random.Random(5)
+        book, prices = live.VenueBook(), {}
+        for _ in range(5000):
+            venue = rng.choice("ABCDEFGHIJK")
+            price = None if rng.random() < 0.05 else float(rng.randint(95, 105)) # Coarse: many ties
+            book.update(venue, price)
+            prices[venue] = price
+            valid = {k: v for k, v in prices.items() if v is not None}
+            self.assertEqual(len(book), len(valid))
+            if valid:
+                low, high = min(valid, key=valid.get), max(valid, key=valid.get)
+                self.assertEqual(book.cheapest(), (low, valid[low]))
+                self.assertEqual(book.richest(), (high, valid[high]))
+
+    def test_bank_matches_per_scenario_strategies(self):
+        rng = random.Random(11)
+        exchanges = list(live.EXCHANGE_APIS)
+        params = [(rng.uniform(0, 40), rng.uniform(0, 0.003)) for _ in range(200)]
+        single = [live.ArbitrageStrategy(f"S{i}", p, slip) for i, (p, slip) in enumerate(params)]
+        banked = [live.ArbitrageStrategy(f"S{i}", p, slip) for i, (p, slip) in enumerate(params)]
+        bank = live.ArbitrageBank(banked)
+        for _ in range(3000):
+            ex, price = rng.choice(exchanges), round(60_000 * (1 + rng.uniform(-0.01, 0.01)), 2)
+            for s in single:
+                s.on_price(ex, price)
+            bank.on_price(ex, price)
+        bank.sync()
+        self.assertTrue(any(s.trade_count for s in single))
+        for a, b in zip(single, banked):
+            self.assertEqual((a.trade_count, a.opportunities), (b.trade_count, b.opportunities))
+            self.assertAlmostEqual(a.total_profit, b.total_profit, places=6)
+            self.assertEqual(list(a.trades), list(b.trades))
+            self.assertEqual(a.balances, b.balances)
+
+class TestLiveEvaluator(unittest.TestCase):
+    def test_streaming_matches_collect_then_backtest(self):
+        rng = random.Random(3)
+        exchanges = list(live.EXCHANGE_APIS)
+        snapshots = []
+        ts = 1_700_000_000_000_000_000
+        for _ in range(200):
+            snapshot = {}
+            for ex in rng.sample(exchanges, 8):
+                ts += rng.randint(1, 1_000_000)
+                snapshot[ex] = (round(60_000 * (1 + rng.uniform(-0.01, 0.01)), 2), ts)
+            snapshots.append(snapshot)
+            
+        evaluator = live.LiveEvaluator(live.build_scenarios(max_trades=5), buffer=100, window=10)
+        for snapshot in snapshots:
+            evaluator.on_snapshot(snapshot)
+        self.assertEqual(evaluator.tick_count, 1600)
+        self.assertEqual(len(evaluator.ticks), 100)
+        self.assertEqual(len(evaluator.history), 11)
+        
+        ticks = pl.DataFrame([
+            {"ts_exchange": received, "price": int(price * 1e8), "qty": int(1e8), "side": 1, "exchange_name": ex}
+            for snapshot in snapshots for ex, (price, received) in snapshot.items()
+        ])
+        collected = live.build_scenarios()
+        live.Backtester(data={"BTCUSDT": ticks.lazy()}, python_mode="tick").run_many(collected)
+        self.assertTrue(any(s.trade_count for s in collected))
+        for streamed, batch in zip(evaluator.strategies, collected):
+            self.assertEqual(streamed.trade_count, batch.trade_count)
+            self.assertAlmostEqual(streamed.total_profit, batch.total_profit, places=4)
+            self.assertEqual(list(streamed.trades), list(batch.trades)[-5:])
+            self.assertLessEqual(len(streamed.trades), 5)
+        self.assertIn("spread $", evaluator.status())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,290 @@
+import os
+import time
+import threading
+import multiprocessing
+import tempfile
+import unittest
+import numpy as np
+import polars as pl
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from optimizer.config import DataConfig
+from optimizer.data.broadcast import BatchBroadcaster
+from optimizer.data.prefetch import Prefetcher
+from optimizer.data.views import BatchDecoder
+from optimizer.data.merge import merge_streams
+from optimizer.data.synthetic import random_walk_trades
+from optimizer.data.loader import (
+    create_arrow_iterator, open_stream, cache_path_for, is_cache_valid, stream_schema, dataset_sources,
+    index_path_for, load_index, seek_chunks, to_ts_exchange, ENGINE_SCHEMA, FLOAT_SCHEMA, FIXED_POINT
+)
+
+def write_trades(path, n, seed=0):
+    # Exchange-like precision: 2 price decimals, 4 quantity decimals
+    (random_walk_trades(n, seed, step_ms=10)
+     .with_columns(pl.col("price").round(2), pl.col("quantity").round(4))
+     .write_csv(path))
+
+def collect(stream):
+    return pa.Table.from_batches(list(stream), schema=ENGINE_SCHEMA)
+
+class TestColumnarCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv = os.path.join(self.tmp.name, "trades.csv")
+        write_trades(self.csv, 2500)
+        self.expected = collect(create_arrow_iterator(self.csv, batch_size=1000))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_cache_roundtrip(self):
+        for fmt in ("ipc", "parquet"):
+            conf = DataConfig(path=self.csv, cache=fmt)
+            first = collect(open_stream(conf, batch_size=1000))
+            cache_path = cache_path_for(self.csv, fmt)
+            self.assertTrue(is_cache_valid(self.csv, cache_path))
+            second = collect(open_stream(conf, batch_size=1000))
+            self.assertTrue(first.equals(self.expected))
+            self.assertTrue(second.equals(self.expected))
+
+    def test_cache_invalidated_on_change(self):
+        conf = DataConfig(path=self.csv, cache="ipc")
+        collect(open_stream(conf))
+        cache_path = cache_path_for(self.csv, "ipc")
+        built_at = os.stat(cache_path).st_mtime_ns
+
+        time.sleep(0.01)
+        write_trades(self.csv, 3000, seed=1)
+        self.assertFalse(is_cache_valid(self.csv, cache_path))
+        table = collect(open_stream(conf))
+        self.assertEqual(table.num_rows, 3000)
+        self.assertNotEqual(os.stat(cache_path).st_mtime_ns, built_at)
+
+    def test_direct_columnar_inputs(self):
+        engine_pq = os.path.join(self.tmp.name, "engine.parquet")
+        pq.write_table(self.expected, engine_pq)
+        raw_pq = os.path.join(self.tmp.name, "raw.parquet")
+        pl.read_csv(self.csv).write_parquet(raw_pq)
+        raw_ipc = os.path.join(self.tmp.name, "raw.arrow")
+        pl.read_csv(self.csv).write_ipc(raw_ipc)
+
+        for path, fmt in ((engine_pq, "parquet"), (raw_pq, "parquet"), (raw_ipc, "ipc")):
+            table = collect(open_stream(DataConfig(path=path, format=fmt)))
+            self.assertTrue(table.equals(self.expected), path)
+
+    def test_time_range_seeks_through_index(self):
+        # time runs 0..24990 ms; keep [5000 ms, 12345 ms)
+        start, end = 5000, 12345
+        expected = self.expected.filter(pa.compute.and_(
+            pa.compute.greater_equal(self.expected["ts_exchange"], start * 1_000_000),
+            pa.compute.less(self.expected["ts_exchange"], end * 1_000_000)))
+        self.assertEqual(expected.num_rows, 735)
+
+        for fmt in ("ipc", "parquet"):
+            conf = DataConfig(path=self.csv, cache=fmt, start=start, end=end)
+            table = collect(open_stream(conf, batch_size=1000))
+            self.assertTrue(table.equals(expected), fmt)
+
+            cache_path = cache_path_for(self.csv, fmt)
+            index = load_index(cache_path, fmt)
+            self.assertTrue(os.path.exists(index_path_for(cache_path)))
+            self.assertEqual([c["rows"] for c in index["chunks"]], [1000, 1000, 500])
+            self.assertEqual(index["chunks"][1]["offset"], 1000)
+            # Only chunks 0 and 1 overlap, chunk 2 (from 20000 ms) is never read
+            self.assertEqual(seek_chunks(index, start * 1_000_000, end * 1_000_000), [0, 1])
+            self.assertEqual(seek_chunks(index, 21_000 * 1_000_000, None), [2])
+
+        # Plain CSV falls back to filtering and matches
+        table = collect(open_stream(DataConfig(path=self.csv, start=start, end=end), batch_size=1000))
+        self.assertTrue(table.equals(expected))
+
+    def test_bounds_accept_iso_strings(self):
+        self.assertEqual(to_ts_exchange("1970-01-01T00:00:05"), 5000 * 1_000_000)
+        self.assertEqual(to_ts_exchange("1970-01-01T09:00:05+09:00"), 5000 * 1_000_000)
+        self.assertEqual(to_ts_exchange(5000), to_ts_exchange("1970-01-01T00:00:05"))
+        self.assertIsNone(to_ts_exchange(None))
+
+class TestMultiFileDatasets(unittest.TestCase):
+    def test_merge_is_time_ordered_and_bounded(self):
+        rng = np.random.default_rng(5)
+        sources, expected = [], []
+        for k in range(4):
+            n = int(rng.integers(500, 3000))
+            ts = np.sort(rng.integers(0, 10_000, n))
+            table = pa.table({"ts_exchange": ts, "symbol_id": np.full(n, k)})
+            expected.append(table)
+            sources.append(table.to_batches(max_chunksize=int(rng.integers(50, 400))))
+        # Sources are pulled lazily: never more than one pending batch each
+        pulled = [0] * len(sources)
+        def source(k):
+            for batch in sources[k]:
+                pulled[k] += 1
+                yield batch
+        peak = 0
+        merged = []
+        for batch in merge_streams([source(k) for k in range(len(sources))]):
+            merged.append(batch)
+            consumed = sum(b.num_rows for b in merged)
+            read = sum(sum(b.num_rows for b in sources[k][:pulled[k]]) for k in range(len(sources)))
+            peak = max(peak, read - consumed)
+        out = pa.Table.from_batches(merged)
+        self.assertEqual(out.num_rows, sum(t.num_rows for t in expected))
+        self.assertTrue(np.all(np.diff(out["ts_exchange"].to_numpy()) >= 0))
+        self.assertLessEqual(peak, 4 * 400)
+        # Every source keeps its own rows in order
+        for k, table in enumerate(expected):
+            mine = out.filter(pc.equal(out["symbol_id"], k))
+            self.assertTrue(mine.equals(table))
+
+    def test_globs_and_lists_of_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for symbol, offset in (("BTCUSDT", 0), ("ETHUSDT", 5)):
+                full = os.path.join(tmp, f"{symbol}-full.csv")
+                write_trades(full, 2000, seed=offset)
+                df = pl.read_csv(full).with_columns(pl.col("time") + offset)
+                # Two daily shards per symbol
+                df[:1200].write_csv(os.path.join(tmp, f"{symbol}-trades-2024-01-01.csv"))
+                df[1200:].write_csv(os.path.join(tmp, f"{symbol}-trades-2024-01-02.csv"))
+                
+            btc = os.path.join(tmp, "BTCUSDT-trades-*.csv")
+            eth = os.path.join(tmp, "ETHUSDT-trades-*.csv")
+            sources = dataset_sources(DataConfig(path=[btc, eth]))
+            self.assertEqual([name for name, _ in sources], ["BTCUSDT", "ETHUSDT"])
+            self.assertEqual([len(files) for _, files in sources], [2, 2])
+            self.assertEqual(dataset_sources(DataConfig(path=[btc, eth], symbols=["A", "B"]))[1][0], "B")
+            with self.assertRaises(FileNotFoundError):
+                dataset_sources(DataConfig(path=os.path.join(tmp, "SOLUSDT-*.csv")))
+                
+            # One symbol's shards chain into its single-file stream
+            shards = collect(open_stream(DataConfig(path=btc), batch_size=500))
+            self.assertTrue(shards.equals(collect(open_stream(DataConfig(path=os.path.join(tmp, "BTCUSDT-full.csv"))))))
+            
+            table = collect(open_stream(DataConfig(path=[btc, eth], start=5_000, end=15_000), batch_size=500))
+            ts = table["ts_exchange"].to_numpy()
+            self.assertTrue(np.all(np.diff(ts) >= 0))
+            self.assertTrue(ts[0] >= to_ts_exchange(5_000) and ts[-1] < to_ts_exchange(15_000))
+            symbols = table["symbol_id"].to_numpy()
+            self.assertEqual(set(symbols), {0, 1})
+            self.assertEqual((symbols == 0).sum(), (symbols == 1).sum())
+            
+            # Per-symbol views hold exactly that symbol's rows, in time order
+            decoder = BatchDecoder()
+            batch = table.combine_chunks().to_batches()[0]
+            views = decoder.split(batch, *decoder.decode(batch))
+            for k in (0, 1):
+                rows = table.filter(pc.equal(table["symbol_id"], k))
+                np.testing.assert_allclose(views[k][0], rows["price"].to_numpy() / FIXED_POINT)
+                np.testing.assert_array_equal(views[k][2], rows["side"].to_numpy())
+
+class TestBatchDecoder(unittest.TestCase):
+    def test_float_and_fixed_point_sources(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trades.csv")
+            write_trades(path, 5_000)
+            fixed = collect(create_arrow_iterator(path))
+            floats = pa.Table.from_batches(list(create_arrow_iterator(path, float_prices=True)))
+        self.assertEqual(floats.schema, FLOAT_SCHEMA)
+        self.assertEqual(stream_schema(DataConfig(path=path), float_prices=True), FLOAT_SCHEMA)
+        self.assertEqual(stream_schema(DataConfig(path=path, cache="ipc"), float_prices=True), ENGINE_SCHEMA)
+
+        decoder = BatchDecoder()
+        fixed_batch, float_batch = fixed.to_batches()[0], floats.to_batches()[0]
+        prices, qtys, sides = decoder.decode(fixed_batch)
+        expected = fixed_batch["price"].to_numpy().astype(np.float64) / FIXED_POINT
+        np.testing.assert_array_equal(prices, expected)
+        np.testing.assert_array_equal(sides, fixed_batch["side"].to_numpy())
+        # Fixed point truncates below 1e-8; float columns are the parsed values
+        np.testing.assert_allclose(decoder.decode(float_batch)[0], expected, rtol=0, atol=1e-8)
+
+        # Fixed-point batches reuse the same output buffers
+        buffer = decoder.prices
+        again, _, _ = decoder.decode(fixed_batch.slice(0, 100))
+        self.assertIs(again.base, buffer)
+        self.assertIs(decoder.prices, buffer)
+
+        f32 = BatchDecoder("float32").decode(fixed_batch)[0]
+        self.assertEqual(f32.dtype, np.float32)
+        np.testing.assert_array_equal(f32, expected.astype(np.float32))
+        with self.assertRaises(ValueError):
+            BatchDecoder("int64")
+
+class TestPrefetch(unittest.TestCase):
+    def test_prefetched_stream_is_identical(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trades.csv")
+            write_trades(path, 25_000)
+            inline = list(create_arrow_iterator(path, batch_size=4_000))
+            prefetched = Prefetcher(create_arrow_iterator(path, batch_size=4_000), depth=2)
+            self.assertTrue(collect(prefetched).equals(collect(inline)))
+        self.assertEqual(prefetched.stats()["batches"], len(inline))
+        self.assertLessEqual(prefetched.stats()["mean_ready"], 2)
+        self.assertFalse(prefetched.thread.is_alive())
+
+    def test_backpressure_errors_and_early_stop(self):
+        def slow_consumer_source():
+            for i in range(6):
+                yield i
+        prefetcher = Prefetcher(slow_consumer_source(), depth=2)
+        out = []
+        for item in prefetcher:
+            time.sleep(0.02) # Compute slower than decode: the producer waits on a full queue
+            out.append(item)
+        self.assertEqual(out, list(range(6)))
+        self.assertGreater(prefetcher.stats()["blocked"], 0)
+
+        def failing():
+            yield 1
+            raise ValueError("bad row")
+        with self.assertRaises(ValueError):
+            list(Prefetcher(failing(), depth=2))
+
+        # Abandoning the stream stops the producer instead of leaving it blocked
+        endless = Prefetcher(iter(range(10**9)), depth=2)
+        for item in endless:
+            if item == 3:
+                break
+        endless.close()
+        self.assertFalse(endless.thread.is_alive())
+
+class TestBroadcast(unittest.TestCase):
+    def test_ring_delivers_every_batch_to_every_consumer(self):
+        expected = collect(engine_batches(2500))
+        with multiprocessing.Manager() as manager:
+            bc = BatchBroadcaster(consumers=3, manager=manager, slots=2, capacity=300)
+            received = [[] for _ in range(3)]
+            
+            def consume(i):
+                for batch in bc.consumer(i).iter_batches():
+                    # Views are only valid until the next batch is requested
+                    received[i].append(pa.concat_batches([batch]))
+                    
+            threads = [threading.Thread(target=consume, args=(i,)) for i in range(3)]
+            for t in threads:
+                t.start()
+            try:
+                rows = bc.publish(expected.to_batches(max_chunksize=1000))
+                for t in threads:
+                    t.join(timeout=30)
+            finally:
+                bc.close()
+                
+        self.assertEqual(rows, 2500)
+        for batches in received:
+            self.assertTrue(all(b.num_rows <= 300 for b in batches))
+            self.assertTrue(pa.Table.from_batches(batches).equals(expected))
+
+def engine_batches(n):
+    rng = np.random.default_rng(3)
+    yield pa.RecordBatch.from_pydict({
+        "ts_exchange": np.arange(n, dtype=np.int64),
+        "price": rng.integers(1, 10**12, n),
+        "qty": rng.integers(1, 10**9, n),
+        "side": rng.choice([-1, 1], n).astype(np.int8),
+        "symbol_id": np.zeros(n, dtype=np.int64),
+    }, schema=ENGINE_SCHEMA)
+
+if __name__ == "__main__":
+    unittest.main()
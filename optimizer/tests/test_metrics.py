@@ -0,0 +1,83 @@
+import unittest
+import numpy as np
+from optimizer.metrics import OnlineMetrics, MetricsBank
+from optimizer.strategy.base import BaseStrategy
+
+class CurveStrategy(BaseStrategy):
+    def on_ticks(self, batch, ctx):
+        pass
+    def get_stats(self):
+        return self.risk_stats()
+
+class TestOnlineMetrics(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.curve = 100_000.0 * np.cumprod(1 + rng.normal(0, 0.001, 1000))
+
+    def test_matches_full_curve(self):
+        m = OnlineMetrics()
+        for v in self.curve:
+            m.update(v)
+            
+        returns = np.diff(self.curve) / self.curve[:-1]
+        self.assertAlmostEqual(m.max_drawdown_pct, CurveStrategy().calculate_drawdown(self.curve), places=10)
+        self.assertAlmostEqual(m.sharpe, np.mean(returns) / np.std(returns), places=10)
+        self.assertEqual(len(m.equity_samples()), 0)
+
+    def test_downsampled_buffer_is_bounded(self):
+        m = OnlineMetrics(capacity=64)
+        for v in self.curve:
+            m.update(v)
+        samples = m.equity_samples()
+        self.assertLessEqual(len(samples), 64)
+        np.testing.assert_array_equal(samples, self.curve[::m.stride])
+
+    def test_bank_matches_scalar(self):
+        curves = np.stack([self.curve, self.curve[::-1], np.full(1000, 5.0)])
+        scalar = [OnlineMetrics(capacity=16) for _ in curves]
+        bank = MetricsBank([OnlineMetrics(capacity=16) for _ in curves])
+        for t in range(curves.shape[1]):
+            for m, c in zip(scalar, curves):
+                m.update(c[t])
+            bank.update(curves[:, t].copy())
+            
+        synced = [OnlineMetrics(capacity=16) for _ in curves]
+        bank.sync(synced)
+        for a, b in zip(scalar, synced):
+            self.assertEqual(a.max_dd, b.max_dd)
+            self.assertEqual(a.sharpe, b.sharpe)
+            np.testing.assert_array_equal(a.equity_samples(), b.equity_samples())
+
+    def test_equity_reaching_zero(self):
+        curves = np.array([
+            [100.0, 50.0, 0.0, 0.0, 10.0, 20.0],
+            [0.0, 0.0, 5.0, 10.0, 5.0, 0.0], # Starts at zero: no peak to draw down from yet
+        ])
+        scalar = [OnlineMetrics() for _ in curves]
+        bank = MetricsBank([OnlineMetrics() for _ in curves])
+        with np.errstate(all="raise"):
+            for t in range(curves.shape[1]):
+                for m, c in zip(scalar, curves):
+                    m.update(c[t])
+                bank.update(curves[:, t])
+        synced = [OnlineMetrics() for _ in curves]
+        bank.sync(synced)
+
+        self.assertEqual([m.max_drawdown_pct for m in scalar], [100.0, 100.0])
+        # Returns out of zero equity are skipped
+        self.assertEqual([m.n_returns for m in scalar], [3, 3])
+        np.testing.assert_allclose(scalar[0].ret_mean, np.mean([-0.5, -1.0, 1.0]))
+        for a, b in zip(scalar, synced):
+            self.assertEqual(a.n_returns, b.n_returns)
+            self.assertAlmostEqual(a.max_dd, b.max_dd, places=12)
+            self.assertAlmostEqual(a.sharpe, b.sharpe, places=12)
+            self.assertTrue(np.isfinite(a.sharpe))
+
+    def test_equity_history_replay(self):
+        strat = CurveStrategy()
+        strat.equity_history = [100.0, 120.0, 90.0, 130.0]
+        self.assertEqual(strat.equity_history, [100.0, 120.0, 90.0, 130.0])
+        self.assertAlmostEqual(strat.get_stats()["max_dd"], 25.0)
+
+if __name__ == "__main__":
+    unittest.main()
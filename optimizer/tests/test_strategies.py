@@ -1,8 +1,51 @@
+import pickle
 import unittest
 import numpy as np
-from optimizer.strategy.ofi import OFIMomentum
+import pyarrow as pa
+from optimizer.strategy.ofi import OFIMomentum, OFIMomentumBank
+from optimizer.data.loader import FIXED_POINT
+from optimizer.engine import MultiStrategyWrapper
+from optimizer.indicators import RollingMoments, RollingStatsKernel, decay_scan
 from optimizer.strategy.bollinger import BollingerReversion
 
+def random_chunks(values, rng, max_rows):
+    """Consecutive slices of `values` with random lengths in [1, max_rows)."""
+    pos = 0
+    while pos < len(values):
+        n = int(rng.integers(1, max_rows))
+        yield values[pos:pos + n]
+        pos += n
+
+def random_batches(seed, count, max_rows, sigma=0.3, flow=True, price=100.0):
+    """
+    `count` engine batches of a random-walk price; with `flow` sizes and sides are
+    random, else every row buys one unit.
+    """
+    rng = np.random.default_rng(seed)
+    batches = []
+    for _ in range(count):
+        n = int(rng.integers(1, max_rows))
+        prices = price + np.cumsum(rng.normal(0, sigma, n))
+        price = prices[-1]
+        if flow:
+            qty = (rng.uniform(0.1, 5.0, n) * FIXED_POINT).astype(np.int64)
+            side = rng.choice([-1, 1], n).astype(np.int8)
+        else:
+            qty, side = np.full(n, FIXED_POINT, dtype=np.int64), np.ones(n, dtype=np.int8)
+        batches.append(pa.RecordBatch.from_pydict({
+            "price": (prices * FIXED_POINT).astype(np.int64), "qty": qty, "side": side,
+        }))
+    return batches
+
+def run_wrapper(strats, batches, **kwargs):
+    """Stream `batches` through a started MultiStrategyWrapper and finish it."""
+    wrapper = MultiStrategyWrapper(strats, **kwargs)
+    wrapper.start(None)
+    for b in batches:
+        wrapper.on_ticks(b, None)
+    wrapper.finish(None)
+    return wrapper
+
 class TestStrategies(unittest.TestCase):
     def test_ofi_logic(self):
         strat = OFIMomentum("TestOFI")
@@ -40,5 +83,207 @@ class TestStrategies(unittest.TestCase):
         # Should have traded if logic triggered, or at least run without error
         self.assertTrue(stats["roi"] != None)
 
+    def test_rolling_moments_across_batches(self):
+        rng = np.random.default_rng(3)
+        prices = 30_000.0 + np.cumsum(rng.normal(0, 5.0, 3000))
+        for window in (1, 7, 250):
+            rolling = RollingMoments(window)
+            means, stds = [], []
+            for chunk in random_chunks(prices, rng, 2 * window + 3):
+                m, s = rolling.update(chunk)
+                means.append(m)
+                stds.append(s)
+            means = np.concatenate(means)
+            stds = np.concatenate(stds)
+            
+            self.assertTrue(np.isnan(means[:window - 1]).all())
+            for i in range(window - 1, len(prices), 97):
+                recent = prices[i - window + 1:i + 1]
+                self.assertAlmostEqual(means[i], np.mean(recent), places=6)
+                self.assertAlmostEqual(stds[i], np.std(recent), places=5)
+
+    def test_rolling_kernel_many_windows(self):
+        rng = np.random.default_rng(4)
+        prices = 30_000.0 + np.cumsum(rng.normal(0, 5.0, 2000))
+        windows = np.array([1, 20, 77, 300])
+        kernel = RollingStatsKernel(int(windows.max()))
+        pos = 0
+        for chunk in random_chunks(prices, rng, 60):
+            kernel.update(chunk)
+            pos += len(chunk)
+            means, stds = kernel.window_stats(windows)
+            for w, m, s in zip(windows, means, stds):
+                if pos < w:
+                    self.assertTrue(np.isnan(m))
+                    continue
+                recent = prices[pos - w:pos]
+                self.assertAlmostEqual(m, np.mean(recent), places=6)
+                # sqrt amplifies cancellation error when the variance is ~0
+                self.assertAlmostEqual(s, np.std(recent), delta=1e-4)
+
+    def test_bollinger_bank_matches_instances(self):
+        batches = random_batches(9, 300, 30, flow=False)
+        results = []
+        for vectorize in (False, True):
+            strats = []
+            for i in range(12):
+                s = BollingerReversion(f"Config_{i}")
+                s.set_params({"window": (5, 20, 60)[i % 3], "std_dev": 0.5 + 0.25 * i, "fee_rate": 0.001})
+                strats.append(s)
+            run_wrapper(strats, batches, vectorize=vectorize)
+            results.append([s.get_stats() for s in strats])
+            
+        loop_stats, bank_stats = results
+        self.assertTrue(any(s["trades"] > 0 for s in loop_stats))
+        for a, b in zip(loop_stats, bank_stats):
+            self.assertEqual(a["trades"], b["trades"])
+            self.assertAlmostEqual(a["roi"], b["roi"], places=9)
+            self.assertAlmostEqual(a["max_dd"], b["max_dd"], places=9)
+            self.assertAlmostEqual(a["sharpe"], b["sharpe"], places=6)
+
+    def test_bollinger_bank_state_survives_remove_and_restore(self):
+        batches = random_batches(10, 200, 30, flow=False)
+        def make():
+            strats = []
+            for i in range(9):
+                s = BollingerReversion(f"Config_{i}")
+                s.set_params({"window": (5, 20, 60)[i % 3], "std_dev": 0.5 + 0.25 * i, "fee_rate": 0.001})
+                strats.append(s)
+            return strats
+
+        reference = make()
+        run_wrapper(reference, batches, vectorize=False)
+
+        # Banked for the first half, one instance dropped, then restored unbanked
+        strats = make()
+        wrapper = MultiStrategyWrapper(strats)
+        wrapper.start(None)
+        for b in batches[:100]:
+            wrapper.on_ticks(b, None)
+        wrapper.remove(strats[:1])
+        restored = pickle.loads(pickle.dumps(wrapper.strategies))
+        resumed = MultiStrategyWrapper(restored, vectorize=False)
+        resumed.build_banks()
+        for b in batches[100:]:
+            resumed.on_ticks(b, None)
+        resumed.finish(None)
+
+        self.assertTrue(any(s.trade_count for s in reference[1:]))
+        for a, b in zip(reference[1:], restored):
+            self.assertEqual(a.trade_count, b.trade_count)
+            self.assertAlmostEqual(a.cash, b.cash, places=6)
+
+    def test_bollinger_window_spans_batches(self):
+        strat = BollingerReversion("TestBoll")
+        strat.set_params({"window": 5, "std_dev": 1.0})
+        strat.on_start(None)
+        
+        # Every batch is shorter than the window; the drop arrives in the last one
+        for chunk in ([100.0, 100.5], [99.5, 100.0], [90.0]):
+            prices = np.array(chunk)
+            strat.on_ticks(prices, np.ones_like(prices), np.ones(len(prices)), None)
+            
+        self.assertEqual(strat.trade_count, 1)
+        self.assertEqual(strat.position, 1.0)
+
+    def test_ofi_bank_matches_instances(self):
+        batches = random_batches(7, 50, 40, sigma=0.5)
+        def make():
+            strats = []
+            for i in range(25):
+                s = OFIMomentum(f"Config_{i}")
+                s.set_params({"window": 2 + i * 7, "threshold": 0.5 + i * 0.4, "fee_rate": 0.001})
+                strats.append(s)
+            return strats
+            
+        results = []
+        for vectorize in (False, True):
+            strats = make()
+            wrapper = run_wrapper(strats, batches, vectorize=vectorize)
+            self.assertEqual(len(wrapper.banks), 1 if vectorize else 0)
+            results.append([s.get_stats() for s in strats])
+            
+        loop_stats, bank_stats = results
+        self.assertTrue(any(s["trades"] > 0 for s in loop_stats))
+        for a, b in zip(loop_stats, bank_stats):
+            self.assertEqual(a["trades"], b["trades"])
+            self.assertAlmostEqual(a["pnl"], b["pnl"], places=9)
+            self.assertAlmostEqual(a["max_dd"], b["max_dd"], places=9)
+
+    def test_float32_views_settle_fills_in_float64(self):
+        # Prices where float32 keeps ~1 cent, just below the 100k starting cash
+        batches = random_batches(13, 60, 40, sigma=25.0, price=99_000.0)
+        results = []
+        for execution in ("batch", "tick"):
+            for vectorize in (False, True):
+                strats = []
+                for i in range(10):
+                    s = OFIMomentum(f"Config_{i}")
+                    s.set_params({"window": 2 + i * 5, "threshold": 0.5 + i * 0.6, "fee_rate": 0.001})
+                    s.execution = execution
+                    strats.append(s)
+                run_wrapper(strats, batches, vectorize=vectorize, dtype="float32")
+                results.append(strats)
+                
+        for loose, bank in (results[0:2], results[2:4]):
+            self.assertTrue(any(s.trade_count for s in loose))
+            for a, b in zip(loose, bank):
+                self.assertIsInstance(a.cash, float)
+                self.assertNotIsInstance(a.cash, np.float32)
+                self.assertEqual(a.trade_count, b.trade_count)
+                self.assertAlmostEqual(a.cash, b.cash, places=6)
+                self.assertAlmostEqual(a.get_stats()["pnl"], b.get_stats()["pnl"], places=6)
+
+    def test_tick_execution_matches_single_tick_batches(self):
+        batches = random_batches(12, 80, 60)
+        ticks = [b.slice(i, 1) for b in batches for i in range(b.num_rows)]
+        
+        def make(cls, execution):
+            strats = []
+            for i in range(18):
+                s = cls(f"Config_{i}")
+                if cls is OFIMomentum:
+                    s.set_params({"window": 2 + i * 5, "threshold": 0.5 + i * 0.5, "fee_rate": 0.001})
+                else:
+                    s.set_params({"window": (5, 20, 60)[i % 3], "std_dev": 0.5 + 0.2 * i, "fee_rate": 0.001})
+                if i % 4 == 0:
+                    s.cash = 101.0 # Runs out of cash: exercises rejected fills
+                s.execution = execution
+                strats.append(s)
+            return strats
+            
+        def run(strats, stream, vectorize):
+            run_wrapper(strats, stream, vectorize=vectorize)
+            return [(s.trade_count, s.cash, s.position) for s in strats]
+            
+        for cls in (OFIMomentum, BollingerReversion):
+            # Acting on every tick == batch execution fed one tick at a time
+            reference = run(make(cls, "batch"), ticks, vectorize=False)
+            self.assertTrue(any(r[0] > 2 for r in reference))
+            for vectorize in (False, True):
+                got = run(make(cls, "tick"), batches, vectorize)
+                for (trades, cash, pos), (ref_trades, ref_cash, ref_pos) in zip(got, reference):
+                    self.assertEqual(trades, ref_trades, cls.__name__)
+                    self.assertAlmostEqual(cash, ref_cash, places=6)
+                    self.assertEqual(pos, ref_pos)
+
+    def test_decay_scan_matches_recursion(self):
+        rng = np.random.default_rng(1)
+        x = rng.normal(size=3000)
+        decay = np.array([0.0, 0.5, 0.9, 0.999, 1.0])
+        carry = rng.normal(size=len(decay))
+        paths = decay_scan(carry, decay, x)
+        y = carry.copy()
+        for t in range(len(x)):
+            y = decay * y + x[t]
+            np.testing.assert_allclose(paths[:, t], y, rtol=1e-9, atol=1e-9)
+
+    def test_ofi_bank_skipped_for_overriding_subclass(self):
+        class CustomOFI(OFIMomentum):
+            def on_ticks(self, prices, qtys, sides, ctx):
+                pass
+        self.assertIsNone(CustomOFI.create_bank([CustomOFI()]))
+        self.assertIsInstance(OFIMomentum.create_bank([OFIMomentum()]), OFIMomentumBank)
+
 if __name__ == "__main__":
     unittest.main()
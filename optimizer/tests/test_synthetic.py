@@ -0,0 +1,48 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import polars as pl
+import pyarrow as pa
+
+from optimizer.data.loader import create_arrow_iterator
+from optimizer.data.synthetic import SyntheticTrades, SyntheticConfig, generate_csv
+
+class TestSynthetic(unittest.TestCase):
+    def test_seeded_and_chunked(self):
+        frames = list(SyntheticTrades(25_000, seed=4, chunk_rows=10_000).frames())
+        self.assertEqual([len(f) for f in frames], [10_000, 10_000, 5_000])
+        again = pl.concat(list(SyntheticTrades(25_000, seed=4, chunk_rows=10_000).frames()))
+        df = pl.concat(frames)
+        self.assertTrue(df.equals(again))
+        self.assertFalse(df.equals(pl.concat(list(SyntheticTrades(25_000, seed=5, chunk_rows=10_000).frames()))))
+
+        self.assertEqual(df.columns, ["time", "price", "quantity", "isbuyermaker"])
+        times = df["time"].to_numpy()
+        self.assertTrue((np.diff(times) >= 0).all())
+        self.assertTrue((df["price"].to_numpy() > 0).all())
+        self.assertTrue((df["quantity"].to_numpy() > 0).all())
+        # Clustered flow: same-side runs are longer than coin flips would give
+        side = df["isbuyermaker"].to_numpy()
+        runs = np.count_nonzero(side[1:] != side[:-1]) + 1
+        self.assertGreater(len(side) / runs, 2.5)
+
+    def test_volatility_regimes(self):
+        config = SyntheticConfig(sigma=[1e-5, 1e-3], activity=[1.0, 1.0], dwell=[5_000.0, 5_000.0], impact=0.0)
+        df = pl.concat(list(SyntheticTrades(100_000, seed=1, config=config).frames()))
+        r = np.abs(np.diff(np.log(df["price"].to_numpy())))
+        # Calm and volatile spells: block volatility spans the two regimes
+        block = r[: len(r) // 1000 * 1000].reshape(-1, 1000).mean(axis=1)
+        self.assertGreater(block.max() / block.min(), 20)
+
+    def test_csv_matches_batches(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = generate_csv(os.path.join(tmp, "synthetic.csv"), 12_000, seed=2, chunk_rows=5_000)
+            from_csv = pa.Table.from_batches(list(create_arrow_iterator(path)))
+        direct = pa.Table.from_batches(list(SyntheticTrades(12_000, seed=2, chunk_rows=5_000).batches()))
+        self.assertEqual(from_csv.num_rows, 12_000)
+        self.assertTrue(from_csv.equals(direct))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import os
+import sys
+import json
+import hashlib
+import inspect
+import importlib
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from optimizer.data.loader import dataset_fingerprint
+
+class TrialCache:
+    """
+    Content-addressed store of per-trial results.
+
+    A trial is identified by the data it ran on, the strategy implementation,
+    its parameters and the engine settings. Each result is one JSON file named
+    by the hash of that identity, so overlapping experiments share entries and
+    any change to data, code or settings simply misses.
+    """
+    def __init__(self, root: str, context: Dict[str, Any]):
+        self.root = root
+        self.context = context
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def for_experiment(cls, root: str, config: Any, strategy_cls: type) -> "TrialCache":
+        """Cache scoped to the data, strategy code and engine settings of `config`."""
+        data = config.data
+        context = {
+            "data": {
+                "fingerprint": _content_fingerprint(data),
+                "format": data.format,
+                "schema_type": data.schema_type,
+                "start": getattr(data, "start", None),
+                "end": getattr(data, "end", None),
+            },
+            "strategy": f"{strategy_cls.__module__}.{strategy_cls.__qualname__}",
+            "source": strategy_source_hash(strategy_cls),
+            "engine": asdict(config.engine), # Includes batch_ms and execution
+        }
+        return cls(root, context)
+
+    def key(self, params: Dict[str, Any]) -> str:
+        identity = dict(self.context, params=params)
+        payload = json.dumps(identity, sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode(), digest_size=20).hexdigest()
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key + ".json")
+
+    def get(self, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Stored stats of a trial, or None on a miss."""
+        try:
+            with open(self.path_for(self.key(params))) as f:
+                stats = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return stats
+
+    def put(self, params: Dict[str, Any], stats: Dict[str, Any]) -> None:
+        """Store a trial's stats (written to a temporary file, then renamed)."""
+        path = self.path_for(self.key(params))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(stats, f, default=_to_json)
+        os.replace(tmp_path, path)
+
+    def lookup(self, param_sets: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        return [self.get(params) for params in param_sets]
+
+# Code that shapes every trial's results besides the strategy's own classes:
+# indicators, metrics, and the engine's decode / dispatch / execution path
+EXECUTION_MODULES = (
+    "optimizer.indicators",
+    "optimizer.metrics",
+    "optimizer.engine",
+    "optimizer.backtester",
+    "optimizer.data.views",
+)
+
+def strategy_source_hash(strategy_cls: type) -> str:
+    """
+    Hash of the code a strategy's results depend on: the source of every module
+    in its MRO (the strategy file with its bank, BaseStrategy's fills and fees, ...)
+    plus EXECUTION_MODULES. Standard-library bases are left out.
+    """
+    names = [klass.__module__ for klass in strategy_cls.__mro__
+             if klass.__module__.split(".")[0] not in sys.stdlib_module_names]
+    names += EXECUTION_MODULES
+    digest = hashlib.blake2b(digest_size=16)
+    for name in dict.fromkeys(names):
+        try:
+            module = sys.modules.get(name) or importlib.import_module(name)
+            source = inspect.getsource(module)
+        except (ImportError, OSError, TypeError):
+            # No source available (e.g. defined interactively): key on the name only
+            source = name
+        digest.update(name.encode() + b"\0" + source.encode() + b"\0")
+    return digest.hexdigest()
+
+def _content_fingerprint(data: Any) -> Dict[str, Any]:
+    # mtime is left out so copies and re-downloads of the same files still hit
+    fingerprint = dataset_fingerprint(data)
+    return {"size": fingerprint["size"], "hash": fingerprint["hash"]}
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
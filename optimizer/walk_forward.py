@@ -0,0 +1,168 @@
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from optimizer.data.loader import TS_PER_MS
+from optimizer.pruning import rank_strategies
+
+class Fold:
+    """
+    One walk-forward fold: optimize on [is_start, is_end), validate on [is_end, oos_end).
+
+    The in-sample wrapper runs every candidate; when the stream passes `is_end`
+    the best `top_k` are re-instantiated fresh and run on the out-of-sample slice.
+    """
+    def __init__(self, index: int, is_start: int, is_end: int, oos_end: int, wrapper: Any):
+        self.index = index
+        self.is_start = is_start
+        self.is_end = is_end
+        self.oos_end = oos_end
+        self.is_wrapper = wrapper
+        self.oos_wrapper = None
+        self.winners: List[int] = []
+        self.is_stats: List[Dict[str, Any]] = []
+        self.done = False
+        self.complete = False # Stream reached oos_end
+
+class WalkForwardRunner:
+    """
+    Batch-mode strategy that runs rolling walk-forward folds in one streaming pass.
+
+    Fold k trains on `train_ms` starting at origin + k * `test_ms` and tests on the
+    following `test_ms`. Every batch is sliced by ts_exchange and routed to the
+    folds whose windows it overlaps, so overlapping folds run concurrently off a
+    single decode of the data.
+
+    `build(param_sets, names)` creates fresh strategy instances; `make_wrapper(strategies)`
+    wraps them (typically a MultiStrategyWrapper).
+    """
+    def __init__(self, param_sets: List[Dict[str, Any]], build: Callable, make_wrapper: Callable,
+                 train_ms: int, test_ms: int, top_k: int = 1, metric: str = "roi"):
+        if train_ms <= 0 or test_ms <= 0:
+            raise ValueError("walk_forward requires train_ms > 0 and test_ms > 0")
+        self.param_sets = param_sets
+        self.build = build
+        self.make_wrapper = make_wrapper
+        self.train = train_ms * TS_PER_MS
+        self.test = test_ms * TS_PER_MS
+        self.top_k = max(1, min(top_k, len(param_sets)))
+        self.metric = metric
+        self.origin: Optional[int] = None
+        self.folds: List[Fold] = []
+        self.active: List[Fold] = []
+        # Optional Profiler counting the shared pass (fold wrappers only time their slices)
+        self.profiler = None
+
+    def on_ticks(self, batch, ctx):
+        n = batch.num_rows
+        if n == 0:
+            return
+        if self.profiler is not None:
+            self.profiler.count(batch)
+        ts = batch.column("ts_exchange").to_numpy()
+        if self.origin is None:
+            self.origin = int(ts[0])
+
+        # Open every fold whose in-sample window starts within this batch
+        while self.origin + len(self.folds) * self.test <= ts[-1]:
+            self._open_fold(ctx)
+
+        for fold in self.active:
+            self._feed(fold, batch, ts, ctx)
+        self.active = [f for f in self.active if not f.done]
+
+    def finish(self, ctx=None):
+        """Close folds cut off by the end of the stream (their OOS window is partial)."""
+        for fold in self.active:
+            if fold.oos_wrapper is not None:
+                self._close_oos(fold, ctx)
+            else:
+                # Never reached out-of-sample: nothing to validate
+                fold.is_wrapper.finish(ctx)
+                fold.done = True
+        self.active = []
+
+    def _open_fold(self, ctx):
+        k = len(self.folds)
+        is_start = self.origin + k * self.test
+        strategies = self.build(self.param_sets, [f"WF{k}/Config_{i}" for i in range(len(self.param_sets))])
+        wrapper = self.make_wrapper(strategies)
+        wrapper.start(ctx)
+        fold = Fold(k, is_start, is_start + self.train, is_start + self.train + self.test, wrapper)
+        self.folds.append(fold)
+        self.active.append(fold)
+
+    def _feed(self, fold: Fold, batch, ts: np.ndarray, ctx):
+        lo, mid, hi = np.searchsorted(ts, [fold.is_start, fold.is_end, fold.oos_end])
+        if fold.oos_wrapper is None:
+            if mid > lo:
+                fold.is_wrapper.on_ticks(batch.slice(lo, mid - lo), ctx)
+            if mid == len(ts):
+                return # In-sample window continues into the next batch
+            self._close_is(fold, ctx)
+        if hi > mid:
+            fold.oos_wrapper.on_ticks(batch.slice(mid, hi - mid), ctx)
+        if hi < len(ts):
+            fold.complete = True
+            self._close_oos(fold, ctx)
+
+    def _close_is(self, fold: Fold, ctx):
+        wrapper = fold.is_wrapper
+        wrapper.finish(ctx)
+        ranked = rank_strategies(wrapper.strategies, self.metric)
+        fold.winners = ranked[:self.top_k]
+        fold.is_stats = [wrapper.strategies[i].get_stats() for i in fold.winners]
+        fold.is_wrapper = None # Release the in-sample candidates
+
+        winners = [self.param_sets[i] for i in fold.winners]
+        strategies = self.build(winners, [f"WF{fold.index}/Config_{i}" for i in fold.winners])
+        fold.oos_wrapper = self.make_wrapper(strategies)
+        fold.oos_wrapper.start(ctx)
+
+    def _close_oos(self, fold: Fold, ctx):
+        fold.oos_wrapper.finish(ctx)
+        fold.done = True
+
+    def results(self) -> List[Dict[str, Any]]:
+        """One row per out-of-sample winner, tagged with its fold and in-sample score."""
+        rows = []
+        for fold in self.folds:
+            if fold.oos_wrapper is None:
+                continue
+            for i, s, is_stats in zip(fold.winners, fold.oos_wrapper.strategies, fold.is_stats):
+                stats = s.get_stats()
+                stats["fold"] = fold.index
+                stats["params"] = dict(self.param_sets[i])
+                stats[f"is_{self.metric}"] = is_stats.get(self.metric)
+                stats["oos_rows"] = fold.oos_wrapper.rows_seen
+                rows.append(stats)
+        return rows
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-fold in-sample vs out-of-sample scores of the top winner, plus their means."""
+        folds = []
+        for fold in self.folds:
+            if fold.oos_wrapper is None:
+                continue
+            best = fold.oos_wrapper.strategies[0].get_stats()
+            folds.append({
+                "fold": fold.index,
+                "is_start": fold.is_start,
+                "is_end": fold.is_end,
+                "oos_end": fold.oos_end,
+                "complete": fold.complete,
+                "params": dict(self.param_sets[fold.winners[0]]),
+                f"is_{self.metric}": fold.is_stats[0].get(self.metric),
+                f"oos_{self.metric}": best.get(self.metric),
+            })
+
+        def mean(key):
+            values = [f[key] for f in folds if f[key] is not None]
+            return float(np.mean(values)) if values else None
+
+        return {
+            "metric": self.metric,
+            "folds": folds,
+            f"mean_is_{self.metric}": mean(f"is_{self.metric}"),
+            f"mean_oos_{self.metric}": mean(f"oos_{self.metric}"),
+        }